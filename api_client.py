@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP client for the Rental Marketplace test scripts
+Pooled keep-alive sessions, retries with backoff and per-run unique users
+"""
+
+import uuid
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Get backend URL from frontend .env file
+def get_backend_url():
+    try:
+        with open('/app/frontend/.env', 'r') as f:
+            for line in f:
+                if line.startswith('REACT_APP_BACKEND_URL='):
+                    return line.split('=', 1)[1].strip()
+    except:
+        pass
+    return 'http://localhost:8001'
+
+BASE_URL = get_backend_url()
+API_URL = f"{BASE_URL}/api"
+
+# Shed by the server or a proxy; urllib3 retries these statuses, like read
+# errors, only for IDEMPOTENT_METHODS, and connection errors for any method
+RETRY_STATUSES = (429, 502, 503, 504)
+# Repeating them is harmless, so they are retried after a response may have
+# been produced
+IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'})
+
+class ApiClient:
+    """Keep-alive client with one pooled session per thread, since requests.Session is not thread-safe"""
+
+    def __init__(self, api_url=API_URL, retries=3, backoff=0.2, pool_size=16, timeout=10):
+        self.api_url = api_url
+        self.timeout = timeout
+        self.retry = Retry(
+            total=retries,
+            read=retries,
+            connect=retries,
+            status=retries,
+            backoff_factor=backoff,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=IDEMPOTENT_METHODS,
+            raise_on_status=False
+        )
+        self.pool_size = pool_size
+        self._local = threading.local()
+        self._sessions = []
+        self._lock = threading.Lock()
+
+    @property
+    def session(self):
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size, max_retries=self.retry)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            self._local.session = session
+            with self._lock:
+                self._sessions.append(session)
+        return session
+
+    def request(self, method, endpoint, data=None, headers=None, timeout=None):
+        """Send a JSON request to the API and return the response; network errors propagate"""
+        return self.session.request(
+            method.upper(), f"{self.api_url}{endpoint}",
+            json=data, headers=headers, timeout=timeout or self.timeout
+        )
+
+    def close(self):
+        with self._lock:
+            for session in self._sessions:
+                session.close()
+            self._sessions.clear()
+        self._local = threading.local()
+
+class UserNamespace:
+    """Unique emails per run, so runs can repeat and overlap without duplicate registrations"""
+
+    def __init__(self, run_id=None, domain='rentease.com'):
+        self.run_id = run_id or uuid.uuid4().hex[:8]
+        self.domain = domain
+
+    def email(self, kind, index=0):
+        return f"{kind}.{self.run_id}.{index}@{self.domain}"
+
+    def user(self, kind, name, password, index=0):
+        return {"name": name, "email": self.email(kind, index), "password": password}
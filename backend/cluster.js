@@ -0,0 +1,58 @@
+const cluster = require('cluster');
+const http = require('http');
+const os = require('os');
+const dotenv = require('dotenv');
+const { setupMaster } = require('@socket.io/sticky');
+const { setupPrimary } = require('@socket.io/cluster-adapter');
+const { setupPrimaryRelay } = require('./utils/clusterBus');
+
+dotenv.config();
+
+// Clustered entry point: the primary owns the port and hands each connection
+// to a worker. Socket.IO handshakes stick to the worker that owns the session;
+// room broadcasts are relayed between workers over IPC by the cluster adapter.
+if (cluster.isPrimary) {
+  const workerCount = Number(process.env.WEB_CONCURRENCY) ||
+    (os.availableParallelism ? os.availableParallelism() : os.cpus().length);
+  const PORT = process.env.PORT || 8001;
+
+  const httpServer = http.createServer();
+  setupMaster(httpServer, { loadBalancingMethod: 'least-connection' });
+  setupPrimary();
+  setupPrimaryRelay();
+
+  httpServer.listen(PORT, '0.0.0.0', () => {
+    console.log(`Primary ${process.pid} listening on port ${PORT} with ${workerCount} workers`);
+  });
+
+  for (let i = 0; i < workerCount; i++) {
+    cluster.fork();
+  }
+
+  let shuttingDown = false;
+
+  cluster.on('exit', (worker, code, signal) => {
+    if (shuttingDown) {
+      if (Object.keys(cluster.workers).length === 0) process.exit(0);
+      return;
+    }
+    if (worker.exitedAfterDisconnect) return;
+    console.error(`Worker ${worker.process.pid} died (${signal || code}), restarting`);
+    cluster.fork();
+  });
+
+  // Stop accepting connections and let every worker drain on its own
+  // (server.js); exit once they are gone or SHUTDOWN_TIMEOUT_MS has passed
+  const shutdown = (signal) => {
+    if (shuttingDown) return;
+    shuttingDown = true;
+    console.log(`${signal} received, stopping ${Object.keys(cluster.workers).length} workers`);
+    httpServer.close();
+    Object.values(cluster.workers).forEach(worker => worker.process.kill('SIGTERM'));
+    setTimeout(() => process.exit(1), (Number(process.env.SHUTDOWN_TIMEOUT_MS) || 10000) + 1000).unref();
+  };
+  process.on('SIGTERM', () => shutdown('SIGTERM'));
+  process.on('SIGINT', () => shutdown('SIGINT'));
+} else {
+  require('./server');
+}
@@ -1,5 +1,46 @@
 const jwt = require('jsonwebtoken');
 const User = require('../models/User');
+const LRUCache = require('../utils/lruCache');
+const clusterBus = require('../utils/clusterBus');
+const { now, recordTiming } = require('../utils/metrics');
+
+// Recently authenticated users (plain objects, password excluded) keyed by id.
+// Created on first use, after server.js has loaded .env
+//   AUTH_CACHE_MAX     users kept (default 10000)
+//   AUTH_CACHE_TTL_MS  how long a user stays (default 60000)
+let userCache = null;
+const users = () => {
+  if (!userCache) {
+    userCache = new LRUCache({
+      max: Number(process.env.AUTH_CACHE_MAX) || 10000,
+      ttl: Number(process.env.AUTH_CACHE_TTL_MS) || 60000
+    });
+  }
+  return userCache;
+};
+
+// Load a user for authentication, from the cache when possible
+const loadUser = async (userId) => {
+  const key = String(userId);
+  let cached = users().get(key);
+  if (!cached) {
+    cached = await User.findById(userId).select('-password').lean();
+    if (!cached) return null;
+    users().set(key, cached);
+  }
+  // Hydrate a fresh document per request so route handlers can modify and save
+  // it; with the same projection, save() does not require the missing password
+  return User.hydrate(cached, { password: 0 });
+};
+
+// Drop a cached user after it changes, in this process and its cluster siblings
+const invalidateUser = (userId) => {
+  users().delete(String(userId));
+  clusterBus.publish('authUser:invalidate', String(userId));
+};
+clusterBus.subscribe('authUser:invalidate', userId => users().delete(userId));
+
+const getUserCacheStats = () => users().stats();
 
 // Verify JWT token
 const authMiddleware = async (req, res, next) => {
@@ -13,8 +54,10 @@ const authMiddleware = async (req, res, next) => {
       });
     }
 
+    const startedAt = now();
     const decoded = jwt.verify(token, process.env.JWT_SECRET);
-    const user = await User.findById(decoded.userId).select('-password');
+    const user = await loadUser(decoded.userId);
+    recordTiming('auth', now() - startedAt);
 
     if (!user) {
       return res.status(401).json({ 
@@ -69,6 +112,8 @@ const requireCustomer = (req, res, next) => {
 
 module.exports = {
   authMiddleware,
+  invalidateUser,
+  getUserCacheStats,
   requireRole,
   requireOwner,
   requireCustomer
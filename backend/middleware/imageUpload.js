@@ -0,0 +1,72 @@
+const fs = require('fs');
+const crypto = require('crypto');
+const multer = require('multer');
+const { listingUploadDir, hasImageCapacity } = require('../utils/images');
+
+// Multipart "images" field of POST /api/listings/:id/images. Files are streamed
+// straight to the listing's upload directory, never buffered whole in memory.
+//   UPLOAD_MAX_BYTES  largest accepted file (default 10 MB)
+//   UPLOAD_MAX_FILES  files per request (default 10)
+const ACCEPTED_TYPES = {
+  'image/jpeg': '.jpg',
+  'image/png': '.png',
+  'image/webp': '.webp'
+};
+
+const settings = () => ({
+  maxBytes: Number(process.env.UPLOAD_MAX_BYTES) || 10 * 1024 * 1024,
+  maxFiles: Number(process.env.UPLOAD_MAX_FILES) || 10
+});
+
+let upload;
+
+const getUpload = () => {
+  if (!upload) {
+    const { maxBytes, maxFiles } = settings();
+    upload = multer({
+      storage: multer.diskStorage({
+        destination: (req, file, cb) => {
+          const dir = listingUploadDir(req.params.id);
+          fs.mkdir(dir, { recursive: true }, error => cb(error, dir));
+        },
+        // Random names, so served files never change and can be cached forever
+        filename: (req, file, cb) => cb(null, `${crypto.randomUUID()}${ACCEPTED_TYPES[file.mimetype]}`)
+      }),
+      limits: { fileSize: maxBytes, files: maxFiles },
+      fileFilter: (req, file, cb) => {
+        if (ACCEPTED_TYPES[file.mimetype]) return cb(null, true);
+        const error = new Error('Only JPEG, PNG and WebP images are accepted');
+        error.status = 400;
+        cb(error);
+      }
+    }).array('images', maxFiles);
+  }
+  return upload;
+};
+
+// Refuses uploads up front when the resize queue is saturated, and answers 400
+// for rejected files; multer removes files already written when it fails
+const uploadListingImages = (req, res, next) => {
+  if (!hasImageCapacity(settings().maxFiles)) {
+    res.set('Retry-After', '5');
+    return res.status(503).json({ 
+      success: false, 
+      message: 'Image processing is busy, please try again shortly' 
+    });
+  }
+
+  getUpload()(req, res, (error) => {
+    if (!error) return next();
+    if (error instanceof multer.MulterError || error.status === 400) {
+      return res.status(400).json({ 
+        success: false, 
+        message: error.message 
+      });
+    }
+    next(error);
+  });
+};
+
+module.exports = {
+  uploadListingImages
+};
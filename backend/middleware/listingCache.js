@@ -0,0 +1,68 @@
+const ResponseCache = require('../utils/responseCache');
+const clusterBus = require('../utils/clusterBus');
+
+// Responses of the public listing reads. Writes through routes/listings.js and
+// routes/reviews.js invalidate explicitly; the TTL only bounds staleness after
+// out-of-band changes such as the scripts/ rebuild jobs. Created on first use,
+// after server.js has loaded .env
+//   LISTING_CACHE_MAX              responses kept (default 1000)
+//   LISTING_CACHE_TTL_MS           how long a response stays (default 300000)
+//   LISTING_CACHE_MAX_ENTRY_BYTES  larger responses are not cached (default 524288)
+let listingResponses = null;
+const responses = () => {
+  if (!listingResponses) {
+    listingResponses = new ResponseCache({
+      max: Number(process.env.LISTING_CACHE_MAX) || 1000,
+      ttl: Number(process.env.LISTING_CACHE_TTL_MS) || 300000,
+      maxEntryBytes: Number(process.env.LISTING_CACHE_MAX_ENTRY_BYTES) || 512 * 1024
+    });
+  }
+  return listingResponses;
+};
+
+// Same parameters in any order share an entry
+const normalizeQuery = (query) => JSON.stringify(
+  Object.keys(query).sort().map(key => [key, query[key]])
+);
+
+const cached = keyFor => (req, res, next) => responses().middleware(keyFor)(req, res, next);
+
+const cacheListingPages = cached(req => `list:${normalizeQuery(req.query)}`);
+const cacheListingFacets = cached(req => `facets:${normalizeQuery(req.query)}`);
+const cacheListing = cached(req => `detail:${req.params.id}`);
+
+// Any change can move a listing into or out of a result page or facet count,
+// so all of those are dropped, but only the changed listing's own entry
+const dropListing = (listingId) => {
+  const detailKey = `detail:${listingId}`;
+  responses().invalidate(key => key === detailKey || !key.startsWith('detail:'));
+};
+
+// Call after a listing changes, in this process and its cluster siblings
+const invalidateListing = (listingId) => {
+  dropListing(String(listingId));
+  clusterBus.publish('listingCache:invalidate', String(listingId));
+};
+clusterBus.subscribe('listingCache:invalidate', dropListing);
+
+// Call after listings were added in bulk: no detail entry can exist for them yet
+const dropPages = () => {
+  responses().invalidate(key => !key.startsWith('detail:'));
+};
+
+const invalidateListingPages = () => {
+  dropPages();
+  clusterBus.publish('listingCache:invalidatePages', null);
+};
+clusterBus.subscribe('listingCache:invalidatePages', dropPages);
+
+const getListingCacheStats = () => responses().stats();
+
+module.exports = {
+  cacheListingPages,
+  cacheListingFacets,
+  cacheListing,
+  invalidateListing,
+  invalidateListingPages,
+  getListingCacheStats
+};
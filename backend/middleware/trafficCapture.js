@@ -0,0 +1,189 @@
+const fs = require('fs');
+const path = require('path');
+const crypto = require('crypto');
+const { now, registerGauge } = require('../utils/metrics');
+
+// Opt-in recording of API traffic for traffic_replay.py. One NDJSON line per
+// finished request: method, route pattern, params, query, body shape, status
+// and timing. Secrets and personal text never reach the file; IDs are kept so
+// the replayer can map them onto its own data.
+//   TRAFFIC_CAPTURE            1 to enable
+//   TRAFFIC_CAPTURE_DIR        default backend/captures
+//   TRAFFIC_CAPTURE_MAX_BYTES  rotate after this many bytes (default 50MB)
+//   TRAFFIC_CAPTURE_MAX_FILES  files kept per process (default 10)
+//   TRAFFIC_CAPTURE_SAMPLE     fraction of users recorded, 0-1 (default 1)
+const settings = () => ({
+  enabled: process.env.TRAFFIC_CAPTURE === '1' || process.env.TRAFFIC_CAPTURE === 'true',
+  dir: process.env.TRAFFIC_CAPTURE_DIR || path.join(__dirname, '..', 'captures'),
+  maxBytes: Number(process.env.TRAFFIC_CAPTURE_MAX_BYTES) || 50 * 1024 * 1024,
+  maxFiles: Number(process.env.TRAFFIC_CAPTURE_MAX_FILES) || 10,
+  sample: process.env.TRAFFIC_CAPTURE_SAMPLE !== undefined ? Number(process.env.TRAFFIC_CAPTURE_SAMPLE) : 1
+});
+
+// Never recorded: scrapes and static files
+const SKIPPED_PATHS = ['/api/metrics', '/api/stats'];
+
+// Values of these keys are replaced by their type and length
+const SENSITIVE_KEY = /pass|token|secret|email|name|phone|contact|comment|message|description|text|address|note|link|title/i;
+const OBJECT_ID = /^[0-9a-f]{24}$/i;
+const MAX_KEPT_STRING = 64;
+const MAX_DEPTH = 4;
+const MAX_ITEMS = 20;
+
+const redacted = value => ({ $redacted: typeof value, length: String(value).length });
+
+// Same structure as value, with personal and free-form strings replaced
+const sanitize = (value, key = '', depth = 0) => {
+  if (value === null || value === undefined || typeof value === 'number' || typeof value === 'boolean') return value;
+  if (typeof value === 'string') {
+    if (OBJECT_ID.test(value)) return value;
+    return SENSITIVE_KEY.test(key) || value.length > MAX_KEPT_STRING ? redacted(value) : value;
+  }
+  if (depth >= MAX_DEPTH) return { $redacted: Array.isArray(value) ? 'array' : 'object' };
+  if (Array.isArray(value)) {
+    return value.slice(0, MAX_ITEMS).map(item => sanitize(item, key, depth + 1));
+  }
+  return Object.keys(value).reduce((result, field) => {
+    result[field] = sanitize(value[field], field, depth + 1);
+    return result;
+  }, {});
+};
+
+// The resource a successful POST created, so the replayer can map its ID
+const createdResource = (payload) => {
+  if (!payload || typeof payload !== 'object') return undefined;
+  const key = Object.keys(payload).find(field => payload[field] && typeof payload[field] === 'object' &&
+    (payload[field]._id || payload[field].id));
+  return key ? { kind: key, id: String(payload[key]._id || payload[key].id) } : undefined;
+};
+
+// Users are sampled as a whole, so every recorded session is complete
+const sampled = (userId, rate) => {
+  if (rate >= 1) return true;
+  if (!userId) return Math.random() < rate;
+  return crypto.createHash('sha1').update(userId).digest().readUInt32BE(0) / 0x100000000 < rate;
+};
+
+// Append-only NDJSON file that rotates by size; records are dropped rather
+// than buffered while the disk falls behind
+class RotatingWriter {
+  constructor({ dir, maxBytes, maxFiles }) {
+    this.dir = dir;
+    this.maxBytes = maxBytes;
+    this.maxFiles = maxFiles;
+    this.prefix = `traffic-${process.pid}-`;
+    this.stream = null;
+    this.file = null;
+    this.files = [];
+    this.sequence = 0;
+    this.bytes = 0;
+    this.blocked = false;
+    this.written = 0;
+    this.dropped = 0;
+    fs.mkdirSync(dir, { recursive: true });
+  }
+
+  open() {
+    this.sequence++;
+    this.file = `${this.prefix}${Date.now()}-${String(this.sequence).padStart(6, '0')}.ndjson`;
+    this.stream = fs.createWriteStream(path.join(this.dir, this.file), { flags: 'a' });
+    this.stream.on('drain', () => { this.blocked = false; });
+    this.stream.on('error', (error) => {
+      console.error('Traffic capture error:', error);
+      this.stream = null;
+    });
+    this.bytes = 0;
+    this.files.push(this.file);
+  }
+
+  // Oldest files of this process beyond maxFiles, counting the open one
+  prune() {
+    this.files.splice(0, Math.max(0, this.files.length - this.maxFiles))
+      .forEach(file => fs.unlink(path.join(this.dir, file), () => {}));
+  }
+
+  write(record) {
+    if (this.blocked) {
+      this.dropped++;
+      return;
+    }
+    if (!this.stream || this.bytes >= this.maxBytes) {
+      if (this.stream) this.stream.end(() => this.prune());
+      this.open();
+    }
+    const line = `${JSON.stringify(record)}\n`;
+    this.bytes += Buffer.byteLength(line);
+    this.written++;
+    if (!this.stream.write(line)) this.blocked = true;
+  }
+
+  close() {
+    if (this.stream) this.stream.end();
+    this.stream = null;
+  }
+}
+
+let writer = null;
+
+registerGauge('traffic_capture_records_total', 'Requests recorded by the traffic capture', () =>
+  (writer ? [{ labels: { outcome: 'written' }, value: writer.written }, { labels: { outcome: 'dropped' }, value: writer.dropped }] : []),
+'counter');
+
+// Express middleware recording each /api request once it has finished;
+// a pass-through unless TRAFFIC_CAPTURE is set
+const trafficCapture = () => {
+  const config = settings();
+  if (!config.enabled) return (req, res, next) => next();
+  writer = writer || new RotatingWriter(config);
+
+  return (req, res, next) => {
+    if (!req.path.startsWith('/api/') || SKIPPED_PATHS.some(skipped => req.path.startsWith(skipped))) {
+      return next();
+    }
+    const startedAt = Date.now();
+    const started = now();
+
+    let created;
+    const json = res.json;
+    res.json = function (payload) {
+      if (req.method === 'POST' && res.statusCode < 300) created = createdResource(payload);
+      return json.call(this, payload);
+    };
+
+    res.on('finish', () => {
+      const userId = req.user ? String(req.user._id) : null;
+      if (!sampled(userId, config.sample)) return;
+
+      const contentType = req.headers['content-type'] || '';
+      const structured = contentType.includes('json') || contentType.includes('urlencoded');
+      writer.write({
+        startedAt,
+        durationMs: Math.round((now() - started) * 100) / 100,
+        method: req.method,
+        route: req.route ? `${req.baseUrl}${req.route.path}` : null,
+        path: req.path,
+        params: req.params && Object.keys(req.params).length > 0 ? req.params : undefined,
+        query: Object.keys(req.query).length > 0 ? sanitize(req.query) : undefined,
+        body: structured && req.body && Object.keys(req.body).length > 0 ? sanitize(req.body) : undefined,
+        bodyType: req.headers['content-length'] > 0 && !structured ? contentType.split(';')[0] : undefined,
+        status: res.statusCode,
+        userId,
+        role: req.user ? req.user.role || null : undefined,
+        authenticated: Boolean(req.headers.authorization),
+        created
+      });
+    });
+
+    next();
+  };
+};
+
+const closeTrafficCapture = () => {
+  if (writer) writer.close();
+};
+
+module.exports = {
+  trafficCapture,
+  closeTrafficCapture,
+  sanitize
+};
@@ -0,0 +1,44 @@
+const mongoose = require('mongoose');
+
+// Short lease on one listing's bookings, so the overlap check and insert of a
+// booked range in routes/listings.js run one at a time per listing. A lease
+// left behind by a crashed process expires by itself.
+const LEASE_MS = 10000;
+
+const bookingLockSchema = new mongoose.Schema({
+  // The listing's id
+  _id: {
+    type: mongoose.Schema.Types.ObjectId
+  },
+  lockedUntil: {
+    type: Date,
+    required: true
+  }
+}, {
+  versionKey: false
+});
+
+// Take the lease if it is free or expired; returns its token, or null while
+// another request holds it
+bookingLockSchema.statics.acquire = async function(listingId) {
+  const lockedUntil = new Date(Date.now() + LEASE_MS);
+  try {
+    await this.updateOne(
+      { _id: listingId, lockedUntil: { $lte: new Date() } },
+      { $set: { lockedUntil } },
+      { upsert: true }
+    );
+    return lockedUntil;
+  } catch (error) {
+    // Held: the filter missed the existing document and the upsert collided with it
+    if (error.code === 11000) return null;
+    throw error;
+  }
+};
+
+// Give the lease back, unless it expired and was taken over meanwhile
+bookingLockSchema.statics.release = function(listingId, token) {
+  return this.deleteOne({ _id: listingId, lockedUntil: token });
+};
+
+module.exports = mongoose.model('BookingLock', bookingLockSchema);
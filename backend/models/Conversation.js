@@ -11,6 +11,16 @@ const conversationSchema = new mongoose.Schema({
     ref: 'Listing',
     required: true
   },
+  // Owner of the listing; set on creation, backfilled by scripts/rebuildOwnerStats.js
+  ownerId: {
+    type: mongoose.Schema.Types.ObjectId,
+    ref: 'User'
+  },
+  // Oldest customer message the owner has not answered yet
+  awaitingReplySince: {
+    type: Date,
+    default: null
+  },
   lastMessage: {
     type: String,
     default: ''
@@ -24,7 +34,7 @@ const conversationSchema = new mongoose.Schema({
 });
 
 // Index for faster queries
-conversationSchema.index({ participants: 1 });
+conversationSchema.index({ participants: 1, updatedAt: -1, _id: -1 });
 conversationSchema.index({ listingId: 1 });
 
 module.exports = mongoose.model('Conversation', conversationSchema);
\ No newline at end of file
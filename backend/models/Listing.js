@@ -1,4 +1,5 @@
 const mongoose = require('mongoose');
+const { buildPrefixes } = require('../utils/search');
 
 const listingSchema = new mongoose.Schema({
   ownerId: {
@@ -54,6 +55,23 @@ const listingSchema = new mongoose.Schema({
   longitude: {
     type: Number
   },
+  // GeoJSON mirror of latitude/longitude for 2dsphere queries
+  geo: {
+    type: {
+      type: String,
+      enum: ['Point']
+    },
+    coordinates: {
+      type: [Number],
+      default: undefined
+    }
+  },
+  // Word prefixes of title and address for typeahead search
+  searchPrefixes: {
+    type: [String],
+    default: [],
+    select: false
+  },
   googleMapsLink: {
     type: String
   },
@@ -61,6 +79,19 @@ const listingSchema = new mongoose.Schema({
     type: [String],
     default: []
   },
+  // Resized copies of uploaded images, by their URL in images; added by
+  // POST /api/listings/:id/images once the resize workers finish
+  imageVariants: [{
+    _id: false,
+    src: String,
+    variants: [{
+      _id: false,
+      width: Number,
+      format: String,
+      url: String,
+      bytes: Number
+    }]
+  }],
   description: {
     type: String,
     trim: true
@@ -81,6 +112,19 @@ const listingSchema = new mongoose.Schema({
     enum: ['available', 'rented', 'unavailable'],
     default: 'available'
   },
+  // Maintained by routes/reviews.js, rebuilt by scripts/rebuildRatingStats.js
+  ratingStats: {
+    count: { type: Number, default: 0 },
+    sum: { type: Number, default: 0 },
+    average: { type: Number, default: 0 },
+    histogram: {
+      1: { type: Number, default: 0 },
+      2: { type: Number, default: 0 },
+      3: { type: Number, default: 0 },
+      4: { type: Number, default: 0 },
+      5: { type: Number, default: 0 }
+    }
+  },
   createdAt: {
     type: Date,
     default: Date.now
@@ -91,10 +135,96 @@ const listingSchema = new mongoose.Schema({
   }
 });
 
+const hasCoordinates = (latitude, longitude) =>
+  Number.isFinite(latitude) && Number.isFinite(longitude);
+
+// Derive geo and searchPrefixes from the fields they mirror. Called by
+// save(), and directly by bulk imports, which bypass save middleware.
+listingSchema.methods.syncDerivedFields = function() {
+  if (hasCoordinates(this.latitude, this.longitude)) {
+    this.geo = { type: 'Point', coordinates: [this.longitude, this.latitude] };
+  } else if (this.geo && this.geo.type) {
+    // Coordinates cleared: drop the point so nearby searches stop finding it
+    this.geo = undefined;
+  }
+  if (this.isNew || this.isModified('title') || this.isModified('addressText')) {
+    this.searchPrefixes = buildPrefixes(this.title, this.addressText);
+  }
+};
+
 // Update the updatedAt field before saving
 listingSchema.pre('save', function(next) {
   this.updatedAt = Date.now();
+  this.syncDerivedFields();
   next();
 });
 
+// Keep geo in sync when coordinates change through findByIdAndUpdate; an
+// update that clears either coordinate removes the point
+listingSchema.pre('findOneAndUpdate', function(next) {
+  const update = this.getUpdate();
+  const fields = update.$set || update;
+  const latitude = Number(fields.latitude);
+  const longitude = Number(fields.longitude);
+  const cleared = ['latitude', 'longitude'].some(field =>
+    (field in fields && (fields[field] === null || fields[field] === '')) ||
+    (update.$unset && field in update.$unset));
+  if (cleared) {
+    delete fields.geo;
+    update.$unset = { ...update.$unset, geo: 1 };
+  } else if (fields.latitude != null && fields.longitude != null && hasCoordinates(latitude, longitude)) {
+    fields.geo = { type: 'Point', coordinates: [longitude, latitude] };
+  }
+  next();
+});
+
+// Atomically add (direction 1) or remove (direction -1) one rating from
+// ratingStats, recomputing the average in the same update
+listingSchema.statics.applyRating = function(listingId, rating, direction = 1) {
+  const counter = path => ({ $add: [{ $ifNull: [`$${path}`, 0] }, direction] });
+  const star = `ratingStats.histogram.${rating}`;
+  return this.updateOne({ _id: listingId }, [
+    {
+      $set: {
+        'ratingStats.count': counter('ratingStats.count'),
+        'ratingStats.sum': { $add: [{ $ifNull: ['$ratingStats.sum', 0] }, direction * rating] },
+        [star]: counter(star)
+      }
+    },
+    {
+      $set: {
+        'ratingStats.average': {
+          $cond: [
+            { $gt: ['$ratingStats.count', 0] },
+            { $round: [{ $divide: ['$ratingStats.sum', '$ratingStats.count'] }, 2] },
+            0
+          ]
+        }
+      }
+    }
+  ]);
+};
+
+// Indexes matching the newest-first keyset sort used by GET /api/listings
+listingSchema.index({ createdAt: -1, _id: -1 });
+listingSchema.index({ ownerId: 1, createdAt: -1, _id: -1 });
+listingSchema.index({ type: 1, createdAt: -1, _id: -1 });
+
+// Type and price range filters, also the first stage of GET /api/listings/facets
+listingSchema.index({ type: 1, price: 1 });
+listingSchema.index({ price: 1 });
+
+// Top-rated sort and minRating filter
+listingSchema.index({ 'ratingStats.average': -1, _id: -1 });
+
+// Radius and bounding-box search
+listingSchema.index({ geo: '2dsphere' });
+
+// Relevance-ranked full-text search and prefix typeahead
+listingSchema.index(
+  { title: 'text', addressText: 'text', description: 'text' },
+  { name: 'listing_text_search', weights: { title: 10, addressText: 5, description: 1 } }
+);
+listingSchema.index({ searchPrefixes: 1, createdAt: -1 });
+
 module.exports = mongoose.model('Listing', listingSchema);
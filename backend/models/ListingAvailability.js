@@ -0,0 +1,72 @@
+const mongoose = require('mongoose');
+
+const DAY_MS = 24 * 60 * 60 * 1000;
+
+// Longest stored piece. Longer ranges are split, so anything overlapping
+// [from, to) must start after from - MAX_PIECE_MS: overlap checks become a
+// bounded scan of the { listingId, start, end } index however many past and
+// future intervals a listing has.
+const MAX_PIECE_DAYS = 31;
+const MAX_PIECE_MS = MAX_PIECE_DAYS * DAY_MS;
+
+// A half-open [start, end) interval during which a listing cannot be booked
+const listingAvailabilitySchema = new mongoose.Schema({
+  listingId: {
+    type: mongoose.Schema.Types.ObjectId,
+    ref: 'Listing',
+    required: true
+  },
+  // Shared by the pieces of one range, which are added and removed together
+  rangeId: {
+    type: mongoose.Schema.Types.ObjectId,
+    required: true
+  },
+  start: {
+    type: Date,
+    required: true
+  },
+  end: {
+    type: Date,
+    required: true
+  },
+  kind: {
+    type: String,
+    enum: ['booked', 'blocked'],
+    default: 'blocked'
+  },
+  note: {
+    type: String,
+    trim: true,
+    maxlength: 200
+  },
+  createdAt: {
+    type: Date,
+    default: Date.now
+  }
+});
+
+// Overlap checks and calendar reads for one listing
+listingAvailabilitySchema.index({ listingId: 1, start: 1, end: 1 });
+listingAvailabilitySchema.index({ rangeId: 1 });
+
+// Condition on start/end matching every piece that overlaps [from, to)
+listingAvailabilitySchema.statics.overlapping = function(from, to) {
+  return {
+    start: { $gt: new Date(from.getTime() - MAX_PIECE_MS), $lt: to },
+    end: { $gt: from }
+  };
+};
+
+// Pieces of [start, end) at most MAX_PIECE_DAYS long
+listingAvailabilitySchema.statics.split = function(start, end) {
+  const pieces = [];
+  for (let pieceStart = start.getTime(); pieceStart < end.getTime(); pieceStart += MAX_PIECE_MS) {
+    pieces.push({
+      start: new Date(pieceStart),
+      end: new Date(Math.min(pieceStart + MAX_PIECE_MS, end.getTime()))
+    });
+  }
+  return pieces;
+};
+
+module.exports = mongoose.model('ListingAvailability', listingAvailabilitySchema);
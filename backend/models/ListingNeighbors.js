@@ -0,0 +1,35 @@
+const mongoose = require('mongoose');
+
+// Precomputed most-similar listings of one listing, best first.
+// Maintained by utils/similarity.js, rebuilt by scripts/rebuildSimilarListings.js
+const listingNeighborsSchema = new mongoose.Schema({
+  listingId: {
+    type: mongoose.Schema.Types.ObjectId,
+    ref: 'Listing',
+    required: true
+  },
+  neighbors: [{
+    _id: false,
+    listingId: {
+      type: mongoose.Schema.Types.ObjectId,
+      ref: 'Listing',
+      required: true
+    },
+    score: {
+      type: Number,
+      required: true
+    }
+  }],
+  updatedAt: {
+    type: Date,
+    default: Date.now
+  }
+});
+
+// One neighbor list per listing
+listingNeighborsSchema.index({ listingId: 1 }, { unique: true });
+
+// Lists that mention a listing, to patch them when it changes or is deleted
+listingNeighborsSchema.index({ 'neighbors.listingId': 1 });
+
+module.exports = mongoose.model('ListingNeighbors', listingNeighborsSchema);
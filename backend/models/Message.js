@@ -34,7 +34,7 @@ const messageSchema = new mongoose.Schema({
 });
 
 // Index for faster queries
-messageSchema.index({ conversationId: 1, createdAt: 1 });
-messageSchema.index({ receiverId: 1, isRead: 1 });
+messageSchema.index({ conversationId: 1, createdAt: 1, _id: 1 });
+messageSchema.index({ receiverId: 1, isRead: 1, conversationId: 1 });
 
 module.exports = mongoose.model('Message', messageSchema);
\ No newline at end of file
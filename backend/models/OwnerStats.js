@@ -0,0 +1,44 @@
+const mongoose = require('mongoose');
+
+// Dashboard counters of one owner, so GET /api/owner/stats is a single read.
+// Maintained by utils/ownerStats.js from the listing, review, conversation
+// and chat write paths, rebuilt by scripts/rebuildOwnerStats.js
+const ownerStatsSchema = new mongoose.Schema({
+  ownerId: {
+    type: mongoose.Schema.Types.ObjectId,
+    ref: 'User',
+    required: true
+  },
+  listings: {
+    total: { type: Number, default: 0 },
+    available: { type: Number, default: 0 },
+    rented: { type: Number, default: 0 },
+    unavailable: { type: Number, default: 0 }
+  },
+  // Reviews of the owner's current listings
+  reviews: {
+    count: { type: Number, default: 0 },
+    sum: { type: Number, default: 0 }
+  },
+  conversations: {
+    total: { type: Number, default: 0 }
+  },
+  // Messages to the owner in conversations about their listings
+  messages: {
+    unread: { type: Number, default: 0 }
+  },
+  // Owner replies to a waiting customer, and the total wait they ended
+  responses: {
+    count: { type: Number, default: 0 },
+    totalMs: { type: Number, default: 0 }
+  },
+  updatedAt: {
+    type: Date,
+    default: Date.now
+  }
+});
+
+// One counters document per owner
+ownerStatsSchema.index({ ownerId: 1 }, { unique: true });
+
+module.exports = mongoose.model('OwnerStats', ownerStatsSchema);
@@ -31,4 +31,7 @@ const reviewSchema = new mongoose.Schema({
 // Compound index to prevent duplicate reviews from same user for same listing
 reviewSchema.index({ listingId: 1, userId: 1 }, { unique: true });
 
+// Newest-first review pages for a listing
+reviewSchema.index({ listingId: 1, createdAt: -1, _id: -1 });
+
 module.exports = mongoose.model('Review', reviewSchema);
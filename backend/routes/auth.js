@@ -4,6 +4,15 @@ const { body, validationResult } = require('express-validator');
 const jwt = require('jsonwebtoken');
 const User = require('../models/User');
 
+// Password hashing is saturated: shed the request instead of queueing it forever
+const busy = (res) => {
+  res.set('Retry-After', '1');
+  return res.status(503).json({ 
+    success: false, 
+    message: 'Server is busy, please try again' 
+  });
+};
+
 // @route   POST /api/auth/register
 // @desc    Register a new user
 // @access  Public
@@ -66,6 +75,9 @@ router.post(
         requiresRoleSelection: !user.role
       });
     } catch (error) {
+      if (error.code === 'QUEUE_FULL') {
+        return busy(res);
+      }
       console.error('Registration error:', error);
       res.status(500).json({ 
         success: false, 
@@ -134,6 +146,9 @@ router.post(
         requiresRoleSelection: !user.role
       });
     } catch (error) {
+      if (error.code === 'QUEUE_FULL') {
+        return busy(res);
+      }
       console.error('Login error:', error);
       res.status(500).json({ 
         success: false, 
@@ -3,13 +3,19 @@ const router = express.Router();
 const Conversation = require('../models/Conversation');
 const Message = require('../models/Message');
 const Listing = require('../models/Listing');
+const User = require('../models/User');
 const { authMiddleware } = require('../middleware/auth');
+const { conversationOwner } = require('../utils/chat');
+const { countConversation, queueOwnerStats } = require('../utils/ownerStats');
+const { parseLimit, encodeCursor, decodeCursor, keysetCondition } = require('../utils/pagination');
+
+const MESSAGE_PAGE_SIZE = 50;
 
 // Create or get existing conversation
 router.post('/', authMiddleware, async (req, res) => {
   try {
     const { listingId, ownerId } = req.body;
-    const customerId = req.user.userId;
+    const customerId = req.user._id;
 
     // Validate listing exists and owner is correct
     const listing = await Listing.findById(listingId);
@@ -17,7 +23,7 @@ router.post('/', authMiddleware, async (req, res) => {
       return res.status(404).json({ success: false, message: 'Listing not found' });
     }
 
-    if (listing.owner.toString() !== ownerId) {
+    if (listing.ownerId.toString() !== ownerId) {
       return res.status(400).json({ success: false, message: 'Invalid owner for this listing' });
     }
 
@@ -32,9 +38,11 @@ router.post('/', authMiddleware, async (req, res) => {
       // Create new conversation
       conversation = new Conversation({
         participants: [customerId, ownerId],
-        listingId: listingId
+        listingId: listingId,
+        ownerId: listing.ownerId
       });
       await conversation.save();
+      await countConversation(listing.ownerId);
       
       // Populate the fields
       conversation = await Conversation.findById(conversation._id)
@@ -49,62 +57,126 @@ router.post('/', authMiddleware, async (req, res) => {
   }
 });
 
-// Get all conversations for logged-in user
+// Get conversations for logged-in user, most recently active first
 router.get('/', authMiddleware, async (req, res) => {
   try {
-    const userId = req.user.userId;
-
-    const conversations = await Conversation.find({
-      participants: userId
-    })
-    .populate('participants', 'name email role')
-    .populate('listingId', 'title address price')
-    .sort({ updatedAt: -1 });
-
-    // Get unread message count for each conversation
-    const conversationsWithUnread = await Promise.all(
-      conversations.map(async (conv) => {
-        const unreadCount = await Message.countDocuments({
-          conversationId: conv._id,
-          receiverId: userId,
-          isRead: false
-        });
-        return {
-          ...conv.toObject(),
-          unreadCount
-        };
-      })
-    );
+    const userId = req.user._id;
+    const query = { participants: userId };
+
+    // Resume after the last conversation of the previous page
+    if (req.query.cursor) {
+      const position = decodeCursor(req.query.cursor);
+      if (!position || !(position.key instanceof Date)) {
+        return res.status(400).json({ success: false, message: 'Invalid cursor' });
+      }
+      Object.assign(query, keysetCondition('updatedAt', position));
+    }
 
-    res.json({ success: true, conversations: conversationsWithUnread });
+    const pageSize = parseLimit(req.query.limit);
+    const conversations = await Conversation.find(query)
+      .populate('participants', 'name email role')
+      .populate('listingId', 'title address price')
+      .sort({ updatedAt: -1, _id: -1 })
+      .limit(pageSize + 1)
+      .lean();
+
+    const hasMore = conversations.length > pageSize;
+    if (hasMore) conversations.pop();
+
+    // Unread counts for the whole page in one aggregation on {receiverId, isRead}
+    const unread = await Message.aggregate([
+      {
+        $match: {
+          receiverId: userId,
+          isRead: false,
+          conversationId: { $in: conversations.map(conv => conv._id) }
+        }
+      },
+      { $group: { _id: '$conversationId', count: { $sum: 1 } } }
+    ]);
+    const unreadByConversation = new Map(unread.map(row => [row._id.toString(), row.count]));
+
+    const conversationsWithUnread = conversations.map(conv => ({
+      ...conv,
+      unreadCount: unreadByConversation.get(conv._id.toString()) || 0
+    }));
+    const last = conversations[conversations.length - 1];
+
+    res.json({
+      success: true,
+      conversations: conversationsWithUnread,
+      hasMore,
+      nextCursor: hasMore ? encodeCursor(last.updatedAt, last._id) : null
+    });
   } catch (error) {
     console.error('Error fetching conversations:', error);
     res.status(500).json({ success: false, message: error.message });
   }
 });
 
-// Get messages for a conversation
+// Get a page of messages for a conversation, in chronological order.
+// Without a cursor returns the latest page; ?before= pages back through
+// history and ?after= fetches anything newer than a known message.
 router.get('/:conversationId/messages', authMiddleware, async (req, res) => {
   try {
     const { conversationId } = req.params;
-    const userId = req.user.userId;
+    const { before, after } = req.query;
+    const userId = req.user._id.toString();
 
     // Verify user is part of conversation
-    const conversation = await Conversation.findById(conversationId);
+    const conversation = await Conversation.findById(conversationId).select('participants').lean();
     if (!conversation) {
       return res.status(404).json({ success: false, message: 'Conversation not found' });
     }
 
-    if (!conversation.participants.includes(userId)) {
+    if (!conversation.participants.some(id => id.toString() === userId)) {
       return res.status(403).json({ success: false, message: 'Unauthorized' });
     }
 
-    const messages = await Message.find({ conversationId })
-      .populate('senderId', 'name email role')
-      .populate('receiverId', 'name email role')
-      .sort({ createdAt: 1 });
+    if (before && after) {
+      return res.status(400).json({ success: false, message: 'Use either before or after, not both' });
+    }
+    const cursor = before || after;
+    const direction = after ? 1 : -1;
+    const query = { conversationId: conversation._id };
+    if (cursor) {
+      const position = decodeCursor(cursor);
+      if (!position || !(position.key instanceof Date)) {
+        return res.status(400).json({ success: false, message: 'Invalid cursor' });
+      }
+      Object.assign(query, keysetCondition('createdAt', position, direction));
+    }
 
-    res.json({ success: true, messages });
+    // Served by the {conversationId, createdAt} index
+    const pageSize = parseLimit(req.query.limit, MESSAGE_PAGE_SIZE);
+    const [messages, participants] = await Promise.all([
+      Message.find(query)
+        .sort({ createdAt: direction, _id: direction })
+        .limit(pageSize + 1)
+        .lean(),
+      User.find({ _id: { $in: conversation.participants } })
+        .select('name email role')
+        .lean()
+    ]);
+
+    const hasMore = messages.length > pageSize;
+    if (hasMore) messages.pop();
+    if (direction < 0) messages.reverse();
+
+    const oldest = messages[0];
+    const newest = messages[messages.length - 1];
+    const hasOlder = direction < 0 ? hasMore : Boolean(oldest);
+
+    res.json({
+      success: true,
+      messages,
+      participants,
+      hasMore,
+      cursors: {
+        before: hasOlder && oldest ? encodeCursor(oldest.createdAt, oldest._id) : null,
+        after: newest ? encodeCursor(newest.createdAt, newest._id) : cursor && direction > 0 ? cursor : null
+      }
+    });
   } catch (error) {
     console.error('Error fetching messages:', error);
     res.status(500).json({ success: false, message: error.message });
@@ -115,9 +187,9 @@ router.get('/:conversationId/messages', authMiddleware, async (req, res) => {
 router.put('/:conversationId/read', authMiddleware, async (req, res) => {
   try {
     const { conversationId } = req.params;
-    const userId = req.user.userId;
+    const userId = req.user._id;
 
-    await Message.updateMany(
+    const { modifiedCount } = await Message.updateMany(
       { 
         conversationId, 
         receiverId: userId, 
@@ -126,6 +198,11 @@ router.put('/:conversationId/read', authMiddleware, async (req, res) => {
       { isRead: true }
     );
 
+    // The owner's unread counter, batched with the socket path's
+    if (modifiedCount > 0 && (await conversationOwner(conversationId)) === userId.toString()) {
+      queueOwnerStats(userId, { 'messages.unread': -modifiedCount });
+    }
+
     res.json({ success: true, message: 'Messages marked as read' });
   } catch (error) {
     console.error('Error marking messages as read:', error);
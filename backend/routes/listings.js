@@ -1,9 +1,346 @@
 const express = require('express');
+const mongoose = require('mongoose');
 const router = express.Router();
 const { body, validationResult } = require('express-validator');
 const { authMiddleware, requireRole, requireOwner } = require('../middleware/auth');
+const { cacheListingPages, cacheListingFacets, cacheListing, invalidateListing } = require('../middleware/listingCache');
+const { uploadListingImages } = require('../middleware/imageUpload');
 const Listing = require('../models/Listing');
+const ListingNeighbors = require('../models/ListingNeighbors');
+const ListingAvailability = require('../models/ListingAvailability');
+const BookingLock = require('../models/BookingLock');
 const User = require('../models/User');
+const { parseLimit, encodeCursor, decodeCursor, keysetCondition } = require('../utils/pagination');
+const { queryPrefixes } = require('../utils/search');
+const { distanceMeters } = require('../utils/geo');
+const { neighborCount, affectsSimilarity, scheduleNeighborUpdate } = require('../utils/similarity');
+const { uploadUrl, generateVariants, removeListingUploads } = require('../utils/images');
+const { countListings, moveListingStatus, countReviews } = require('../utils/ownerStats');
+const { TRANSFER_FIELDS } = require('../utils/listingTransfer');
+
+// Fields a client may request through ?fields=
+const PROJECTABLE_FIELDS = Object.keys(Listing.schema.paths)
+  .filter(path => !['__v', 'searchPrefixes'].includes(path));
+const HIDDEN_FIELDS = { searchPrefixes: 0 };
+
+// Fields owners write through POST and PUT, the same ones the bulk import
+// accepts; ratingStats, imageVariants, geo and searchPrefixes are derived
+const editableFields = body => Object.fromEntries(
+  TRANSFER_FIELDS.filter(field => body[field] !== undefined).map(field => [field, body[field]])
+);
+
+const SUGGEST_LIMIT = 8;
+const MAX_SUGGEST_LIMIT = 20;
+const SIMILAR_LIMIT = 6;
+
+// Turn ?fields=title,price into a projection, always keeping the cursor key
+const parseFields = (fields) => {
+  if (!fields) return null;
+  const selected = fields.split(',')
+    .map(field => field.trim())
+    .filter(field => PROJECTABLE_FIELDS.includes(field));
+  if (selected.length === 0) return null;
+  return [...new Set([...selected, 'createdAt'])].join(' ');
+};
+
+const DEFAULT_RADIUS_KM = 10;
+const MAX_RADIUS_KM = 200;
+
+const DAY_MS = 24 * 60 * 60 * 1000;
+// Longest stay for the from/to filter, and longest range an owner can mark at once
+const MAX_STAY_DAYS = 366;
+const MAX_RANGE_DAYS = 3 * 366;
+
+// Parse "lat,lng" into a GeoJSON [lng, lat] pair, null if malformed
+const parseLatLng = (value) => {
+  const parts = String(value).split(',').map(Number);
+  if (parts.length !== 2) return null;
+  const [lat, lng] = parts;
+  if (!(Math.abs(lat) <= 90) || !(Math.abs(lng) <= 180)) return null;
+  return [lng, lat];
+};
+
+// Parse "minLng,minLat,maxLng,maxLat" into a polygon plus its center and
+// half-diagonal, null if malformed
+const parseBbox = (value) => {
+  const parts = String(value).split(',').map(Number);
+  if (parts.length !== 4 || parts.some(n => !Number.isFinite(n))) return null;
+  const [minLng, minLat, maxLng, maxLat] = parts;
+  if (minLng >= maxLng || minLat >= maxLat) return null;
+  if (Math.abs(minLat) > 90 || Math.abs(maxLat) > 90 || Math.abs(minLng) > 180 || Math.abs(maxLng) > 180) return null;
+
+  const center = [(minLng + maxLng) / 2, (minLat + maxLat) / 2];
+  return {
+    polygon: {
+      type: 'Polygon',
+      coordinates: [[
+        [minLng, minLat], [maxLng, minLat], [maxLng, maxLat], [minLng, maxLat], [minLng, minLat]
+      ]]
+    },
+    center,
+    radiusMeters: Math.max(
+      distanceMeters(center, [minLng, minLat]),
+      distanceMeters(center, [maxLng, maxLat])
+    )
+  };
+};
+
+// Apply ?fields= to an aggregation, otherwise hide internal fields
+const projectStage = (projection, extraFields) => {
+  if (!projection) return { $project: HIDDEN_FIELDS };
+  const fields = { ...extraFields };
+  projection.split(' ').forEach(field => { fields[field] = 1; });
+  return { $project: fields };
+};
+
+const populateOwner = async (listings, projection) => {
+  if (!projection || projection.split(' ').includes('ownerId')) {
+    await Listing.populate(listings, { path: 'ownerId', select: 'name email' });
+  }
+  return listings;
+};
+
+// Turn the shared filter parameters of GET / and GET /facets into a query,
+// or { error } when one is malformed
+const parseListingFilter = ({ type, minPrice, maxPrice, location, search, ownerId, near, radiusKm, bbox, minRating, from, to }) => {
+  const query = {};
+  const conditions = [];
+
+  // Build query based on filters
+  if (type) {
+    const types = type.split(',').map(t => t.trim()).filter(Boolean);
+    query.type = types.length > 1 ? { $in: types } : types[0];
+  }
+  if (ownerId) {
+    // Cast explicitly, aggregation pipelines are not cast by Mongoose
+    if (!mongoose.Types.ObjectId.isValid(ownerId)) {
+      return { error: 'Invalid ownerId' };
+    }
+    query.ownerId = new mongoose.Types.ObjectId(ownerId);
+  }
+  if (minPrice || maxPrice) {
+    query.price = {};
+    if (minPrice) query.price.$gte = Number(minPrice);
+    if (maxPrice) query.price.$lte = Number(maxPrice);
+  }
+  if (location) {
+    query.addressText = { $regex: location, $options: 'i' };
+  }
+  if (minRating) {
+    query['ratingStats.average'] = { $gte: Number(minRating) };
+  }
+
+  // Geo filters: distance is measured from near=, or from the bbox center
+  let center = null;
+  let maxDistance = null;
+  if (near) {
+    center = parseLatLng(near);
+    const radius = radiusKm !== undefined ? Number(radiusKm) : DEFAULT_RADIUS_KM;
+    if (!center || !(radius > 0)) {
+      return { error: 'near must be lat,lng and radiusKm a positive number' };
+    }
+    maxDistance = Math.min(radius, MAX_RADIUS_KM) * 1000;
+  }
+  if (bbox) {
+    const box = parseBbox(bbox);
+    if (!box) {
+      return { error: 'bbox must be minLng,minLat,maxLng,maxLat' };
+    }
+    conditions.push({ geo: { $geoWithin: { $geometry: box.polygon } } });
+    if (!center) {
+      center = box.center;
+      maxDistance = box.radiusMeters;
+    }
+  }
+
+  // $text cannot follow $geoNear, so geo searches filter on word prefixes
+  const searchText = search && search.trim();
+  const ranked = Boolean(searchText) && !center;
+  if (searchText && center) {
+    const prefixes = queryPrefixes(searchText);
+    if (prefixes) conditions.push({ searchPrefixes: { $all: prefixes } });
+  }
+
+  if (conditions.length > 0) query.$and = conditions;
+
+  // Free for the whole stay [from, to)
+  let availability = null;
+  if (from || to) {
+    const start = new Date(from);
+    const end = new Date(to);
+    if (!from || !to || Number.isNaN(start.getTime()) || Number.isNaN(end.getTime()) || start >= end) {
+      return { error: 'from and to must both be dates, from before to' };
+    }
+    if (end - start > MAX_STAY_DAYS * DAY_MS) {
+      return { error: `from and to can be at most ${MAX_STAY_DAYS} days apart` };
+    }
+    availability = { from: start, to: end };
+  }
+
+  return { query, center, maxDistance, searchText, ranked, availability };
+};
+
+// Drop listings with a booked or blocked interval overlapping the stay. Each
+// listing costs one bounded probe of the availability index, and the stages
+// stream, so a page stops probing once it is full.
+const excludeUnavailable = (availability) => {
+  if (!availability) return [];
+  return [
+    {
+      $lookup: {
+        from: ListingAvailability.collection.name,
+        localField: '_id',
+        foreignField: 'listingId',
+        pipeline: [
+          { $match: ListingAvailability.overlapping(availability.from, availability.to) },
+          { $limit: 1 },
+          { $project: { _id: 1 } }
+        ],
+        as: 'busy'
+      }
+    },
+    { $match: { busy: { $size: 0 } } },
+    { $unset: 'busy' }
+  ];
+};
+
+// Price bucket lower bounds for GET /facets; the last bucket is open-ended
+const PRICE_BUCKETS = [0, 500, 1000, 1500, 2000, 3000, 5000];
+const MAX_FACILITY_FACETS = 30;
+// Radius unit of $centerSphere: MongoDB's equatorial earth radius in meters
+const EARTH_RADIUS_METERS = 6378100;
+
+// { value, count } per distinct field value, most common first by default
+const countBy = (field, stages, sort = { count: -1, _id: 1 }) => [
+  ...stages,
+  { $group: { _id: `$${field}`, count: { $sum: 1 } } },
+  { $sort: sort },
+  { $project: { _id: 0, value: '$_id', count: 1 } }
+];
+
+// Best-match-first page from the weighted text index
+const findRelevant = async ({ query, search, position, pageSize, projection, availability }) => {
+  const pipeline = [
+    { $match: { ...query, $text: { $search: search } } },
+    { $addFields: { score: { $meta: 'textScore' } } }
+  ];
+  if (position) pipeline.push({ $match: keysetCondition('score', position) });
+  pipeline.push(
+    { $sort: { score: -1, _id: -1 } },
+    ...excludeUnavailable(availability),
+    { $limit: pageSize + 1 },
+    projectStage(projection, { score: 1 })
+  );
+
+  return populateOwner(await Listing.aggregate(pipeline), projection);
+};
+
+// Ascending-distance page around center, using the 2dsphere index
+const findNearby = async ({ query, center, maxDistance, position, pageSize, projection, availability }) => {
+  const pipeline = [
+    {
+      $geoNear: {
+        near: { type: 'Point', coordinates: center },
+        key: 'geo',
+        distanceField: 'distance',
+        maxDistance,
+        spherical: true,
+        query
+      }
+    }
+  ];
+  if (position) {
+    pipeline[0].$geoNear.minDistance = position.key;
+    pipeline.push({ $match: keysetCondition('distance', position, 1) });
+  }
+  pipeline.push(
+    { $sort: { distance: 1, _id: 1 } },
+    ...excludeUnavailable(availability),
+    { $limit: pageSize + 1 },
+    projectStage(projection, { distance: 1 })
+  );
+
+  return populateOwner(await Listing.aggregate(pipeline), projection);
+};
+
+// Sortable fields for the default (non-search, non-geo) listing order
+const SORT_FIELDS = {
+  newest: 'createdAt',
+  rating: 'ratingStats.average'
+};
+
+// Read a possibly dotted path such as 'ratingStats.average'
+const getPath = (doc, path) => path.split('.').reduce((value, key) => (value == null ? value : value[key]), doc);
+
+// Descending (sortField, _id) page using the matching compound index
+const findSorted = async ({ query, sortField, position, pageSize, projection, availability }) => {
+  if (position) {
+    query = { ...query, $and: [...(query.$and || []), keysetCondition(sortField, position)] };
+  }
+
+  // The availability check needs a pipeline; the index still provides the order
+  if (availability) {
+    const listings = await Listing.aggregate([
+      { $match: query },
+      { $sort: { [sortField]: -1, _id: -1 } },
+      ...excludeUnavailable(availability),
+      { $limit: pageSize + 1 },
+      projectStage(projection, { [sortField]: 1 })
+    ]);
+    return populateOwner(listings, projection);
+  }
+
+  let listingsQuery = Listing.find(query)
+    .sort({ [sortField]: -1, _id: -1 })
+    .limit(pageSize + 1);
+  if (projection) listingsQuery = listingsQuery.select(`${projection} ${sortField}`);
+  if (!projection || projection.split(' ').includes('ownerId')) {
+    listingsQuery = listingsQuery.populate('ownerId', 'name email');
+  }
+  return listingsQuery.lean();
+};
+
+// Load req.params.id into req.listing if the signed-in owner owns it
+const loadOwnListing = async (req, res, next) => {
+  try {
+    const listing = await Listing.findById(req.params.id);
+
+    if (!listing) {
+      return res.status(404).json({ 
+        success: false, 
+        message: 'Listing not found' 
+      });
+    }
+
+    if (listing.ownerId.toString() !== req.user._id.toString()) {
+      return res.status(403).json({ 
+        success: false, 
+        message: 'Not authorized to update this listing' 
+      });
+    }
+
+    req.listing = listing;
+    next();
+  } catch (error) {
+    console.error('Load listing error:', error);
+    res.status(500).json({ 
+      success: false, 
+      message: 'Server error' 
+    });
+  }
+};
+
+// Resize an uploaded image in the background and record the variants once
+// written; until then clients fall back to the original
+const recordImageVariants = (listingId, file, src) => {
+  generateVariants(listingId, file)
+    .then(variants => Listing.updateOne(
+      { _id: listingId, images: src },
+      { $push: { imageVariants: { src, variants } } }
+    ))
+    .then(() => invalidateListing(listingId))
+    .catch(error => console.error('Image variants error:', error));
+};
 
 // @route   POST /api/listings
 // @desc    Create a new listing
@@ -31,12 +368,15 @@ router.post(
       }
 
       const listingData = {
-        ...req.body,
+        ...editableFields(req.body),
         ownerId: req.user._id
       };
 
       const listing = new Listing(listingData);
       await listing.save();
+      await countListings(listing.ownerId, [listing.status]);
+      invalidateListing(listing._id);
+      scheduleNeighborUpdate(listing._id);
 
       // Populate owner info
       await listing.populate('ownerId', 'name email');
@@ -56,42 +396,210 @@ router.post(
   }
 );
 
-// @route   GET /api/listings
-// @desc    Get all listings with optional filters
+// @route   POST /api/listings/:id/images
+// @desc    Upload images as multipart field "images". The originals are added
+//          to images right away; thumbnail and WebP variants follow in
+//          imageVariants once the resize workers have produced them.
+// @access  Private (Owner only - own listings)
+router.post('/:id/images', authMiddleware, requireRole, requireOwner, loadOwnListing, uploadListingImages, async (req, res) => {
+  try {
+    const files = req.files || [];
+    if (files.length === 0) {
+      return res.status(400).json({ 
+        success: false, 
+        message: 'No images uploaded' 
+      });
+    }
+
+    const images = files.map(file => uploadUrl(req.listing._id, file.filename));
+    await Listing.updateOne(
+      { _id: req.listing._id },
+      { $push: { images: { $each: images } }, $set: { updatedAt: new Date() } }
+    );
+    invalidateListing(req.listing._id);
+    files.forEach((file, i) => recordImageVariants(req.listing._id, file, images[i]));
+
+    res.status(202).json({
+      success: true,
+      message: 'Images uploaded, thumbnails are being generated',
+      images
+    });
+  } catch (error) {
+    console.error('Upload images error:', error);
+    res.status(500).json({ 
+      success: false, 
+      message: 'Server error' 
+    });
+  }
+});
+
+// @route   GET /api/listings/suggest
+// @desc    Typeahead suggestions matching word prefixes of title or address
+// @access  Public
+router.get('/suggest', async (req, res) => {
+  try {
+    const prefixes = queryPrefixes(req.query.q);
+    if (!prefixes) {
+      return res.json({ success: true, suggestions: [] });
+    }
+
+    const suggestions = await Listing.find({ searchPrefixes: { $all: prefixes } })
+      .select('title addressText type')
+      .sort({ createdAt: -1 })
+      .limit(parseLimit(req.query.limit, SUGGEST_LIMIT, MAX_SUGGEST_LIMIT))
+      .lean();
+
+    res.json({
+      success: true,
+      suggestions
+    });
+  } catch (error) {
+    console.error('Suggest listings error:', error);
+    res.status(500).json({ 
+      success: false, 
+      message: 'Server error' 
+    });
+  }
+});
+
+// @route   GET /api/listings/facets
+// @desc    Counts by type, price bucket, bedrooms, facilities and status for
+//          the same filters as GET /api/listings, in one aggregation. Type and
+//          price counts ignore their own filter, so the panel can show how
+//          many results each alternative would give.
 // @access  Public
-router.get('/', async (req, res) => {
+router.get('/facets', cacheListingFacets, async (req, res) => {
   try {
-    const { type, minPrice, maxPrice, location, search, ownerId } = req.query;
-    
-    let query = {};
-
-    // Build query based on filters
-    if (type) query.type = type;
-    if (ownerId) query.ownerId = ownerId;
-    if (minPrice || maxPrice) {
-      query.price = {};
-      if (minPrice) query.price.$gte = Number(minPrice);
-      if (maxPrice) query.price.$lte = Number(maxPrice);
-    }
-    if (location) {
-      query.addressText = { $regex: location, $options: 'i' };
-    }
-    if (search) {
-      query.$or = [
-        { title: { $regex: search, $options: 'i' } },
-        { description: { $regex: search, $options: 'i' } },
-        { addressText: { $regex: search, $options: 'i' } }
+    const filter = parseListingFilter(req.query);
+    if (filter.error) {
+      return res.status(400).json({ 
+        success: false, 
+        message: filter.error 
+      });
+    }
+
+    const { query, center, maxDistance, searchText, ranked, availability } = filter;
+    const { type, price, ...base } = query;
+    if (ranked) base.$text = { $search: searchText };
+    if (req.query.near) {
+      base.$and = [
+        ...(base.$and || []),
+        { geo: { $geoWithin: { $centerSphere: [center, maxDistance / EARTH_RADIUS_METERS] } } }
       ];
     }
 
-    const listings = await Listing.find(query)
-      .populate('ownerId', 'name email')
-      .sort({ createdAt: -1 });
+    const byType = type !== undefined ? { type } : {};
+    const byPrice = price ? { price } : {};
+    const byBoth = { ...byType, ...byPrice };
+
+    const [facets] = await Listing.aggregate([
+      { $match: base },
+      ...excludeUnavailable(availability),
+      {
+        $facet: {
+          total: [{ $match: byBoth }, { $count: 'count' }],
+          types: countBy('type', [{ $match: byPrice }]),
+          price: [
+            { $match: byType },
+            {
+              $bucket: {
+                groupBy: '$price',
+                boundaries: PRICE_BUCKETS,
+                // Prices at or above the last bound land in the open-ended bucket
+                default: PRICE_BUCKETS[PRICE_BUCKETS.length - 1],
+                output: { count: { $sum: 1 } }
+              }
+            }
+          ],
+          bedrooms: countBy('bedrooms', [{ $match: byBoth }], { _id: 1 }),
+          facilities: [
+            ...countBy('facilities', [{ $match: byBoth }, { $unwind: '$facilities' }]),
+            { $limit: MAX_FACILITY_FACETS }
+          ],
+          status: countBy('status', [{ $match: byBoth }])
+        }
+      }
+    ]);
+
+    res.json({
+      success: true,
+      total: facets.total.length > 0 ? facets.total[0].count : 0,
+      facets: {
+        types: facets.types,
+        price: facets.price.map(({ _id, count }) => {
+          const next = PRICE_BUCKETS[PRICE_BUCKETS.indexOf(_id) + 1];
+          return { min: _id, max: next === undefined ? null : next, count };
+        }),
+        bedrooms: facets.bedrooms,
+        facilities: facets.facilities,
+        status: facets.status
+      }
+    });
+  } catch (error) {
+    console.error('Listing facets error:', error);
+    res.status(500).json({ 
+      success: false, 
+      message: 'Server error' 
+    });
+  }
+});
+
+// @route   GET /api/listings
+// @desc    Get listings with optional filters, one page at a time. Newest
+//          first by default (or top rated with sort=rating), best match
+//          first for search=, nearest first when near= or bbox= is given.
+//          from= and to= keep listings free for that whole stay.
+// @access  Public
+router.get('/', cacheListingPages, async (req, res) => {
+  try {
+    const { cursor, limit, fields, sort } = req.query;
+
+    if (sort && !SORT_FIELDS[sort]) {
+      return res.status(400).json({ 
+        success: false, 
+        message: `sort must be one of: ${Object.keys(SORT_FIELDS).join(', ')}` 
+      });
+    }
+
+    const filter = parseListingFilter(req.query);
+    if (filter.error) {
+      return res.status(400).json({ 
+        success: false, 
+        message: filter.error 
+      });
+    }
+    const { query, center, maxDistance, searchText, ranked, availability } = filter;
+
+    // Resume after the last listing of the previous page
+    const sortKey = center ? 'distance' : ranked ? 'score' : SORT_FIELDS[sort || 'newest'];
+    let position = null;
+    if (cursor) {
+      position = decodeCursor(cursor);
+      if (!position || (position.key instanceof Date) !== (sortKey === 'createdAt')) {
+        return res.status(400).json({ 
+          success: false, 
+          message: 'Invalid cursor' 
+        });
+      }
+    }
+
+    const pageSize = parseLimit(limit);
+    const projection = parseFields(fields);
+    const options = { query, search: searchText, sortField: sortKey, center, maxDistance, position, pageSize, projection, availability };
+    const listings = center
+      ? await findNearby(options)
+      : ranked ? await findRelevant(options) : await findSorted(options);
+
+    const hasMore = listings.length > pageSize;
+    if (hasMore) listings.pop();
+    const last = listings[listings.length - 1];
 
     res.json({
       success: true,
       count: listings.length,
-      listings
+      listings,
+      hasMore,
+      nextCursor: hasMore ? encodeCursor(getPath(last, sortKey), last._id) : null
     });
   } catch (error) {
     console.error('Get listings error:', error);
@@ -102,10 +610,261 @@ router.get('/', async (req, res) => {
   }
 });
 
+// @route   GET /api/listings/:id/similar
+// @desc    Most similar available listings, from the precomputed neighbor list
+// @access  Public
+router.get('/:id/similar', async (req, res) => {
+  try {
+    if (!mongoose.Types.ObjectId.isValid(req.params.id)) {
+      return res.status(400).json({ 
+        success: false, 
+        message: 'Invalid listing id' 
+      });
+    }
+
+    const listings = await ListingNeighbors.aggregate([
+      { $match: { listingId: new mongoose.Types.ObjectId(req.params.id) } },
+      { $unwind: '$neighbors' },
+      {
+        $lookup: {
+          from: Listing.collection.name,
+          localField: 'neighbors.listingId',
+          foreignField: '_id',
+          pipeline: [{ $match: { status: 'available' } }, { $project: HIDDEN_FIELDS }],
+          as: 'listing'
+        }
+      },
+      { $unwind: '$listing' },
+      { $sort: { 'neighbors.score': -1 } },
+      { $limit: parseLimit(req.query.limit, SIMILAR_LIMIT, neighborCount()) },
+      { $replaceRoot: { newRoot: { $mergeObjects: ['$listing', { similarity: '$neighbors.score' }] } } }
+    ]);
+
+    res.json({
+      success: true,
+      count: listings.length,
+      listings
+    });
+  } catch (error) {
+    console.error('Similar listings error:', error);
+    res.status(500).json({ 
+      success: false, 
+      message: 'Server error' 
+    });
+  }
+});
+
+// Merge the stored pieces of each range back into one entry
+const mergeRanges = pieces => [...pieces.reduce((ranges, piece) => {
+  const key = piece.rangeId.toString();
+  const range = ranges.get(key);
+  if (range) {
+    if (piece.start < range.start) range.start = piece.start;
+    if (piece.end > range.end) range.end = piece.end;
+  } else {
+    ranges.set(key, { id: piece.rangeId, start: piece.start, end: piece.end, kind: piece.kind, note: piece.note });
+  }
+  return ranges;
+}, new Map()).values()].sort((a, b) => a.start - b.start);
+
+// How long a booking waits for another one on the same listing to finish
+const BOOKING_WAIT_MS = 2000;
+const BOOKING_RETRY_MS = 25;
+
+// Run work() holding the listing's booking lease; returns BOOKING_BUSY if it
+// stays taken for BOOKING_WAIT_MS
+const BOOKING_BUSY = Symbol('booking busy');
+const withBookingLock = async (listingId, work) => {
+  const waitUntil = Date.now() + BOOKING_WAIT_MS;
+  let token = await BookingLock.acquire(listingId);
+  while (!token) {
+    if (Date.now() >= waitUntil) return BOOKING_BUSY;
+    await new Promise(resolve => setTimeout(resolve, BOOKING_RETRY_MS));
+    token = await BookingLock.acquire(listingId);
+  }
+  try {
+    return await work();
+  } finally {
+    await BookingLock.release(listingId, token);
+  }
+};
+
+// @route   GET /api/listings/:id/availability
+// @desc    Booked and blocked ranges overlapping from..to (default: the next year)
+// @access  Public
+router.get('/:id/availability', async (req, res) => {
+  try {
+    if (!mongoose.Types.ObjectId.isValid(req.params.id)) {
+      return res.status(400).json({ 
+        success: false, 
+        message: 'Invalid listing id' 
+      });
+    }
+
+    const from = req.query.from ? new Date(req.query.from) : new Date();
+    const to = req.query.to ? new Date(req.query.to) : new Date(from.getTime() + MAX_STAY_DAYS * DAY_MS);
+    if (Number.isNaN(from.getTime()) || Number.isNaN(to.getTime()) || from >= to || to - from > MAX_RANGE_DAYS * DAY_MS) {
+      return res.status(400).json({ 
+        success: false, 
+        message: `from and to must be dates, from before to and at most ${MAX_RANGE_DAYS} days apart` 
+      });
+    }
+
+    const pieces = await ListingAvailability.find({
+      listingId: req.params.id,
+      ...ListingAvailability.overlapping(from, to)
+    })
+      .sort({ start: 1 })
+      .lean();
+
+    res.json({
+      success: true,
+      from,
+      to,
+      ranges: mergeRanges(pieces)
+    });
+  } catch (error) {
+    console.error('Get availability error:', error);
+    res.status(500).json({ 
+      success: false, 
+      message: 'Server error' 
+    });
+  }
+});
+
+// @route   POST /api/listings/:id/availability
+// @desc    Mark [start, end) as booked or blocked. A booked range may not
+//          overlap another booked range; bookings of one listing are checked
+//          and stored one at a time.
+// @access  Private (Owner only - own listings)
+router.post(
+  '/:id/availability',
+  [
+    authMiddleware,
+    requireRole,
+    requireOwner,
+    loadOwnListing,
+    body('start').isISO8601().withMessage('start must be a date'),
+    body('end').isISO8601().withMessage('end must be a date'),
+    body('kind').optional().isIn(['booked', 'blocked']).withMessage('kind must be booked or blocked'),
+    body('note').optional().trim().isLength({ max: 200 }).withMessage('Note must be less than 200 characters')
+  ],
+  async (req, res) => {
+    try {
+      const errors = validationResult(req);
+      if (!errors.isEmpty()) {
+        return res.status(400).json({ 
+          success: false, 
+          errors: errors.array() 
+        });
+      }
+
+      const start = new Date(req.body.start);
+      const end = new Date(req.body.end);
+      const kind = req.body.kind || 'blocked';
+      if (start >= end || end - start > MAX_RANGE_DAYS * DAY_MS) {
+        return res.status(400).json({ 
+          success: false, 
+          message: `end must be after start, at most ${MAX_RANGE_DAYS} days later` 
+        });
+      }
+
+      const listingId = req.listing._id;
+      const rangeId = new mongoose.Types.ObjectId();
+      const insert = () => ListingAvailability.insertMany(ListingAvailability.split(start, end).map(piece => ({
+        ...piece,
+        listingId,
+        rangeId,
+        kind,
+        note: req.body.note
+      })));
+
+      if (kind === 'booked') {
+        // Check and insert under the lease, so overlapping bookings sent at
+        // the same time cannot both pass the check
+        const outcome = await withBookingLock(listingId, async () => {
+          const clash = await ListingAvailability.exists({
+            listingId,
+            kind: 'booked',
+            ...ListingAvailability.overlapping(start, end)
+          });
+          if (clash) return 'clash';
+          await insert();
+          return 'inserted';
+        });
+        if (outcome === BOOKING_BUSY) {
+          return res.status(409).json({ 
+            success: false, 
+            message: 'Another booking of this listing is being saved, try again' 
+          });
+        }
+        if (outcome === 'clash') {
+          return res.status(409).json({ 
+            success: false, 
+            message: 'These dates overlap an existing booking' 
+          });
+        }
+      } else {
+        await insert();
+      }
+      invalidateListing(listingId);
+
+      res.status(201).json({
+        success: true,
+        message: 'Availability updated successfully',
+        range: { id: rangeId, start, end, kind, note: req.body.note }
+      });
+    } catch (error) {
+      console.error('Add availability error:', error);
+      res.status(500).json({ 
+        success: false, 
+        message: 'Server error' 
+      });
+    }
+  }
+);
+
+// @route   DELETE /api/listings/:id/availability/:rangeId
+// @desc    Remove a booked or blocked range
+// @access  Private (Owner only - own listings)
+router.delete('/:id/availability/:rangeId', authMiddleware, requireRole, requireOwner, loadOwnListing, async (req, res) => {
+  try {
+    if (!mongoose.Types.ObjectId.isValid(req.params.rangeId)) {
+      return res.status(400).json({ 
+        success: false, 
+        message: 'Invalid range id' 
+      });
+    }
+
+    const { deletedCount } = await ListingAvailability.deleteMany({
+      listingId: req.listing._id,
+      rangeId: req.params.rangeId
+    });
+    if (deletedCount === 0) {
+      return res.status(404).json({ 
+        success: false, 
+        message: 'Range not found' 
+      });
+    }
+    invalidateListing(req.listing._id);
+
+    res.json({
+      success: true,
+      message: 'Availability updated successfully'
+    });
+  } catch (error) {
+    console.error('Delete availability error:', error);
+    res.status(500).json({ 
+      success: false, 
+      message: 'Server error' 
+    });
+  }
+});
+
 // @route   GET /api/listings/:id
 // @desc    Get a single listing by ID
 // @access  Public
-router.get('/:id', async (req, res) => {
+router.get('/:id', cacheListing, async (req, res) => {
   try {
     const listing = await Listing.findById(req.params.id)
       .populate('ownerId', 'name email');
@@ -152,12 +911,18 @@ router.put('/:id', authMiddleware, requireRole, requireOwner, async (req, res) =
       });
     }
 
-    // Update listing
-    listing = await Listing.findByIdAndUpdate(
-      req.params.id,
-      req.body,
-      { new: true, runValidators: true }
-    ).populate('ownerId', 'name email');
+    // Update through save() so derived geo and search fields stay in sync
+    const previousStatus = listing.status;
+    listing.set(editableFields(req.body));
+    if (listing.isModified('images')) {
+      listing.imageVariants = listing.imageVariants.filter(entry => listing.images.includes(entry.src));
+    }
+    const similarityChanged = affectsSimilarity(listing);
+    await listing.save();
+    await moveListingStatus(listing.ownerId, previousStatus, listing.status);
+    invalidateListing(listing._id);
+    if (similarityChanged) scheduleNeighborUpdate(listing._id);
+    await listing.populate('ownerId', 'name email');
 
     res.json({
       success: true,
@@ -196,6 +961,16 @@ router.delete('/:id', authMiddleware, requireRole, requireOwner, async (req, res
     }
 
     await Listing.findByIdAndDelete(req.params.id);
+    await ListingAvailability.deleteMany({ listingId: listing._id });
+    await countListings(listing.ownerId, [listing.status], -1);
+    if (listing.ratingStats && listing.ratingStats.count > 0) {
+      await countReviews(listing.ownerId, -listing.ratingStats.count, -listing.ratingStats.sum);
+    }
+    invalidateListing(req.params.id);
+    scheduleNeighborUpdate(listing._id);
+    removeListingUploads(listing._id).catch(error => {
+      console.error('Remove listing uploads error:', error);
+    });
 
     res.json({
       success: true,
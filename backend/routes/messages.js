@@ -1,49 +1,28 @@
 const express = require('express');
 const router = express.Router();
-const Message = require('../models/Message');
-const Conversation = require('../models/Conversation');
+const chat = require('../utils/chat');
+const { getIO } = require('../socket');
 const { authMiddleware } = require('../middleware/auth');
 
 // Send message (fallback if socket not connected)
 router.post('/', authMiddleware, async (req, res) => {
   try {
-    const { conversationId, receiverId, messageText } = req.body;
-    const senderId = req.user.userId;
+    const { conversationId, messageText } = req.body;
 
-    // Verify conversation exists and user is participant
-    const conversation = await Conversation.findById(conversationId);
-    if (!conversation) {
-      return res.status(404).json({ success: false, message: 'Conversation not found' });
-    }
-
-    if (!conversation.participants.includes(senderId)) {
-      return res.status(403).json({ success: false, message: 'Unauthorized' });
-    }
-
-    // Create message
-    const message = new Message({
-      conversationId,
-      senderId,
-      receiverId,
-      messageText
-    });
+    // Same write path as the socket: cached membership check, batched insert
+    const message = await chat.sendMessage({ conversationId, senderId: req.user._id, messageText });
 
-    await message.save();
-
-    // Update conversation's lastMessage and updatedAt
-    conversation.lastMessage = messageText;
-    conversation.updatedAt = new Date();
-    await conversation.save();
-
-    // Populate message before sending response
-    await message.populate('senderId', 'name email role');
-    await message.populate('receiverId', 'name email role');
+    // Deliver to participants with the conversation open
+    getIO().to(String(conversationId)).emit('receiveMessage', message);
 
     res.json({ success: true, message });
   } catch (error) {
+    if (error.status) {
+      return res.status(error.status).json({ success: false, message: error.message });
+    }
     console.error('Error sending message:', error);
     res.status(500).json({ success: false, message: error.message });
   }
 });
 
-module.exports = router;
\ No newline at end of file
+module.exports = router;
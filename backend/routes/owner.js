@@ -2,7 +2,30 @@ const express = require('express');
 const router = express.Router();
 const { body, validationResult } = require('express-validator');
 const { authMiddleware, requireRole, requireOwner } = require('../middleware/auth');
+const { pipeline } = require('stream/promises');
+const { invalidateListingPages } = require('../middleware/listingCache');
 const OwnerProfile = require('../models/OwnerProfile');
+const Listing = require('../models/Listing');
+const { scheduleNeighborUpdates } = require('../utils/similarity');
+const { countListings, getOwnerStats } = require('../utils/ownerStats');
+const { TRANSFER_FIELDS, FORMATS, readRecords, exportFormatter } = require('../utils/listingTransfer');
+
+// Bulk import limits, read on use:
+//   IMPORT_BATCH_SIZE  rows per insertMany (default 500)
+//   IMPORT_MAX_ROWS    rows per request; later rows are discarded unread, resend them from nextRow (default 5000)
+const importSettings = () => ({
+  batchSize: Number(process.env.IMPORT_BATCH_SIZE) || 500,
+  maxRows: Number(process.env.IMPORT_MAX_ROWS) || 5000
+});
+const MAX_REPORTED_ERRORS = 100;
+
+// ?format= wins over the request Content-Type
+const importFormat = (req) => {
+  if (req.query.format) return FORMATS[req.query.format] ? req.query.format : null;
+  if (req.is(FORMATS.csv)) return 'csv';
+  if (req.is([FORMATS.ndjson, 'application/jsonl'])) return 'ndjson';
+  return null;
+};
 
 // @route   POST /api/owner/profile
 // @desc    Create or update owner profile
@@ -116,4 +139,174 @@ router.get('/profile', authMiddleware, requireRole, requireOwner, async (req, re
   }
 });
 
+// @route   GET /api/owner/stats
+// @desc    Dashboard counters: listings by status, reviews and average rating,
+//          conversations, unread messages and average response time. One read
+//          of precomputed counters, whatever the number of listings.
+// @access  Private (Owner only)
+router.get('/stats', authMiddleware, requireRole, requireOwner, async (req, res) => {
+  try {
+    const stats = await getOwnerStats(req.user._id);
+
+    res.json({
+      success: true,
+      stats
+    });
+  } catch (error) {
+    console.error('Get owner stats error:', error);
+    res.status(500).json({ 
+      success: false, 
+      message: 'Server error' 
+    });
+  }
+});
+
+// @route   POST /api/owner/listings/import
+// @desc    Create many listings from an NDJSON or CSV body, read as it streams
+//          in. Each row is validated on its own and valid rows are inserted in
+//          batches; invalid rows are reported by row number, not fatal.
+// @access  Private (Owner only)
+router.post('/listings/import', authMiddleware, requireRole, requireOwner, async (req, res) => {
+  const format = importFormat(req);
+  if (!format) {
+    return res.status(415).json({ 
+      success: false, 
+      message: 'Send text/csv or application/x-ndjson, or set format=csv|ndjson' 
+    });
+  }
+
+  const { batchSize, maxRows } = importSettings();
+  const summary = { received: 0, inserted: 0, failed: 0, truncated: false, errors: [] };
+  const insertedIds = [];
+  const insertedStatuses = [];
+  let batch = [];
+
+  const reject = (row, message) => {
+    summary.failed++;
+    if (summary.errors.length < MAX_REPORTED_ERRORS) summary.errors.push({ row, message });
+  };
+
+  // Unordered insert: one failing document does not stop the rest
+  const flush = async () => {
+    const rows = batch;
+    batch = [];
+    if (rows.length === 0) return;
+    const failed = new Set();
+    try {
+      await Listing.collection.insertMany(rows.map(({ doc }) => doc), { ordered: false });
+    } catch (error) {
+      if (!error.writeErrors) throw error;
+      [].concat(error.writeErrors).forEach(({ index, errmsg }) => {
+        failed.add(index);
+        reject(rows[index].row, errmsg);
+      });
+    }
+    rows.forEach(({ doc }, index) => {
+      if (failed.has(index)) return;
+      summary.inserted++;
+      insertedIds.push(doc._id);
+      insertedStatuses.push(doc.status);
+    });
+  };
+
+  // Rows past maxRows, or after an error, are not parsed: drain the rest of
+  // the body so the client can finish sending it and read the response
+  const releaseBody = () => {
+    if (!req.readableEnded) req.resume();
+  };
+
+  try {
+    for await (const { row, record, error } of readRecords(req, format)) {
+      if (row > maxRows) {
+        summary.truncated = true;
+        break;
+      }
+      summary.received++;
+      if (error) {
+        reject(row, error);
+        continue;
+      }
+
+      // Same schema validation as save(), without a round trip per row
+      const listing = new Listing({ ...record, ownerId: req.user._id });
+      const invalid = listing.validateSync();
+      if (invalid) {
+        reject(row, Object.values(invalid.errors).map(({ message }) => message).join('; '));
+        continue;
+      }
+      listing.syncDerivedFields();
+      batch.push({ row, doc: listing.toObject({ depopulate: true }) });
+      if (batch.length >= batchSize) await flush();
+    }
+    await flush();
+  } catch (error) {
+    console.error('Import listings error:', error);
+    releaseBody();
+    return res.status(500).json({ 
+      success: false, 
+      message: 'Server error',
+      ...summary
+    });
+  } finally {
+    if (insertedIds.length > 0) {
+      invalidateListingPages();
+      scheduleNeighborUpdates(insertedIds);
+      await countListings(req.user._id, insertedStatuses);
+    }
+  }
+
+  releaseBody();
+  if (summary.received === 0) {
+    return res.status(400).json({ 
+      success: false, 
+      message: 'No records found',
+      ...summary
+    });
+  }
+
+  res.json({
+    success: true,
+    message: `Imported ${summary.inserted} of ${summary.received} listings`,
+    ...summary,
+    nextRow: summary.truncated ? maxRows + 1 : null
+  });
+});
+
+// @route   GET /api/owner/listings/export
+// @desc    Stream all of the owner's listings as NDJSON (default) or CSV
+//          (format=csv), straight from a database cursor
+// @access  Private (Owner only)
+router.get('/listings/export', authMiddleware, requireRole, requireOwner, async (req, res) => {
+  const format = req.query.format || 'ndjson';
+  if (!FORMATS[format]) {
+    return res.status(400).json({ 
+      success: false, 
+      message: `format must be one of: ${Object.keys(FORMATS).join(', ')}` 
+    });
+  }
+
+  const cursor = Listing.find({ ownerId: req.user._id })
+    .select(TRANSFER_FIELDS.join(' '))
+    .sort({ createdAt: 1, _id: 1 })
+    .lean()
+    .cursor({ batchSize: importSettings().batchSize });
+
+  res.set('Content-Type', `${FORMATS[format]}; charset=utf-8`);
+  res.set('Content-Disposition', `attachment; filename="listings.${format}"`);
+
+  try {
+    // Backpressure from the client paces the cursor; a disconnect closes it
+    await pipeline(cursor, exportFormatter(format), res);
+  } catch (error) {
+    if (error.code === 'ERR_STREAM_PREMATURE_CLOSE') return;
+    console.error('Export listings error:', error);
+    if (!res.headersSent) {
+      res.status(500).json({ 
+        success: false, 
+        message: 'Server error' 
+      });
+    }
+  }
+});
+
 module.exports = router;
@@ -2,8 +2,18 @@ const express = require('express');
 const router = express.Router();
 const { body, validationResult } = require('express-validator');
 const { authMiddleware, requireRole } = require('../middleware/auth');
+const { invalidateListing } = require('../middleware/listingCache');
 const Review = require('../models/Review');
 const Listing = require('../models/Listing');
+const { parseLimit, encodeCursor, decodeCursor, keysetCondition } = require('../utils/pagination');
+const { countReviews } = require('../utils/ownerStats');
+
+const EMPTY_RATING_STATS = {
+  count: 0,
+  sum: 0,
+  average: 0,
+  histogram: { 1: 0, 2: 0, 3: 0, 4: 0, 5: 0 }
+};
 
 // @route   POST /api/reviews
 // @desc    Create a review for a listing
@@ -68,6 +78,10 @@ router.post(
       });
 
       await review.save();
+      await Listing.applyRating(listingId, review.rating, 1);
+      await countReviews(listing.ownerId, 1, review.rating);
+      // ratingStats is part of the cached listing responses
+      invalidateListing(listingId);
       await review.populate('userId', 'name');
 
       res.status(201).json({
@@ -76,6 +90,13 @@ router.post(
         review
       });
     } catch (error) {
+      // A concurrent request for the same user and listing won the unique index
+      if (error.code === 11000) {
+        return res.status(400).json({ 
+          success: false, 
+          message: 'You have already reviewed this listing' 
+        });
+      }
       console.error('Create review error:', error);
       res.status(500).json({ 
         success: false, 
@@ -86,24 +107,54 @@ router.post(
 );
 
 // @route   GET /api/reviews/listing/:listingId
-// @desc    Get all reviews for a listing
+// @desc    Get a page of reviews for a listing with its rating stats
 // @access  Public
 router.get('/listing/:listingId', async (req, res) => {
   try {
-    const reviews = await Review.find({ listingId: req.params.listingId })
+    const { listingId } = req.params;
+
+    const listing = await Listing.findById(listingId).select('ratingStats').lean();
+    if (!listing) {
+      return res.status(404).json({ 
+        success: false, 
+        message: 'Listing not found' 
+      });
+    }
+
+    const query = { listingId };
+    if (req.query.cursor) {
+      const position = decodeCursor(req.query.cursor);
+      if (!position || !(position.key instanceof Date)) {
+        return res.status(400).json({ 
+          success: false, 
+          message: 'Invalid cursor' 
+        });
+      }
+      Object.assign(query, keysetCondition('createdAt', position));
+    }
+
+    const pageSize = parseLimit(req.query.limit);
+    const reviews = await Review.find(query)
       .populate('userId', 'name')
-      .sort({ createdAt: -1 });
+      .sort({ createdAt: -1, _id: -1 })
+      .limit(pageSize + 1)
+      .lean();
+
+    const hasMore = reviews.length > pageSize;
+    if (hasMore) reviews.pop();
+    const last = reviews[reviews.length - 1];
 
-    // Calculate average rating
-    const avgRating = reviews.length > 0
-      ? reviews.reduce((acc, review) => acc + review.rating, 0) / reviews.length
-      : 0;
+    // Precomputed on the listing, no scan of the Review collection
+    const ratingStats = { ...EMPTY_RATING_STATS, ...listing.ratingStats };
 
     res.json({
       success: true,
-      count: reviews.length,
-      averageRating: avgRating.toFixed(1),
-      reviews
+      count: ratingStats.count,
+      averageRating: ratingStats.average.toFixed(1),
+      ratingStats,
+      reviews,
+      hasMore,
+      nextCursor: hasMore ? encodeCursor(last.createdAt, last._id) : null
     });
   } catch (error) {
     console.error('Get reviews error:', error);
@@ -159,7 +210,14 @@ router.delete('/:id', authMiddleware, async (req, res) => {
       });
     }
 
-    await Review.findByIdAndDelete(req.params.id);
+    const deleted = await Review.findByIdAndDelete(req.params.id);
+    if (deleted) {
+      await Listing.applyRating(deleted.listingId, deleted.rating, -1);
+      invalidateListing(deleted.listingId);
+      // Reviews of a deleted listing left its owner's counters with it
+      const listing = await Listing.findById(deleted.listingId).select('ownerId').lean();
+      if (listing) await countReviews(listing.ownerId, -1, -deleted.rating);
+    }
 
     res.json({
       success: true,
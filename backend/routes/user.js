@@ -1,7 +1,7 @@
 const express = require('express');
 const router = express.Router();
 const { body, validationResult } = require('express-validator');
-const { authMiddleware } = require('../middleware/auth');
+const { authMiddleware, invalidateUser } = require('../middleware/auth');
 const User = require('../models/User');
 
 // @route   GET /api/user/me
@@ -61,6 +61,7 @@ router.post(
       // Update user role
       req.user.role = role;
       await req.user.save();
+      invalidateUser(req.user._id);
 
       res.json({
         success: true,
@@ -0,0 +1,31 @@
+// Populate Listing.geo for listings created before the 2dsphere index existed.
+// Usage: node scripts/backfillListingGeo.js
+const mongoose = require('mongoose');
+const dotenv = require('dotenv');
+const path = require('path');
+const Listing = require('../models/Listing');
+
+dotenv.config({ path: path.join(__dirname, '..', '.env') });
+
+const run = async () => {
+  await mongoose.connect(`${process.env.MONGO_URL}/${process.env.DB_NAME}`);
+
+  const result = await Listing.updateMany(
+    {
+      latitude: { $type: 'number' },
+      longitude: { $type: 'number' },
+      'geo.coordinates': { $exists: false }
+    },
+    [{ $set: { geo: { type: 'Point', coordinates: ['$longitude', '$latitude'] } } }]
+  );
+  await Listing.syncIndexes();
+
+  console.log(`Backfilled geo on ${result.modifiedCount} listings`);
+};
+
+run()
+  .catch(error => {
+    console.error('Geo backfill error:', error);
+    process.exitCode = 1;
+  })
+  .finally(() => mongoose.disconnect());
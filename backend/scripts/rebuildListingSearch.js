@@ -0,0 +1,47 @@
+// Recompute Listing.searchPrefixes for every listing and sync the search indexes.
+// Usage: node scripts/rebuildListingSearch.js
+const mongoose = require('mongoose');
+const dotenv = require('dotenv');
+const path = require('path');
+const Listing = require('../models/Listing');
+const { buildPrefixes } = require('../utils/search');
+
+dotenv.config({ path: path.join(__dirname, '..', '.env') });
+
+const BATCH_SIZE = 1000;
+
+const run = async () => {
+  await mongoose.connect(`${process.env.MONGO_URL}/${process.env.DB_NAME}`);
+  await Listing.syncIndexes();
+
+  const cursor = Listing.find({}).select('title addressText').lean().cursor({ batchSize: BATCH_SIZE });
+  let batch = [];
+  let updated = 0;
+
+  for await (const listing of cursor) {
+    batch.push({
+      updateOne: {
+        filter: { _id: listing._id },
+        update: { $set: { searchPrefixes: buildPrefixes(listing.title, listing.addressText) } }
+      }
+    });
+    if (batch.length === BATCH_SIZE) {
+      await Listing.bulkWrite(batch, { ordered: false });
+      updated += batch.length;
+      batch = [];
+    }
+  }
+  if (batch.length > 0) {
+    await Listing.bulkWrite(batch, { ordered: false });
+    updated += batch.length;
+  }
+
+  console.log(`Rebuilt search prefixes on ${updated} listings`);
+};
+
+run()
+  .catch(error => {
+    console.error('Search rebuild error:', error);
+    process.exitCode = 1;
+  })
+  .finally(() => mongoose.disconnect());
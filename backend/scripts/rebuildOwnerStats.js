@@ -0,0 +1,178 @@
+// Recompute every owner's dashboard counters (OwnerStats) from the listings,
+// reviews, conversations and messages, and backfill Conversation.ownerId and
+// awaitingReplySince. Changes made while it runs may be counted twice or not
+// at all for the owners they touch, so run it off-peak, or twice.
+// Usage: node scripts/rebuildOwnerStats.js
+const mongoose = require('mongoose');
+const dotenv = require('dotenv');
+const path = require('path');
+const Listing = require('../models/Listing');
+const Review = require('../models/Review');
+const Conversation = require('../models/Conversation');
+const Message = require('../models/Message');
+const OwnerStats = require('../models/OwnerStats');
+const { LISTING_STATUSES } = require('../utils/ownerStats');
+
+dotenv.config({ path: path.join(__dirname, '..', '.env') });
+
+const BATCH_SIZE = 500;
+const CONCURRENCY = 8;
+
+const emptyStats = () => ({
+  listings: { total: 0, ...Object.fromEntries(LISTING_STATUSES.map(status => [status, 0])) },
+  reviews: { count: 0, sum: 0 },
+  conversations: { total: 0 },
+  messages: { unread: 0 },
+  responses: { count: 0, totalMs: 0 }
+});
+
+const timeOf = date => (date ? date.getTime() : null);
+
+// Same rules as the chat write path in utils/chat.js
+const replayConversation = (ownerId, messages, stats) => {
+  let since = null;
+  messages.forEach(({ senderId, receiverId, isRead, createdAt }) => {
+    const fromOwner = senderId.toString() === ownerId;
+    if (!fromOwner && receiverId.toString() !== ownerId) return;
+    if (!fromOwner) {
+      if (!isRead) stats.messages.unread++;
+      since = since || createdAt;
+    } else if (since) {
+      stats.responses.count++;
+      stats.responses.totalMs += createdAt - since;
+      since = null;
+    }
+  });
+  return since;
+};
+
+const run = async () => {
+  await mongoose.connect(`${process.env.MONGO_URL}/${process.env.DB_NAME}`);
+  await OwnerStats.syncIndexes();
+
+  const startedAt = new Date();
+  const owners = new Map();
+  const statsOf = (ownerId) => {
+    const key = ownerId.toString();
+    if (!owners.has(key)) owners.set(key, emptyStats());
+    return owners.get(key);
+  };
+
+  // Conversations from before ownerId was stored
+  await Conversation.aggregate([
+    { $match: { ownerId: null } },
+    {
+      $lookup: {
+        from: Listing.collection.name,
+        localField: 'listingId',
+        foreignField: '_id',
+        as: 'listing'
+      }
+    },
+    { $unwind: '$listing' },
+    { $project: { ownerId: '$listing.ownerId' } },
+    {
+      $merge: {
+        into: Conversation.collection.name,
+        on: '_id',
+        whenMatched: 'merge',
+        whenNotMatched: 'discard'
+      }
+    }
+  ]);
+
+  const listingCounts = await Listing.aggregate([
+    { $group: { _id: { ownerId: '$ownerId', status: '$status' }, count: { $sum: 1 } } }
+  ]).allowDiskUse(true);
+  listingCounts.forEach(({ _id, count }) => {
+    const stats = statsOf(_id.ownerId);
+    const status = LISTING_STATUSES.includes(_id.status) ? _id.status : 'available';
+    stats.listings.total += count;
+    stats.listings[status] += count;
+  });
+
+  // Reviews of listings that still exist
+  const reviewCounts = await Review.aggregate([
+    {
+      $lookup: {
+        from: Listing.collection.name,
+        localField: 'listingId',
+        foreignField: '_id',
+        as: 'listing'
+      }
+    },
+    { $unwind: '$listing' },
+    { $group: { _id: '$listing.ownerId', count: { $sum: 1 }, sum: { $sum: '$rating' } } }
+  ]).allowDiskUse(true);
+  reviewCounts.forEach(({ _id, count, sum }) => {
+    Object.assign(statsOf(_id).reviews, { count, sum });
+  });
+
+  // Unread messages and reply times, one conversation's messages at a time
+  // in their {conversationId, createdAt} index order
+  let processed = 0;
+  let batch = [];
+  const flush = async () => {
+    const writes = [];
+    for (let i = 0; i < batch.length; i += CONCURRENCY) {
+      const chunk = batch.slice(i, i + CONCURRENCY);
+      const histories = await Promise.all(chunk.map(({ _id }) => Message.find({ conversationId: _id })
+        .sort({ createdAt: 1, _id: 1 })
+        .select('senderId receiverId isRead createdAt')
+        .lean()));
+      chunk.forEach((conversation, j) => {
+        const ownerId = conversation.ownerId.toString();
+        const stats = statsOf(ownerId);
+        stats.conversations.total++;
+        const since = replayConversation(ownerId, histories[j], stats);
+        if (timeOf(since) !== timeOf(conversation.awaitingReplySince)) {
+          writes.push({
+            updateOne: {
+              filter: { _id: conversation._id },
+              update: { $set: { awaitingReplySince: since } },
+              timestamps: false
+            }
+          });
+        }
+      });
+    }
+    if (writes.length > 0) await Conversation.bulkWrite(writes, { ordered: false });
+    processed += batch.length;
+    batch = [];
+  };
+
+  const cursor = Conversation.find({ ownerId: { $ne: null } })
+    .select('ownerId awaitingReplySince')
+    .lean()
+    .cursor();
+  for await (const conversation of cursor) {
+    batch.push(conversation);
+    if (batch.length >= BATCH_SIZE) {
+      await flush();
+      console.log(`  ${processed} conversations`);
+    }
+  }
+  await flush();
+
+  const writes = [...owners].map(([ownerId, stats]) => ({
+    updateOne: {
+      filter: { ownerId: new mongoose.Types.ObjectId(ownerId) },
+      update: { $set: { ...stats, updatedAt: new Date() } },
+      upsert: true
+    }
+  }));
+  for (let i = 0; i < writes.length; i += BATCH_SIZE) {
+    await OwnerStats.bulkWrite(writes.slice(i, i + BATCH_SIZE), { ordered: false });
+  }
+
+  // Owners with nothing left, untouched since the run began
+  const { deletedCount } = await OwnerStats.deleteMany({ updatedAt: { $lt: startedAt } });
+  console.log(`Rebuilt owner stats for ${owners.size} owners from ${processed} conversations, removed ${deletedCount} stale`);
+};
+
+run()
+  .catch(error => {
+    console.error('Owner stats rebuild error:', error);
+    process.exitCode = 1;
+  })
+  .finally(() => mongoose.disconnect());
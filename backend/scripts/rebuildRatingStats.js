@@ -0,0 +1,101 @@
+// Recompute Listing.ratingStats from the Review collection: one server-side
+// group per reviewed listing, then a reset of listings without reviews.
+// Usage: node scripts/rebuildRatingStats.js
+const mongoose = require('mongoose');
+const dotenv = require('dotenv');
+const path = require('path');
+const Listing = require('../models/Listing');
+const Review = require('../models/Review');
+
+dotenv.config({ path: path.join(__dirname, '..', '.env') });
+
+const BATCH_SIZE = 500;
+
+const EMPTY_RATING_STATS = { count: 0, sum: 0, average: 0, histogram: { 1: 0, 2: 0, 3: 0, 4: 0, 5: 0 } };
+
+const starCount = star => ({ $sum: { $cond: [{ $eq: ['$rating', star] }, 1, 0] } });
+
+const run = async () => {
+  await mongoose.connect(`${process.env.MONGO_URL}/${process.env.DB_NAME}`);
+  await Listing.syncIndexes();
+  await Review.syncIndexes();
+
+  // One group per reviewed listing, so no document ever holds its reviews
+  await Review.aggregate([
+    {
+      $group: {
+        _id: '$listingId',
+        count: { $sum: 1 },
+        sum: { $sum: '$rating' },
+        average: { $avg: '$rating' },
+        1: starCount(1),
+        2: starCount(2),
+        3: starCount(3),
+        4: starCount(4),
+        5: starCount(5)
+      }
+    },
+    {
+      $project: {
+        ratingStats: {
+          count: '$count',
+          sum: '$sum',
+          average: { $round: ['$average', 2] },
+          histogram: { 1: '$1', 2: '$2', 3: '$3', 4: '$4', 5: '$5' }
+        }
+      }
+    },
+    {
+      $merge: {
+        into: Listing.collection.name,
+        on: '_id',
+        whenMatched: 'merge',
+        whenNotMatched: 'discard'
+      }
+    }
+  ]).allowDiskUse(true);
+
+  // Listings left with stats but no reviews, or never given stats: the lookup
+  // stops at the first review on the {listingId, userId} index
+  const unreviewed = Listing.aggregate([
+    { $match: { 'ratingStats.count': { $ne: 0 } } },
+    {
+      $lookup: {
+        from: Review.collection.name,
+        localField: '_id',
+        foreignField: 'listingId',
+        pipeline: [{ $limit: 1 }, { $project: { _id: 1 } }],
+        as: 'review'
+      }
+    },
+    { $match: { review: { $size: 0 } } },
+    { $project: { _id: 1 } }
+  ]).cursor();
+
+  let reset = 0;
+  let batch = [];
+  const flush = async () => {
+    if (batch.length === 0) return;
+    const { modifiedCount } = await Listing.updateMany(
+      { _id: { $in: batch } },
+      { $set: { ratingStats: EMPTY_RATING_STATS } }
+    );
+    reset += modifiedCount;
+    batch = [];
+  };
+  for await (const { _id } of unreviewed) {
+    batch.push(_id);
+    if (batch.length >= BATCH_SIZE) await flush();
+  }
+  await flush();
+
+  const rated = await Listing.countDocuments({ 'ratingStats.count': { $gt: 0 } });
+  console.log(`Rebuilt rating stats, ${rated} listings have reviews, ${reset} reset to none`);
+};
+
+run()
+  .catch(error => {
+    console.error('Rating stats rebuild error:', error);
+    process.exitCode = 1;
+  })
+  .finally(() => mongoose.disconnect());
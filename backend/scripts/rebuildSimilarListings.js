@@ -0,0 +1,65 @@
+// Recompute every listing's precomputed similar listings (ListingNeighbors).
+// Usage: node scripts/rebuildSimilarListings.js
+const mongoose = require('mongoose');
+const dotenv = require('dotenv');
+const path = require('path');
+const Listing = require('../models/Listing');
+const ListingNeighbors = require('../models/ListingNeighbors');
+const { SIMILARITY_FIELDS, computeNeighbors } = require('../utils/similarity');
+
+dotenv.config({ path: path.join(__dirname, '..', '.env') });
+
+const BATCH_SIZE = 500;
+const CONCURRENCY = 8;
+
+const run = async () => {
+  await mongoose.connect(`${process.env.MONGO_URL}/${process.env.DB_NAME}`);
+  await Listing.syncIndexes();
+  await ListingNeighbors.syncIndexes();
+
+  const startedAt = new Date();
+  let processed = 0;
+  let batch = [];
+
+  // A few listings in flight at once; each costs two or three indexed queries
+  const flush = async () => {
+    const writes = [];
+    for (let i = 0; i < batch.length; i += CONCURRENCY) {
+      const chunk = batch.slice(i, i + CONCURRENCY);
+      const lists = await Promise.all(chunk.map(computeNeighbors));
+      chunk.forEach((listing, j) => {
+        writes.push({
+          updateOne: {
+            filter: { listingId: listing._id },
+            update: { $set: { neighbors: lists[j], updatedAt: new Date() } },
+            upsert: true
+          }
+        });
+      });
+    }
+    if (writes.length > 0) await ListingNeighbors.bulkWrite(writes, { ordered: false });
+    processed += batch.length;
+    batch = [];
+  };
+
+  const cursor = Listing.find().select(SIMILARITY_FIELDS.join(' ')).lean().cursor();
+  for await (const listing of cursor) {
+    batch.push(listing);
+    if (batch.length >= BATCH_SIZE) {
+      await flush();
+      console.log(`  ${processed} listings`);
+    }
+  }
+  await flush();
+
+  // Lists of listings deleted while nothing kept them up to date
+  const { deletedCount } = await ListingNeighbors.deleteMany({ updatedAt: { $lt: startedAt } });
+  console.log(`Rebuilt similar listings for ${processed} listings, removed ${deletedCount} stale lists`);
+};
+
+run()
+  .catch(error => {
+    console.error('Similar listings rebuild error:', error);
+    process.exitCode = 1;
+  })
+  .finally(() => mongoose.disconnect());
@@ -1,9 +1,18 @@
 const express = require('express');
+const cluster = require('cluster');
 const mongoose = require('mongoose');
 const cors = require('cors');
 const dotenv = require('dotenv');
 const http = require('http');
 const { initializeSocket } = require('./socket');
+const { instrumentMongoose, requestTiming, renderMetrics } = require('./utils/metrics');
+const { trafficCapture, closeTrafficCapture } = require('./middleware/trafficCapture');
+const { connectDatabase, ensureIndexes, warmUp, disconnectDatabase } = require('./utils/database');
+const { phase, markReady, readinessGate, healthRoutes, onShutdown, installShutdown } = require('./utils/lifecycle');
+const { flushChat } = require('./utils/chat');
+const { flushOwnerStats } = require('./utils/ownerStats');
+const { warmPasswordWorkers } = require('./utils/passwords');
+const WorkerPool = require('./utils/workerPool');
 
 dotenv.config();
 
@@ -11,20 +20,17 @@ const app = express();
 const server = http.createServer(app);
 
 // Middleware
+app.use(requestTiming);
 app.use(cors({
   origin: process.env.CORS_ORIGINS || '*',
   credentials: true
 }));
+app.use(readinessGate);
 app.use(express.json());
 app.use(express.urlencoded({ extended: true }));
+app.use(trafficCapture());
 
-// MongoDB Connection
-mongoose.connect(`${process.env.MONGO_URL}/${process.env.DB_NAME}`, {
-  useNewUrlParser: true,
-  useUnifiedTopology: true,
-})
-.then(() => console.log('MongoDB connected successfully'))
-.catch(err => console.error('MongoDB connection error:', err));
+instrumentMongoose(mongoose);
 
 // Routes
 const authRoutes = require('./routes/auth');
@@ -34,6 +40,9 @@ const listingRoutes = require('./routes/listings');
 const reviewRoutes = require('./routes/reviews');
 const conversationRoutes = require('./routes/conversations');
 const messageRoutes = require('./routes/messages');
+const { getUserCacheStats } = require('./middleware/auth');
+const { getListingCacheStats } = require('./middleware/listingCache');
+const { UPLOAD_URL_PATH, uploadRoot } = require('./utils/images');
 
 app.use('/api/auth', authRoutes);
 app.use('/api/user', userRoutes);
@@ -43,11 +52,34 @@ app.use('/api/reviews', reviewRoutes);
 app.use('/api/conversations', conversationRoutes);
 app.use('/api/messages', messageRoutes);
 
+// Uploaded listing images; file names are random, so they never change
+app.use(UPLOAD_URL_PATH, express.static(uploadRoot(), { immutable: true, maxAge: '365d', index: false }));
+
 // Health check
 app.get('/api', (req, res) => {
   res.json({ message: 'Rental Marketplace API is running' });
 });
 
+// Liveness and readiness probes
+app.use('/api/health', healthRoutes);
+
+// In-process cache counters
+app.get('/api/stats/cache', (req, res) => {
+  res.json({
+    success: true,
+    caches: {
+      authUser: getUserCacheStats(),
+      listingResponses: getListingCacheStats()
+    }
+  });
+});
+
+// Prometheus metrics for this process
+app.get('/api/metrics', (req, res) => {
+  res.set('Content-Type', 'text/plain; version=0.0.4');
+  res.send(renderMetrics());
+});
+
 // Error handling middleware
 app.use((err, req, res, next) => {
   console.error(err.stack);
@@ -60,8 +92,41 @@ app.use((err, req, res, next) => {
 const PORT = process.env.PORT || 8001;
 
 // Initialize Socket.IO
-initializeSocket(server);
+const io = initializeSocket(server);
+
+// Buffered writes are flushed before the connection pool closes
+onShutdown('chat', flushChat);
+onShutdown('ownerStats', flushOwnerStats);
+onShutdown('trafficCapture', closeTrafficCapture);
+onShutdown('workers', () => WorkerPool.closeAll());
+onShutdown('mongo', disconnectDatabase);
+installShutdown({ server, io });
+
+// Startup: the port is open from the start so probes can answer, but API
+// requests and sockets are refused until the database is connected, its
+// indexes are built and, with STARTUP_WARMUP=1, the hot queries have run once
+const start = async () => {
+  await phase('connect', connectDatabase);
+  console.log('MongoDB connected successfully');
+  const indexTimings = await phase('indexes', ensureIndexes);
+  console.log('Indexes ready:', indexTimings);
+  if (process.env.STARTUP_WARMUP === '1') {
+    await phase('warmup', () => {
+      warmPasswordWorkers();
+      return warmUp();
+    });
+  }
+  markReady();
+};
+
+// In cluster mode the primary owns the port and hands connections over
+if (!cluster.isWorker) {
+  server.listen(PORT, '0.0.0.0', () => {
+    console.log(`Server running on port ${PORT}`);
+  });
+}
 
-server.listen(PORT, '0.0.0.0', () => {
-  console.log(`Server running on port ${PORT}`);
+start().catch((err) => {
+  console.error('Startup error:', err);
+  process.exit(1);
 });
@@ -1,10 +1,19 @@
+const cluster = require('cluster');
 const socketIO = require('socket.io');
 const jwt = require('jsonwebtoken');
-const Message = require('./models/Message');
-const Conversation = require('./models/Conversation');
+const chat = require('./utils/chat');
+const { registerGauge } = require('./utils/metrics');
+const { isReady } = require('./utils/lifecycle');
 
 let io;
 
+// Sockets and conversation rooms held by this process; every socket also
+// has a room of its own, which is not counted
+registerGauge('socketio_connected_clients', 'Socket.IO connections open on this process', () =>
+  (io ? [{ labels: {}, value: io.of('/').sockets.size }] : []));
+registerGauge('socketio_rooms', 'Conversation rooms with at least one socket on this process', () =>
+  (io ? [{ labels: {}, value: io.of('/').adapter.rooms.size - io.of('/').adapter.sids.size }] : []));
+
 const initializeSocket = (server) => {
   io = socketIO(server, {
     cors: {
@@ -13,6 +22,21 @@ const initializeSocket = (server) => {
     }
   });
 
+  // Under cluster.js: share rooms across workers and accept the connections
+  // the primary hands over
+  if (cluster.isWorker) {
+    const { createAdapter } = require('@socket.io/cluster-adapter');
+    const { setupWorker } = require('@socket.io/sticky');
+    io.adapter(createAdapter());
+    setupWorker(io);
+  }
+
+  // No new sockets while starting or draining; clients retry the handshake
+  io.use((socket, next) => {
+    if (!isReady()) return next(new Error('Server is not ready'));
+    next();
+  });
+
   // Socket.IO authentication middleware
   io.use((socket, next) => {
     const token = socket.handshake.auth.token;
@@ -32,97 +56,78 @@ const initializeSocket = (server) => {
   });
 
   io.on('connection', (socket) => {
-    console.log(`User connected: ${socket.userId}`);
-
-    // Join conversation room
-    socket.on('joinConversation', (conversationId) => {
-      socket.join(conversationId);
-      console.log(`User ${socket.userId} joined conversation ${conversationId}`);
+    // Join conversation room, participants only; acknowledged once joined
+    // when the client asks for it
+    socket.on('joinConversation', async (conversationId, ack) => {
+      const reply = typeof ack === 'function' ? ack : () => {};
+      try {
+        if (!(await chat.isParticipant(conversationId, socket.userId))) {
+          socket.emit('error', { message: 'Unauthorized or conversation not found' });
+          return reply({ success: false });
+        }
+        socket.join(String(conversationId));
+        reply({ success: true });
+      } catch (error) {
+        console.error('Error joining conversation:', error);
+        reply({ success: false });
+      }
     });
 
     // Leave conversation room
     socket.on('leaveConversation', (conversationId) => {
-      socket.leave(conversationId);
-      console.log(`User ${socket.userId} left conversation ${conversationId}`);
+      socket.leave(String(conversationId));
     });
 
-    // Send message
+    // Send message: cached membership check, batched insert, broadcast
+    // built from the cached participant profiles
     socket.on('sendMessage', async (data) => {
       try {
-        const { conversationId, receiverId, messageText } = data;
-        const senderId = socket.userId;
-
-        // Verify conversation exists and user is participant
-        const conversation = await Conversation.findById(conversationId);
-        if (!conversation || !conversation.participants.includes(senderId)) {
-          socket.emit('error', { message: 'Unauthorized or conversation not found' });
-          return;
-        }
-
-        // Create and save message
-        const message = new Message({
-          conversationId,
-          senderId,
-          receiverId,
-          messageText
-        });
-
-        await message.save();
-
-        // Update conversation's lastMessage and updatedAt
-        conversation.lastMessage = messageText;
-        conversation.updatedAt = new Date();
-        await conversation.save();
-
-        // Populate message
-        await message.populate('senderId', 'name email role');
-        await message.populate('receiverId', 'name email role');
+        const { conversationId, messageText } = data || {};
+        const message = await chat.sendMessage({ conversationId, senderId: socket.userId, messageText });
 
         // Emit to all users in the conversation room
-        io.to(conversationId).emit('receiveMessage', message);
-
-        console.log(`Message sent in conversation ${conversationId}`);
+        io.to(String(conversationId)).emit('receiveMessage', message);
       } catch (error) {
+        if (error.status) {
+          socket.emit('error', { message: error.message });
+          return;
+        }
         console.error('Error sending message:', error);
         socket.emit('error', { message: 'Failed to send message' });
       }
     });
 
-    // Mark messages as read
+    // Mark messages as read, coalesced per conversation and reader
     socket.on('markAsRead', async (data) => {
       try {
-        const { conversationId } = data;
+        const { conversationId } = data || {};
         const userId = socket.userId;
+        if (!(await chat.isParticipant(conversationId, userId))) return;
 
-        await Message.updateMany(
-          { 
-            conversationId, 
-            receiverId: userId, 
-            isRead: false 
-          },
-          { isRead: true }
-        );
-
-        // Notify the sender that messages were read
-        socket.to(conversationId).emit('messagesRead', { conversationId, userId });
-
-        console.log(`Messages marked as read in conversation ${conversationId} by user ${userId}`);
+        chat.markAsRead(String(conversationId), userId, () => {
+          // Notify the sender that messages were read
+          io.to(String(conversationId)).except(socket.id).emit('messagesRead', { conversationId, userId });
+        });
       } catch (error) {
         console.error('Error marking messages as read:', error);
       }
     });
 
-    // Typing indicator
+    // Typing indicator, throttled per socket and conversation
     socket.on('typing', (data) => {
-      const { conversationId, isTyping } = data;
-      socket.to(conversationId).emit('userTyping', { 
-        userId: socket.userId, 
-        isTyping 
+      const { conversationId, isTyping } = data || {};
+      if (!socket.rooms.has(String(conversationId))) return;
+
+      chat.throttleTyping(`${socket.id}:${conversationId}`, Boolean(isTyping), (typing) => {
+        socket.to(String(conversationId)).emit('userTyping', {
+          userId: socket.userId,
+          isTyping: typing
+        });
       });
     });
 
     socket.on('disconnect', () => {
-      console.log(`User disconnected: ${socket.userId}`);
+      chat.clearTyping(`${socket.id}:`);
     });
   });
 
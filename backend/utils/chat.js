@@ -0,0 +1,337 @@
+const mongoose = require('mongoose');
+const Message = require('../models/Message');
+const Conversation = require('../models/Conversation');
+const User = require('../models/User');
+const Listing = require('../models/Listing');
+const LRUCache = require('./lruCache');
+const { registerGauge } = require('./metrics');
+const { queueOwnerStats } = require('./ownerStats');
+
+// Chat hot path shared by socket.js and routes/messages.js. A message costs
+// one batched insert: membership and participant profiles come from a cache,
+// broadcasts are built from them instead of populate(), and the
+// conversation's lastMessage, read receipts and typing indicators are
+// coalesced over short windows.
+//   CHAT_MEMBERS_CACHE_MAX     conversations kept (default 10000)
+//   CHAT_MEMBERS_CACHE_TTL_MS  how long participant profiles stay (default 300000)
+//   CHAT_FLUSH_MS              lastMessage write-behind window (default 100)
+//   CHAT_READ_WINDOW_MS        markAsRead coalescing window (default 250)
+//   CHAT_TYPING_WINDOW_MS      at most one typing event per user and window (default 300)
+const MAX_INSERT_BATCH = 500;
+const MAX_MESSAGE_LENGTH = 5000;
+
+const settings = () => ({
+  flushMs: Number(process.env.CHAT_FLUSH_MS) || 100,
+  readWindowMs: Number(process.env.CHAT_READ_WINDOW_MS) || 250,
+  typingWindowMs: Number(process.env.CHAT_TYPING_WINDOW_MS) || 300
+});
+
+// Participants never change once a conversation exists, so only the
+// profiles (name, email, role) can go stale, for at most the TTL. Created on
+// first use, after server.js has loaded .env
+let members = null;
+const membersCache = () => {
+  if (!members) {
+    members = new LRUCache({
+      max: Number(process.env.CHAT_MEMBERS_CACHE_MAX) || 10000,
+      ttl: Number(process.env.CHAT_MEMBERS_CACHE_TTL_MS) || 300000
+    });
+  }
+  return members;
+};
+const loading = new Map();
+
+// { participants: Map<userId, { _id, name, email, role }>, ownerId }, null if
+// missing. ownerId is the listing owner's id as a string, looked up on the
+// listing for conversations created before it was stored.
+const loadMembers = async (conversationId) => {
+  const conversation = await Conversation.findById(conversationId).select('participants ownerId listingId').lean();
+  if (!conversation) return null;
+  const [users, listing] = await Promise.all([
+    User.find({ _id: { $in: conversation.participants } }).select('name email role').lean(),
+    conversation.ownerId ? null : Listing.findById(conversation.listingId).select('ownerId').lean()
+  ]);
+  const ownerId = conversation.ownerId || (listing && listing.ownerId);
+  return {
+    participants: new Map(users.map(user => [user._id.toString(), user])),
+    ownerId: ownerId ? ownerId.toString() : null
+  };
+};
+
+// Concurrent first messages of a conversation share one lookup
+const getMembers = async (conversationId) => {
+  const key = String(conversationId);
+  const cached = membersCache().get(key);
+  if (cached) return cached;
+  if (!mongoose.Types.ObjectId.isValid(key)) return null;
+
+  if (!loading.has(key)) {
+    loading.set(key, loadMembers(key).then((entry) => {
+      if (entry) membersCache().set(key, entry);
+      return entry;
+    }).finally(() => loading.delete(key)));
+  }
+  return loading.get(key);
+};
+
+const isParticipant = async (conversationId, userId) => {
+  const entry = await getMembers(conversationId);
+  return Boolean(entry && entry.participants.has(String(userId)));
+};
+
+const conversationOwner = async (conversationId) => {
+  const entry = await getMembers(conversationId);
+  return entry ? entry.ownerId : null;
+};
+
+// Calls flush(batch) with everything added during one window; later values
+// for the same key replace earlier ones
+class WriteBehind {
+  constructor(name, delay, flush) {
+    this.name = name;
+    this.delay = delay;
+    this.flushBatch = flush;
+    this.pending = new Map();
+    this.timer = null;
+  }
+
+  add(key, value) {
+    this.pending.set(key, value);
+    if (!this.timer) this.timer = setTimeout(() => this.flush(), this.delay());
+  }
+
+  async flush() {
+    clearTimeout(this.timer);
+    this.timer = null;
+    if (this.pending.size === 0) return;
+    const batch = this.pending;
+    this.pending = new Map();
+    try {
+      await this.flushBatch(batch);
+    } catch (error) {
+      console.error(`Chat ${this.name} flush error:`, error);
+    }
+  }
+}
+
+// Newest message per conversation; an older write never overwrites a newer
+// one from another process
+const lastMessages = new WriteBehind('lastMessage', () => settings().flushMs, batch =>
+  Conversation.bulkWrite([...batch].map(([conversationId, { text, at }]) => ({
+    updateOne: {
+      filter: { _id: conversationId, updatedAt: { $lte: at } },
+      update: { $set: { lastMessage: text, updatedAt: at } },
+      timestamps: false
+    }
+  })), { ordered: false })
+);
+
+// Who waits for whom, per conversation: the owner's unanswered customer
+// messages start the clock, the owner's next message stops it. Each flush
+// sets awaitingReplySince to the state after the batch; when the owner
+// replied, the previous state comes back to time the replies.
+const replyTurns = new WriteBehind('replyTurn', () => settings().flushMs, async (batch) => {
+  const waiting = [];
+  await Promise.all([...batch].map(async ([conversationId, { ownerId, turns }]) => {
+    const lastReply = turns.map(turn => turn.fromOwner).lastIndexOf(true);
+    if (lastReply === -1) {
+      waiting.push({
+        updateOne: {
+          filter: { _id: conversationId, awaitingReplySince: null },
+          update: { $set: { awaitingReplySince: turns[0].at } },
+          timestamps: false
+        }
+      });
+      return;
+    }
+
+    const next = turns[lastReply + 1];
+    const previous = await Conversation.findOneAndUpdate(
+      { _id: conversationId },
+      { $set: { awaitingReplySince: next ? next.at : null } },
+      { projection: { awaitingReplySince: 1 }, timestamps: false }
+    ).lean();
+
+    let since = previous && previous.awaitingReplySince;
+    const replies = { 'responses.count': 0, 'responses.totalMs': 0 };
+    turns.slice(0, lastReply + 1).forEach(({ fromOwner, at }) => {
+      if (!fromOwner) {
+        since = since || at;
+      } else if (since) {
+        replies['responses.count']++;
+        replies['responses.totalMs'] += at - since;
+        since = null;
+      }
+    });
+    if (replies['responses.count'] > 0) queueOwnerStats(ownerId, replies);
+  }));
+  if (waiting.length > 0) await Conversation.bulkWrite(waiting, { ordered: false });
+});
+
+// Unread counters and reply timing of the conversation's owner; messages
+// between two owners about one's listing count for that listing's owner only
+const recordOwnerActivity = (ownerId, doc) => {
+  if (!ownerId) return;
+  const fromOwner = doc.senderId.toString() === ownerId;
+  if (!fromOwner && doc.receiverId.toString() !== ownerId) return;
+  if (!fromOwner) queueOwnerStats(ownerId, { 'messages.unread': 1 });
+
+  const key = doc.conversationId.toString();
+  const entry = replyTurns.pending.get(key) || { ownerId, turns: [] };
+  entry.turns.push({ fromOwner, at: doc.createdAt });
+  replyTurns.add(key, entry);
+};
+
+// One updateMany per conversation and reader, then the receipts. The owners'
+// reads run on their own, as their counts feed the unread counter.
+const readReceipts = new WriteBehind('markAsRead', () => settings().readWindowMs, async (batch) => {
+  const reads = await Promise.all([...batch.values()].map(async read => ({
+    ...read,
+    ownerId: await conversationOwner(read.conversationId)
+  })));
+  const filter = ({ conversationId, userId }) => ({ conversationId, receiverId: userId, isRead: false });
+  const ownerReads = reads.filter(({ userId, ownerId }) => String(userId) === ownerId);
+  const otherReads = reads.filter(({ userId, ownerId }) => String(userId) !== ownerId);
+
+  await Promise.all([
+    ...ownerReads.map(async (read) => {
+      const { modifiedCount } = await Message.updateMany(filter(read), { $set: { isRead: true } });
+      if (modifiedCount > 0) queueOwnerStats(read.ownerId, { 'messages.unread': -modifiedCount });
+    }),
+    otherReads.length > 0 && Message.bulkWrite(otherReads.map(read => ({
+      updateMany: {
+        filter: filter(read),
+        update: { $set: { isRead: true } }
+      }
+    })), { ordered: false })
+  ]);
+  reads.forEach(({ notify }) => notify());
+});
+
+// Messages arriving in the same tick go out in one insertMany
+let outbox = [];
+
+const flushOutbox = async () => {
+  const batch = outbox.splice(0, MAX_INSERT_BATCH);
+  if (batch.length === 0) return;
+  if (outbox.length > 0) setImmediate(flushOutbox);
+
+  const failed = new Map();
+  try {
+    await Message.collection.insertMany(batch.map(({ doc }) => doc), { ordered: false });
+  } catch (error) {
+    (error.writeErrors ? [].concat(error.writeErrors) : batch.map((_, index) => ({ index })))
+      .forEach(({ index }) => failed.set(index, error));
+  }
+  batch.forEach(({ doc, ownerId, resolve, reject }, index) => {
+    if (failed.has(index)) return reject(failed.get(index));
+    lastMessages.add(doc.conversationId.toString(), { text: doc.messageText, at: doc.createdAt });
+    recordOwnerActivity(ownerId, doc);
+    resolve();
+  });
+};
+
+const enqueue = (doc, ownerId) => new Promise((resolve, reject) => {
+  outbox.push({ doc, ownerId, resolve, reject });
+  if (outbox.length === 1) setImmediate(flushOutbox);
+});
+
+// Store a message and return it shaped like a populated Message document.
+// Throws an error with status 403/400 when the sender may not post it.
+const sendMessage = async ({ conversationId, senderId, messageText }) => {
+  const entry = await getMembers(conversationId);
+  const sender = entry && entry.participants.get(String(senderId));
+  if (!sender) {
+    const error = new Error('Unauthorized or conversation not found');
+    error.status = 403;
+    throw error;
+  }
+
+  const text = typeof messageText === 'string' ? messageText.trim() : '';
+  if (!text || text.length > MAX_MESSAGE_LENGTH) {
+    const error = new Error(`Message must be 1 to ${MAX_MESSAGE_LENGTH} characters`);
+    error.status = 400;
+    throw error;
+  }
+
+  // The receiver is always the other participant, whatever the client sent
+  const receiver = [...entry.participants.values()].find(user => user._id.toString() !== String(senderId)) || sender;
+  const createdAt = new Date();
+  const doc = {
+    _id: new mongoose.Types.ObjectId(),
+    conversationId: new mongoose.Types.ObjectId(String(conversationId)),
+    senderId: sender._id,
+    receiverId: receiver._id,
+    messageText: text,
+    isRead: false,
+    createdAt,
+    updatedAt: createdAt,
+    __v: 0
+  };
+  await enqueue(doc, entry.ownerId);
+
+  return { ...doc, senderId: sender, receiverId: receiver };
+};
+
+// Read receipts of one user in one conversation, written once per window;
+// notify() runs after the write
+const markAsRead = (conversationId, userId, notify) => {
+  readReceipts.add(`${conversationId}:${userId}`, { conversationId, userId, notify });
+};
+
+// Leading-edge throttle per socket and conversation: the first change goes out
+// at once, later ones within the window collapse into the latest state
+const typingStates = new Map();
+
+const throttleTyping = (key, isTyping, emit) => {
+  const state = typingStates.get(key);
+  if (!state) {
+    emit(isTyping);
+    const created = { sent: isTyping, latest: isTyping };
+    created.timer = setTimeout(function release() {
+      if (created.latest !== created.sent) {
+        created.sent = created.latest;
+        emit(created.latest);
+        created.timer = setTimeout(release, settings().typingWindowMs);
+      } else {
+        typingStates.delete(key);
+      }
+    }, settings().typingWindowMs);
+    typingStates.set(key, created);
+  } else {
+    state.latest = isTyping;
+  }
+};
+
+// Drop a disconnected socket's pending typing states
+const clearTyping = (keyPrefix) => {
+  typingStates.forEach((state, key) => {
+    if (key.startsWith(keyPrefix)) {
+      clearTimeout(state.timer);
+      typingStates.delete(key);
+    }
+  });
+};
+
+// Write everything still buffered, e.g. before shutting down
+const flushChat = async () => {
+  while (outbox.length > 0) await flushOutbox();
+  await Promise.all([lastMessages.flush(), readReceipts.flush(), replyTurns.flush()]);
+};
+
+registerGauge('chat_pending_writes', 'Chat writes buffered for the next batch', () => [
+  { labels: { kind: 'message' }, value: outbox.length },
+  { labels: { kind: 'lastMessage' }, value: lastMessages.pending.size },
+  { labels: { kind: 'markAsRead' }, value: readReceipts.pending.size },
+  { labels: { kind: 'replyTurn' }, value: replyTurns.pending.size }
+]);
+
+module.exports = {
+  isParticipant,
+  conversationOwner,
+  sendMessage,
+  markAsRead,
+  throttleTyping,
+  clearTyping,
+  flushChat
+};
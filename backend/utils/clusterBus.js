@@ -0,0 +1,39 @@
+const cluster = require('cluster');
+
+// Fan-out of small messages between cluster workers through the primary,
+// used to keep per-process caches coherent. Outside cluster mode publish()
+// is a no-op, since there are no other processes to tell.
+const MESSAGE_TYPE = 'rentease:bus';
+const handlers = new Map();
+
+const publish = (channel, payload) => {
+  if (cluster.isWorker && process.send) {
+    process.send({ type: MESSAGE_TYPE, channel, payload });
+  }
+};
+
+const subscribe = (channel, handler) => {
+  if (!handlers.has(channel)) handlers.set(channel, []);
+  handlers.get(channel).push(handler);
+};
+
+if (cluster.isWorker) {
+  process.on('message', (message) => {
+    if (!message || message.type !== MESSAGE_TYPE) return;
+    (handlers.get(message.channel) || []).forEach(handler => handler(message.payload));
+  });
+}
+
+// Primary side: relay every bus message to all workers except the sender
+const setupPrimaryRelay = () => {
+  cluster.on('message', (sender, message) => {
+    if (!message || message.type !== MESSAGE_TYPE) return;
+    Object.values(cluster.workers).forEach(worker => {
+      if (worker && worker.id !== sender.id && worker.isConnected()) {
+        worker.send(message);
+      }
+    });
+  });
+};
+
+module.exports = { publish, subscribe, setupPrimaryRelay };
@@ -0,0 +1,132 @@
+const mongoose = require('mongoose');
+const { now, registerGauge } = require('./metrics');
+
+// MongoDB connection, index builds and warm-up for server.js' startup.
+//   MONGO_MAX_POOL_SIZE                connections per process (default 50)
+//   MONGO_MIN_POOL_SIZE                kept open from startup (default 5)
+//   MONGO_MAX_CONNECTING               connections opened at once (default 4)
+//   MONGO_SERVER_SELECTION_TIMEOUT_MS  give up connecting after (default 10000)
+//   MONGO_INDEXES                      create: build missing declared indexes (default),
+//                                      sync: also drop undeclared ones, off: skip
+const settings = () => ({
+  url: `${process.env.MONGO_URL}/${process.env.DB_NAME}`,
+  maxPoolSize: Number(process.env.MONGO_MAX_POOL_SIZE) || 50,
+  minPoolSize: process.env.MONGO_MIN_POOL_SIZE !== undefined ? Number(process.env.MONGO_MIN_POOL_SIZE) : 5,
+  maxConnecting: Number(process.env.MONGO_MAX_CONNECTING) || 4,
+  serverSelectionTimeoutMS: Number(process.env.MONGO_SERVER_SELECTION_TIMEOUT_MS) || 10000,
+  indexes: process.env.MONGO_INDEXES || 'create'
+});
+
+// Connection pool usage from the driver's pool events
+const pool = { open: 0, inUse: 0, waiting: 0, max: 0 };
+
+const watchPool = (client) => {
+  client.on('connectionCreated', () => { pool.open++; });
+  client.on('connectionClosed', () => { pool.open = Math.max(0, pool.open - 1); });
+  client.on('connectionCheckOutStarted', () => { pool.waiting++; });
+  client.on('connectionCheckOutFailed', () => { pool.waiting = Math.max(0, pool.waiting - 1); });
+  client.on('connectionCheckedOut', () => {
+    pool.waiting = Math.max(0, pool.waiting - 1);
+    pool.inUse++;
+  });
+  client.on('connectionCheckedIn', () => { pool.inUse = Math.max(0, pool.inUse - 1); });
+};
+
+// Every connection busy and requests queueing for one
+const poolStats = () => ({ ...pool, saturated: pool.max > 0 && pool.inUse >= pool.max && pool.waiting > 0 });
+
+registerGauge('mongodb_pool_connections', 'MongoDB connections of this process by state', () => [
+  { labels: { state: 'in_use' }, value: pool.inUse },
+  { labels: { state: 'idle' }, value: Math.max(0, pool.open - pool.inUse) }
+]);
+registerGauge('mongodb_pool_waiting', 'Operations waiting for a MongoDB connection', () => [
+  { labels: {}, value: pool.waiting }
+]);
+
+// The driver client is created here so the pool listeners are attached before
+// it opens the minPoolSize connections, then handed to mongoose. Declared
+// indexes are built by ensureIndexes before the server takes traffic, instead
+// of lazily by autoIndex on first model use
+const connectDatabase = async () => {
+  const { url, maxPoolSize, minPoolSize, maxConnecting, serverSelectionTimeoutMS } = settings();
+  pool.max = maxPoolSize;
+  const client = new mongoose.mongo.MongoClient(url, { maxPoolSize, minPoolSize, maxConnecting, serverSelectionTimeoutMS });
+  watchPool(client);
+  await client.connect();
+  mongoose.set('autoIndex', false);
+  mongoose.connection.setClient(client);
+};
+
+// Build the indexes every registered model declares; returns ms per model
+const ensureIndexes = async () => {
+  const { indexes } = settings();
+  const timings = {};
+  if (indexes === 'off') return timings;
+
+  await Promise.all(mongoose.modelNames().map(async (name) => {
+    const startedAt = now();
+    const model = mongoose.model(name);
+    await (indexes === 'sync' ? model.syncIndexes() : model.createIndexes());
+    timings[name] = Math.round(now() - startedAt);
+  }));
+  return timings;
+};
+
+const modelIf = name => (mongoose.modelNames().includes(name) ? mongoose.model(name) : null);
+
+// Hot queries of the first requests after a deploy, run once on the indexes
+// their routes use so those index pages are in the cache: the listing feed,
+// the reviews and conversations of its listings, and the message history and
+// conversation list of the people in those conversations
+const warmQueries = async () => {
+  const [Listing, Review, Conversation, Message] = ['Listing', 'Review', 'Conversation', 'Message'].map(modelIf);
+  if (!Listing) return;
+  const listingIds = (await Listing.find({})
+    .sort({ createdAt: -1, _id: -1 })
+    .limit(21)
+    .populate('ownerId', 'name email')
+    .lean()).map(listing => listing._id);
+
+  const [, conversations] = await Promise.all([
+    Review && Promise.all(listingIds.map(listingId => Review.find({ listingId })
+      .sort({ createdAt: -1, _id: -1 })
+      .limit(21)
+      .lean())),
+    Conversation ? Conversation.find({ listingId: { $in: listingIds } }).select('participants').limit(20).lean() : []
+  ]);
+
+  const participants = [...new Set(conversations.flatMap(({ participants: ids }) => ids.map(String)))];
+  await Promise.all([
+    ...(Message ? conversations.map(({ _id }) => Message.find({ conversationId: _id })
+      .sort({ createdAt: -1, _id: -1 })
+      .limit(51)
+      .lean()) : []),
+    ...participants.map(userId => Conversation.find({ participants: userId })
+      .sort({ updatedAt: -1, _id: -1 })
+      .limit(21)
+      .lean())
+  ]);
+};
+
+// Fills the pool up to minPoolSize while the warm queries run
+const warmUp = async () => {
+  const { minPoolSize } = settings();
+  const db = mongoose.connection.db;
+  await Promise.all([
+    ...Array.from({ length: minPoolSize }, () => db.command({ ping: 1 })),
+    warmQueries()
+  ]);
+};
+
+const isConnected = () => mongoose.connection.readyState === 1;
+
+const disconnectDatabase = () => mongoose.disconnect();
+
+module.exports = {
+  connectDatabase,
+  ensureIndexes,
+  warmUp,
+  poolStats,
+  isConnected,
+  disconnectDatabase
+};
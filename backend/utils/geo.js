@@ -0,0 +1,13 @@
+// Great-circle distance in meters between two [lng, lat] pairs
+const distanceMeters = ([lng1, lat1], [lng2, lat2]) => {
+  const toRad = deg => deg * Math.PI / 180;
+  const dLat = toRad(lat2 - lat1);
+  const dLng = toRad(lng2 - lng1);
+  const a = Math.sin(dLat / 2) ** 2 +
+    Math.cos(toRad(lat1)) * Math.cos(toRad(lat2)) * Math.sin(dLng / 2) ** 2;
+  return 2 * 6371008.8 * Math.asin(Math.sqrt(a));
+};
+
+module.exports = {
+  distanceMeters
+};
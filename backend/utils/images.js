@@ -0,0 +1,74 @@
+const os = require('os');
+const fs = require('fs');
+const path = require('path');
+const WorkerPool = require('./workerPool');
+
+// Storage of uploaded listing images and their resized copies. Files live under
+// UPLOAD_DIR/listings/<listingId>/ and are served by server.js at /uploads.
+//   UPLOAD_DIR        upload root (default backend/uploads)
+//   IMAGE_WORKERS     resize worker threads (default: CPUs - 1, at most 2)
+//   IMAGE_QUEUE_MAX   resize jobs allowed to wait for a worker (default 100)
+// Settings are read on first use, after server.js has loaded .env.
+const UPLOAD_URL_PATH = '/uploads';
+
+// Variants generated per upload: a thumbnail strip, cards and the detail carousel
+const IMAGE_WIDTHS = [160, 480, 1024];
+const IMAGE_FORMATS = ['webp', 'jpeg'];
+
+let pool;
+
+const uploadRoot = () => path.resolve(process.env.UPLOAD_DIR || path.join(__dirname, '..', 'uploads'));
+
+const listingUploadDir = listingId => path.join(uploadRoot(), 'listings', String(listingId));
+
+const uploadUrl = (listingId, file) => `${UPLOAD_URL_PATH}/listings/${listingId}/${file}`;
+
+const getPool = () => {
+  if (!pool) {
+    pool = new WorkerPool({
+      name: 'image',
+      filename: path.join(__dirname, '..', 'workers', 'imageWorker.js'),
+      size: process.env.IMAGE_WORKERS !== undefined
+        ? Math.max(1, Number(process.env.IMAGE_WORKERS))
+        : Math.max(1, Math.min(2, os.cpus().length - 1)),
+      maxQueue: Number(process.env.IMAGE_QUEUE_MAX) || 100
+    });
+  }
+  return pool;
+};
+
+// Whether the resize queue can take this many more jobs
+const hasImageCapacity = (jobs) => {
+  const { queued, maxQueue } = getPool().stats();
+  return queued + jobs <= maxQueue;
+};
+
+// Resize one stored upload into every width and format. Resolves with
+// [{ width, format, url, bytes }]; rejects with error.code === 'QUEUE_FULL'
+// when the pool is saturated.
+const generateVariants = async (listingId, file) => {
+  const variants = await getPool().run({
+    input: file.path,
+    outputDir: file.destination,
+    name: path.parse(file.filename).name,
+    widths: IMAGE_WIDTHS,
+    formats: IMAGE_FORMATS
+  });
+  return variants.map(({ file: variantFile, ...variant }) => ({
+    ...variant,
+    url: uploadUrl(listingId, variantFile)
+  }));
+};
+
+const removeListingUploads = listingId =>
+  fs.promises.rm(listingUploadDir(listingId), { recursive: true, force: true });
+
+module.exports = {
+  UPLOAD_URL_PATH,
+  uploadRoot,
+  listingUploadDir,
+  uploadUrl,
+  hasImageCapacity,
+  generateVariants,
+  removeListingUploads
+};
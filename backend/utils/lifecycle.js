@@ -0,0 +1,156 @@
+const express = require('express');
+const { monitorEventLoopDelay } = require('perf_hooks');
+const { now, registerGauge } = require('./metrics');
+const { isConnected, poolStats } = require('./database');
+
+// Process lifecycle: startup phases, readiness and graceful shutdown.
+//   SHUTDOWN_DRAIN_DELAY_MS  keep serving while reporting not ready, so load
+//                            balancers stop routing here first (default 0)
+//   SHUTDOWN_TIMEOUT_MS      exit anyway once draining takes longer (default 10000)
+const settings = () => ({
+  drainDelayMs: Number(process.env.SHUTDOWN_DRAIN_DELAY_MS) || 0,
+  timeoutMs: Number(process.env.SHUTDOWN_TIMEOUT_MS) || 10000
+});
+
+// starting -> ready -> draining
+let state = 'starting';
+const phases = [];
+let readyMs = null;
+let firstRequestMs = null;
+const shutdownHooks = [];
+
+const uptimeMs = () => Math.round(process.uptime() * 1000);
+
+const eventLoopDelay = monitorEventLoopDelay({ resolution: 20 });
+eventLoopDelay.enable();
+
+// Run one named startup step and record how long it took
+const phase = async (name, fn) => {
+  const startedAt = now();
+  try {
+    return await fn();
+  } finally {
+    const ms = Math.round(now() - startedAt);
+    phases.push({ name, ms });
+    console.log(`Startup: ${name} took ${ms}ms`);
+  }
+};
+
+const markReady = () => {
+  state = 'ready';
+  readyMs = uptimeMs();
+  console.log(`Ready after ${readyMs}ms`);
+};
+
+const isReady = () => state === 'ready' && isConnected();
+
+registerGauge('startup_phase_seconds', 'Duration of each startup step of this process', () =>
+  phases.map(({ name, ms }) => ({ labels: { phase: name }, value: ms / 1000 })));
+
+// Probes and metrics answer in every state
+const EXEMPT = ['/api/health', '/api/metrics'];
+const isExempt = (path) => path === '/api' || path === '/api/' || EXEMPT.some(prefix => path.startsWith(prefix));
+
+// Express middleware: refuses API traffic until startup has finished and
+// asks keep-alive clients to reconnect elsewhere while draining
+const readinessGate = (req, res, next) => {
+  if (isExempt(req.path)) return next();
+
+  if (state === 'starting') {
+    res.set('Retry-After', '1');
+    return res.status(503).json({ success: false, message: 'Server is starting' });
+  }
+  if (state === 'draining') {
+    res.set('Connection', 'close');
+  } else if (firstRequestMs === null) {
+    res.on('finish', () => {
+      if (firstRequestMs === null) firstRequestMs = uptimeMs();
+    });
+  }
+  next();
+};
+
+const healthRoutes = express.Router();
+
+// @route   GET /api/health/live
+// @desc    Liveness: the event loop is turning
+// @access  Public
+healthRoutes.get('/live', (req, res) => {
+  res.json({
+    success: true,
+    status: state,
+    uptimeMs: uptimeMs(),
+    eventLoopDelayMs: {
+      mean: Math.round(eventLoopDelay.mean / 1e4) / 100,
+      p99: Math.round(eventLoopDelay.percentile(99) / 1e4) / 100
+    }
+  });
+});
+
+// @route   GET /api/health/ready
+// @desc    Readiness: started, connected and the connection pool not saturated
+// @access  Public
+healthRoutes.get('/ready', (req, res) => {
+  const pool = poolStats();
+  const ready = isReady() && !pool.saturated;
+  res.status(ready ? 200 : 503).json({
+    success: ready,
+    status: state,
+    mongo: { connected: isConnected(), pool },
+    startup: { phases, readyMs, firstRequestMs }
+  });
+});
+
+// Cleanup steps run in registration order once connections have drained
+const onShutdown = (name, hook) => {
+  shutdownHooks.push({ name, hook });
+};
+
+const runHooks = async () => {
+  for (const { name, hook } of shutdownHooks) {
+    try {
+      await hook();
+    } catch (error) {
+      console.error(`Shutdown ${name} error:`, error);
+    }
+  }
+};
+
+// On SIGTERM/SIGINT: report not ready, stop accepting HTTP and Socket.IO
+// connections, let in-flight requests finish, then run the shutdown hooks
+const installShutdown = ({ server, io }) => {
+  const shutdown = async (signal) => {
+    if (state === 'draining') return;
+    state = 'draining';
+    const { drainDelayMs, timeoutMs } = settings();
+    console.log(`${signal} received, draining connections`);
+    setTimeout(() => {
+      console.error(`Shutdown did not finish within ${timeoutMs}ms, exiting`);
+      process.exit(1);
+    }, timeoutMs).unref();
+
+    if (drainDelayMs > 0) await new Promise(resolve => setTimeout(resolve, drainDelayMs));
+
+    // io.close() disconnects every socket and closes the HTTP server, which
+    // waits for in-flight requests; idle keep-alive connections go now
+    const closed = new Promise(resolve => io.close(() => resolve()));
+    server.closeIdleConnections();
+    await closed;
+
+    await runHooks();
+    process.exit(0);
+  };
+
+  process.on('SIGTERM', () => shutdown('SIGTERM'));
+  process.on('SIGINT', () => shutdown('SIGINT'));
+};
+
+module.exports = {
+  phase,
+  markReady,
+  isReady,
+  readinessGate,
+  healthRoutes,
+  onShutdown,
+  installShutdown
+};
@@ -0,0 +1,199 @@
+const { StringDecoder } = require('string_decoder');
+const { Transform } = require('stream');
+
+// Record formats of the owner bulk import and export: NDJSON (one listing
+// object per line) and CSV with a header row. CSV list columns (facilities,
+// images) join their items with "|".
+
+// Columns written by the export and accepted by the import, in CSV order
+const TRANSFER_FIELDS = [
+  'title', 'type', 'price', 'priceType', 'dailyPrice', 'monthlyPrice', 'squareFeet',
+  'bedrooms', 'bathrooms', 'facilities', 'addressText', 'latitude', 'longitude',
+  'googleMapsLink', 'images', 'description', 'availableFrom', 'status'
+];
+const LIST_FIELDS = ['facilities', 'images'];
+const LIST_SEPARATOR = '|';
+
+const FORMATS = {
+  ndjson: 'application/x-ndjson',
+  csv: 'text/csv'
+};
+
+// Longest accepted record, so one bad line cannot hold the whole body in memory
+const MAX_RECORD_CHARS = 64 * 1024;
+
+const pick = source => TRANSFER_FIELDS.reduce((record, field) => {
+  if (source[field] !== undefined && source[field] !== null) record[field] = source[field];
+  return record;
+}, {});
+
+// Split one CSV record into fields, RFC 4180 quoting
+const parseCsvRecord = (text) => {
+  const fields = [];
+  let field = '';
+  let quoted = false;
+  for (let i = 0; i < text.length; i++) {
+    const char = text[i];
+    if (quoted) {
+      if (char === '"' && text[i + 1] === '"') {
+        field += '"';
+        i++;
+      } else if (char === '"') {
+        quoted = false;
+      } else {
+        field += char;
+      }
+    } else if (char === '"') {
+      quoted = true;
+    } else if (char === ',') {
+      fields.push(field);
+      field = '';
+    } else {
+      field += char;
+    }
+  }
+  fields.push(field);
+  return fields;
+};
+
+const csvValue = (value) => {
+  if (value === undefined || value === null) return '';
+  if (Array.isArray(value)) value = value.join(LIST_SEPARATOR);
+  if (value instanceof Date) value = value.toISOString();
+  const text = String(value);
+  return /[",\r\n]/.test(text) ? `"${text.replace(/"/g, '""')}"` : text;
+};
+
+const csvLine = values => `${values.map(csvValue).join(',')}\r\n`;
+
+const fromCsv = (header, values) => {
+  const record = {};
+  header.forEach((field, i) => {
+    const value = values[i];
+    if (!TRANSFER_FIELDS.includes(field) || value === undefined || value === '') return;
+    record[field] = LIST_FIELDS.includes(field)
+      ? value.split(LIST_SEPARATOR).map(item => item.trim()).filter(Boolean)
+      : value;
+  });
+  return record;
+};
+
+// Lines of a request body as it arrives, holding at most MAX_RECORD_CHARS of
+// one: the rest of a longer line is dropped as it streams in and the line is
+// yielded as TOO_LONG. Leaving the loop early does not destroy the stream.
+const TOO_LONG = Symbol('too long');
+
+async function* readLines(stream) {
+  const decoder = new StringDecoder('utf8');
+  let line = '';
+  let tooLong = false;
+
+  function* split(text) {
+    let start = 0;
+    let end = text.indexOf('\n');
+    while (end !== -1) {
+      const piece = text.slice(start, end);
+      yield tooLong || line.length + piece.length > MAX_RECORD_CHARS ? TOO_LONG : (line + piece).replace(/\r$/, '');
+      line = '';
+      tooLong = false;
+      start = end + 1;
+      end = text.indexOf('\n', start);
+    }
+    const rest = text.slice(start);
+    tooLong = tooLong || line.length + rest.length > MAX_RECORD_CHARS;
+    line = tooLong ? '' : line + rest;
+  }
+
+  for await (const chunk of stream.iterator({ destroyOnReturn: false })) {
+    yield* split(decoder.write(chunk));
+  }
+  yield* split(decoder.end());
+  if (tooLong) yield TOO_LONG;
+  else if (line) yield line.replace(/\r$/, '');
+}
+
+// Yield { row, record } or { row, error } for each record of a request body,
+// reading it line by line as it arrives. row counts records from 1, without
+// the CSV header.
+async function* readRecords(stream, format) {
+  let header = null;
+  let pending = '';
+  let row = 0;
+
+  for await (const line of readLines(stream)) {
+    if (format === 'ndjson') {
+      if (line === TOO_LONG) {
+        row++;
+        yield { row, error: 'Record is too long' };
+        continue;
+      }
+      if (!line.trim()) continue;
+      row++;
+      try {
+        const value = JSON.parse(line);
+        yield value && typeof value === 'object' && !Array.isArray(value)
+          ? { row, record: pick(value) }
+          : { row, error: 'Record must be a JSON object' };
+      } catch (error) {
+        yield { row, error: 'Invalid JSON' };
+      }
+      continue;
+    }
+
+    if (line === TOO_LONG) {
+      if (!header) {
+        yield { row: 0, error: 'Header is too long' };
+        return;
+      }
+      pending = '';
+      row++;
+      yield { row, error: 'Record is too long' };
+      continue;
+    }
+
+    // A quoted CSV field may span lines: wait for the quotes to balance
+    pending = pending ? `${pending}\n${line}` : line;
+    if ((pending.match(/"/g) || []).length % 2 === 1 && pending.length <= MAX_RECORD_CHARS) continue;
+    const text = pending;
+    pending = '';
+    if (!header) {
+      header = parseCsvRecord(text).map(field => field.trim());
+      continue;
+    }
+    if (!text.trim()) continue;
+    row++;
+    yield text.length > MAX_RECORD_CHARS
+      ? { row, error: 'Record is too long' }
+      : { row, record: fromCsv(header, parseCsvRecord(text)) };
+  }
+
+  if (pending) {
+    yield { row: row + 1, error: 'Unterminated quoted field' };
+  }
+}
+
+// Object-mode stream turning lean listings into export lines
+const exportFormatter = (format) => {
+  let first = true;
+  return new Transform({
+    writableObjectMode: true,
+    transform(listing, encoding, callback) {
+      const record = { _id: listing._id, ...pick(listing) };
+      if (format === 'ndjson') return callback(null, `${JSON.stringify(record)}\n`);
+      const header = first ? csvLine(['_id', ...TRANSFER_FIELDS]) : '';
+      first = false;
+      callback(null, header + csvLine(['_id', ...TRANSFER_FIELDS].map(field => record[field])));
+    },
+    // An empty CSV export still gets its header
+    flush(callback) {
+      callback(null, format === 'csv' && first ? csvLine(['_id', ...TRANSFER_FIELDS]) : '');
+    }
+  });
+};
+
+module.exports = {
+  TRANSFER_FIELDS,
+  FORMATS,
+  readRecords,
+  exportFormatter
+};
@@ -0,0 +1,73 @@
+// Bounded in-process LRU cache with optional per-entry TTL and hit/miss counters.
+// Map preserves insertion order, so the first key is always the least recently used.
+class LRUCache {
+  constructor({ max = 1000, ttl = 0 } = {}) {
+    this.max = max;
+    this.ttl = ttl;
+    this.entries = new Map();
+    this.hits = 0;
+    this.misses = 0;
+    this.evictions = 0;
+  }
+
+  get(key) {
+    const entry = this.entries.get(key);
+    if (!entry || (entry.expiresAt && entry.expiresAt <= Date.now())) {
+      if (entry) this.entries.delete(key);
+      this.misses++;
+      return undefined;
+    }
+    // Move to the most recently used position
+    this.entries.delete(key);
+    this.entries.set(key, entry);
+    this.hits++;
+    return entry.value;
+  }
+
+  set(key, value) {
+    this.entries.delete(key);
+    this.entries.set(key, {
+      value,
+      expiresAt: this.ttl ? Date.now() + this.ttl : 0
+    });
+    while (this.entries.size > this.max) {
+      this.entries.delete(this.entries.keys().next().value);
+      this.evictions++;
+    }
+  }
+
+  delete(key) {
+    return this.entries.delete(key);
+  }
+
+  // Drop every entry whose key matches, returning how many were removed
+  deleteWhere(predicate) {
+    let removed = 0;
+    for (const key of this.entries.keys()) {
+      if (predicate(key)) {
+        this.entries.delete(key);
+        removed++;
+      }
+    }
+    return removed;
+  }
+
+  clear() {
+    this.entries.clear();
+  }
+
+  stats() {
+    const lookups = this.hits + this.misses;
+    return {
+      size: this.entries.size,
+      max: this.max,
+      ttlMs: this.ttl,
+      hits: this.hits,
+      misses: this.misses,
+      evictions: this.evictions,
+      hitRatio: lookups > 0 ? Number((this.hits / lookups).toFixed(4)) : 0
+    };
+  }
+}
+
+module.exports = LRUCache;
@@ -0,0 +1,254 @@
+const { AsyncLocalStorage } = require('async_hooks');
+
+// Per-process request and query metrics, rendered in the Prometheus text format.
+// In cluster mode every worker keeps its own registry.
+const DURATION_BUCKETS = [0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10];
+
+// Timing context of the request currently executing, propagated across awaits
+const requestContext = new AsyncLocalStorage();
+
+const now = () => Number(process.hrtime.bigint()) / 1e6;
+
+class Histogram {
+  constructor(name, help, buckets = DURATION_BUCKETS) {
+    this.name = name;
+    this.help = help;
+    this.buckets = buckets;
+    this.series = new Map();
+  }
+
+  observe(labels, value) {
+    const key = JSON.stringify(labels);
+    let series = this.series.get(key);
+    if (!series) {
+      series = { labels, counts: new Array(this.buckets.length).fill(0), sum: 0, count: 0 };
+      this.series.set(key, series);
+    }
+    const index = this.buckets.findIndex(bound => value <= bound);
+    if (index !== -1) series.counts[index]++;
+    series.sum += value;
+    series.count++;
+  }
+
+  render() {
+    const lines = [`# HELP ${this.name} ${this.help}`, `# TYPE ${this.name} histogram`];
+    this.series.forEach(({ labels, counts, sum, count }) => {
+      let cumulative = 0;
+      this.buckets.forEach((bound, i) => {
+        cumulative += counts[i];
+        lines.push(`${this.name}_bucket${formatLabels({ ...labels, le: bound })} ${cumulative}`);
+      });
+      lines.push(`${this.name}_bucket${formatLabels({ ...labels, le: '+Inf' })} ${count}`);
+      lines.push(`${this.name}_sum${formatLabels(labels)} ${sum}`);
+      lines.push(`${this.name}_count${formatLabels(labels)} ${count}`);
+    });
+    return lines.join('\n');
+  }
+}
+
+class Counter {
+  constructor(name, help) {
+    this.name = name;
+    this.help = help;
+    this.series = new Map();
+  }
+
+  inc(labels, value = 1) {
+    const key = JSON.stringify(labels);
+    const series = this.series.get(key);
+    if (series) {
+      series.value += value;
+    } else {
+      this.series.set(key, { labels, value });
+    }
+  }
+
+  render() {
+    const lines = [`# HELP ${this.name} ${this.help}`, `# TYPE ${this.name} counter`];
+    this.series.forEach(({ labels, value }) => {
+      lines.push(`${this.name}${formatLabels(labels)} ${value}`);
+    });
+    return lines.join('\n');
+  }
+}
+
+// Sampled when rendered; collect() returns [{ labels, value }]
+class Gauge {
+  constructor(name, help, collect, type = 'gauge') {
+    this.name = name;
+    this.help = help;
+    this.collect = collect;
+    this.type = type;
+  }
+
+  render() {
+    const lines = [`# HELP ${this.name} ${this.help}`, `# TYPE ${this.name} ${this.type}`];
+    this.collect().forEach(({ labels, value }) => {
+      lines.push(`${this.name}${formatLabels(labels)} ${value}`);
+    });
+    return lines.join('\n');
+  }
+}
+
+const escapeLabel = value => String(value).replace(/\\/g, '\\\\').replace(/"/g, '\\"').replace(/\n/g, '\\n');
+
+const formatLabels = (labels) => {
+  const pairs = Object.entries(labels).map(([key, value]) => `${key}="${escapeLabel(value)}"`);
+  return pairs.length > 0 ? `{${pairs.join(',')}}` : '';
+};
+
+const httpDuration = new Histogram(
+  'http_request_duration_seconds',
+  'HTTP request latency until the response finished, by route and status'
+);
+const httpPhaseSeconds = new Counter(
+  'http_request_phase_seconds_total',
+  'Time spent per request phase (auth, db, serialize), by route'
+);
+const httpDbQueries = new Counter(
+  'http_request_db_queries_total',
+  'MongoDB operations issued while serving requests, by route'
+);
+const httpDbDocuments = new Counter(
+  'http_request_db_documents_total',
+  'Documents returned or written by MongoDB operations, by route'
+);
+const queryDuration = new Histogram(
+  'mongoose_operation_duration_seconds',
+  'Mongoose operation latency by model and operation'
+);
+
+const registry = [httpDuration, httpPhaseSeconds, httpDbQueries, httpDbDocuments, queryDuration];
+
+// Expose a value owned by another module, read at scrape time
+const registerGauge = (name, help, collect, type) => {
+  registry.push(new Gauge(name, help, collect, type));
+};
+
+// Memory of this process, to spot leaks over long runs
+registerGauge('process_resident_memory_bytes', 'Resident set size of this process', () => [
+  { labels: {}, value: process.memoryUsage.rss() }
+]);
+registerGauge('nodejs_heap_bytes', 'V8 heap of this process', () => {
+  const { heapUsed, heapTotal, external } = process.memoryUsage();
+  return [
+    { labels: { kind: 'used' }, value: heapUsed },
+    { labels: { kind: 'total' }, value: heapTotal },
+    { labels: { kind: 'external' }, value: external }
+  ];
+});
+
+// Add time to a phase of the current request, if there is one
+const recordTiming = (phase, ms) => {
+  const context = requestContext.getStore();
+  if (context) context.phases[phase] = (context.phases[phase] || 0) + ms;
+};
+
+const countDocuments = (result) => {
+  if (Array.isArray(result)) return result.length;
+  if (result && typeof result === 'object') {
+    if (typeof result.modifiedCount === 'number') return result.modifiedCount + (result.upsertedCount || 0);
+    if (typeof result.deletedCount === 'number') return result.deletedCount;
+    return 1;
+  }
+  return 0;
+};
+
+const recordOperation = (model, op, startedAt, result) => {
+  const ms = now() - startedAt;
+  queryDuration.observe({ model, op }, ms / 1000);
+  const context = requestContext.getStore();
+  if (context) {
+    context.phases.db = (context.phases.db || 0) + ms;
+    context.queries++;
+    context.documents += countDocuments(result);
+  }
+};
+
+// Wrap an async method so every call is timed and attributed to the current request
+const instrument = (target, method, describe) => {
+  const original = target[method];
+  target[method] = async function (...args) {
+    const startedAt = now();
+    const { model, op } = describe(this);
+    let result;
+    try {
+      result = await original.apply(this, args);
+      return result;
+    } finally {
+      recordOperation(model, op, startedAt, result);
+    }
+  };
+};
+
+// Queries (including those issued by populate), aggregations and document saves
+// all funnel through these methods, whatever order models were compiled in
+const instrumentMongoose = (mongoose) => {
+  instrument(mongoose.Query.prototype, 'exec', query => ({
+    model: query.model ? query.model.modelName : 'unknown',
+    op: query.op || 'query'
+  }));
+  instrument(mongoose.Aggregate.prototype, 'exec', aggregate => ({
+    model: aggregate._model ? aggregate._model.modelName : 'unknown',
+    op: 'aggregate'
+  }));
+  instrument(mongoose.Model.prototype, 'save', doc => ({
+    model: doc.constructor.modelName,
+    op: doc.isNew ? 'insert' : 'save'
+  }));
+};
+
+const formatServerTiming = (context) => {
+  const entries = [`total;dur=${(now() - context.startedAt).toFixed(1)}`];
+  Object.entries(context.phases).forEach(([phase, ms]) => {
+    const desc = phase === 'db' ? `;desc="${context.queries} queries, ${context.documents} docs"` : '';
+    entries.push(`${phase};dur=${ms.toFixed(1)}${desc}`);
+  });
+  return entries.join(', ');
+};
+
+// Express middleware: times each request, adds a Server-Timing header and
+// records the request in the registry once the response has finished
+const requestTiming = (req, res, next) => {
+  const context = { startedAt: now(), phases: {}, queries: 0, documents: 0 };
+
+  const writeHead = res.writeHead;
+  res.writeHead = function (...args) {
+    if (!res.headersSent) res.setHeader('Server-Timing', formatServerTiming(context));
+    return writeHead.apply(this, args);
+  };
+
+  // Same output as Express' res.json, with the JSON.stringify time measured
+  res.json = function (payload) {
+    const startedAt = now();
+    const body = JSON.stringify(payload);
+    recordTiming('serialize', now() - startedAt);
+    if (!res.get('Content-Type')) res.set('Content-Type', 'application/json');
+    return res.send(body);
+  };
+
+  res.on('finish', () => {
+    const route = req.route ? `${req.baseUrl}${req.route.path}` : 'unmatched';
+    httpDuration.observe({ method: req.method, route, status: res.statusCode }, (now() - context.startedAt) / 1000);
+    Object.entries(context.phases).forEach(([phase, ms]) => {
+      httpPhaseSeconds.inc({ route, phase }, ms / 1000);
+    });
+    if (context.queries > 0) {
+      httpDbQueries.inc({ route }, context.queries);
+      httpDbDocuments.inc({ route }, context.documents);
+    }
+  });
+
+  requestContext.run(context, next);
+};
+
+const renderMetrics = () => registry.map(metric => metric.render()).join('\n\n') + '\n';
+
+module.exports = {
+  now,
+  recordTiming,
+  registerGauge,
+  instrumentMongoose,
+  requestTiming,
+  renderMetrics
+};
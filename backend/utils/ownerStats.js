@@ -0,0 +1,124 @@
+const OwnerStats = require('../models/OwnerStats');
+const { registerGauge } = require('./metrics');
+
+// Incremental upkeep of the per-owner dashboard counters (models/OwnerStats.js).
+// Routes apply their change right after their own write; the chat path queues
+// increments, which are merged per owner and written once per window. A crash
+// between the two writes leaves a counter off, which
+// scripts/rebuildOwnerStats.js reconciles.
+//   OWNER_STATS_FLUSH_MS  chat counter write window (default 1000)
+const LISTING_STATUSES = ['available', 'rented', 'unavailable'];
+
+const flushMs = () => Number(process.env.OWNER_STATS_FLUSH_MS) || 1000;
+
+const increment = (ownerId, inc) => ({
+  updateOne: {
+    filter: { ownerId },
+    update: { $inc: inc, $set: { updatedAt: new Date() } },
+    upsert: true
+  }
+});
+
+// Counters are secondary to the write that caused them: a failure is
+// logged and left to the rebuild
+const adjust = async (ownerId, inc) => {
+  if (!ownerId) return;
+  try {
+    await OwnerStats.bulkWrite([increment(ownerId, inc)]);
+  } catch (error) {
+    console.error('Owner stats update error:', error);
+  }
+};
+
+const statusOf = status => (LISTING_STATUSES.includes(status) ? status : 'available');
+
+// Listings added (direction 1) or removed (-1), by their status
+const countListings = (ownerId, statuses, direction = 1) => {
+  const inc = { 'listings.total': direction * statuses.length };
+  statuses.forEach((status) => {
+    const key = `listings.${statusOf(status)}`;
+    inc[key] = (inc[key] || 0) + direction;
+  });
+  return adjust(ownerId, inc);
+};
+
+const moveListingStatus = (ownerId, from, to) => {
+  if (statusOf(from) === statusOf(to)) return Promise.resolve();
+  return adjust(ownerId, { [`listings.${statusOf(from)}`]: -1, [`listings.${statusOf(to)}`]: 1 });
+};
+
+// Reviews added or removed: count and the sum of their ratings
+const countReviews = (ownerId, count, sum) => adjust(ownerId, { 'reviews.count': count, 'reviews.sum': sum });
+
+const countConversation = ownerId => adjust(ownerId, { 'conversations.total': 1 });
+
+// Chat counters, merged per owner until the next flush
+let pending = new Map();
+let timer = null;
+
+const flushOwnerStats = async () => {
+  clearTimeout(timer);
+  timer = null;
+  if (pending.size === 0) return;
+  const batch = pending;
+  pending = new Map();
+  try {
+    await OwnerStats.bulkWrite([...batch].map(([ownerId, inc]) => increment(ownerId, inc)), { ordered: false });
+  } catch (error) {
+    console.error('Owner stats flush error:', error);
+  }
+};
+
+const queueOwnerStats = (ownerId, inc) => {
+  const key = String(ownerId);
+  const merged = pending.get(key) || {};
+  Object.entries(inc).forEach(([field, value]) => {
+    merged[field] = (merged[field] || 0) + value;
+  });
+  pending.set(key, merged);
+  if (!timer) timer = setTimeout(flushOwnerStats, flushMs());
+};
+
+registerGauge('owner_stats_pending_updates', 'Owners with counter updates buffered for the next write', () => [
+  { labels: {}, value: pending.size }
+]);
+
+const average = (sum, count, digits) => (count > 0 ? Number((sum / count).toFixed(digits)) : 0);
+
+// Response shape of GET /api/owner/stats; zeros for an owner with no activity yet
+const getOwnerStats = async (ownerId) => {
+  const stats = await OwnerStats.findOne({ ownerId }).lean();
+  const { listings = {}, reviews = {}, conversations = {}, messages = {}, responses = {} } = stats || {};
+  return {
+    listings: {
+      total: listings.total || 0,
+      byStatus: Object.fromEntries(LISTING_STATUSES.map(status => [status, listings[status] || 0]))
+    },
+    reviews: {
+      count: reviews.count || 0,
+      averageRating: average(reviews.sum || 0, reviews.count || 0, 2)
+    },
+    conversations: {
+      total: conversations.total || 0
+    },
+    messages: {
+      unread: messages.unread || 0
+    },
+    responseTime: {
+      replies: responses.count || 0,
+      averageMs: Math.round(average(responses.totalMs || 0, responses.count || 0, 0))
+    },
+    updatedAt: stats ? stats.updatedAt : null
+  };
+};
+
+module.exports = {
+  LISTING_STATUSES,
+  countListings,
+  moveListingStatus,
+  countReviews,
+  countConversation,
+  queueOwnerStats,
+  flushOwnerStats,
+  getOwnerStats
+};
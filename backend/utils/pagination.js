@@ -0,0 +1,59 @@
+const mongoose = require('mongoose');
+
+const DEFAULT_PAGE_SIZE = 20;
+const MAX_PAGE_SIZE = 100;
+
+// Clamp the requested page size to [1, max]
+const parseLimit = (value, defaultLimit = DEFAULT_PAGE_SIZE, maxLimit = MAX_PAGE_SIZE) => {
+  const limit = parseInt(value, 10);
+  if (Number.isNaN(limit) || limit < 1) return defaultLimit;
+  return Math.min(limit, maxLimit);
+};
+
+// Encode a (sort key, _id) position as an opaque base64url token.
+// The sort key may be a Date (e.g. createdAt), a number (e.g. distance) or
+// null for a document without the field (e.g. an unrated listing).
+const encodeCursor = (key, id) => {
+  const isDate = key instanceof Date || typeof key === 'string';
+  const payload = JSON.stringify({
+    k: isDate ? new Date(key).getTime() : (key ?? null),
+    d: isDate ? 1 : 0,
+    i: id.toString()
+  });
+  return Buffer.from(payload).toString('base64url');
+};
+
+// Decode a cursor produced by encodeCursor, returns null if malformed
+const decodeCursor = (cursor) => {
+  try {
+    const { k, d, i } = JSON.parse(Buffer.from(cursor, 'base64url').toString('utf8'));
+    if (!(Number.isFinite(k) || (k === null && !d)) || !mongoose.Types.ObjectId.isValid(i)) return null;
+    return { key: d ? new Date(k) : k, id: new mongoose.Types.ObjectId(i) };
+  } catch (error) {
+    return null;
+  }
+};
+
+// Build the keyset condition for rows strictly after the cursor position.
+// direction -1 walks the key in descending order, 1 in ascending order.
+// MongoDB sorts missing and null keys below every value, so they come last
+// when descending and first when ascending.
+const keysetCondition = (field, position, direction = -1) => {
+  const op = direction < 0 ? '$lt' : '$gt';
+  const sameKey = { [field]: position.key, _id: { [op]: position.id } };
+  if (position.key === null) {
+    return direction < 0 ? sameKey : { $or: [{ [field]: { $ne: null } }, sameKey] };
+  }
+  const after = [{ [field]: { [op]: position.key } }, sameKey];
+  if (direction < 0) after.push({ [field]: null });
+  return { $or: after };
+};
+
+module.exports = {
+  DEFAULT_PAGE_SIZE,
+  MAX_PAGE_SIZE,
+  parseLimit,
+  encodeCursor,
+  decodeCursor,
+  keysetCondition
+};
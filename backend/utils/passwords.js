@@ -0,0 +1,73 @@
+const os = require('os');
+const path = require('path');
+const bcrypt = require('bcryptjs');
+const WorkerPool = require('./workerPool');
+const { now, recordTiming } = require('./metrics');
+
+// bcrypt hashing and verification on a worker-thread pool, so a login burst
+// does not stall sockets and queries on the event loop.
+//   PASSWORD_HASH_COST       bcrypt cost factor for new hashes (default 10)
+//   PASSWORD_HASH_WORKERS    pool size, 0 hashes inline (default: CPUs - 1, at most 4)
+//   PASSWORD_HASH_QUEUE_MAX  requests allowed to wait for a worker (default 200)
+// Settings are read on first use, after server.js has loaded .env.
+let pool;
+
+const settings = () => ({
+  cost: Number(process.env.PASSWORD_HASH_COST) || 10,
+  workers: process.env.PASSWORD_HASH_WORKERS !== undefined
+    ? Number(process.env.PASSWORD_HASH_WORKERS)
+    : Math.max(1, Math.min(4, os.cpus().length - 1)),
+  maxQueue: Number(process.env.PASSWORD_HASH_QUEUE_MAX) || 200
+});
+
+const getPool = () => {
+  if (pool === undefined) {
+    const { workers, maxQueue } = settings();
+    pool = workers > 0
+      ? new WorkerPool({
+        name: 'password',
+        filename: path.join(__dirname, '..', 'workers', 'passwordWorker.js'),
+        size: workers,
+        maxQueue
+      })
+      : null;
+  }
+  return pool;
+};
+
+const timed = async (work) => {
+  const startedAt = now();
+  try {
+    return await work;
+  } finally {
+    recordTiming('password', now() - startedAt);
+  }
+};
+
+// Rejects with error.code === 'QUEUE_FULL' when the pool is saturated
+const hashPassword = (password) => {
+  const { cost } = settings();
+  const workers = getPool();
+  return timed(workers
+    ? workers.run({ op: 'hash', password, cost })
+    : bcrypt.hash(password, cost));
+};
+
+const comparePassword = (password, hash) => {
+  const workers = getPool();
+  return timed(workers
+    ? workers.run({ op: 'compare', password, hash })
+    : bcrypt.compare(password, hash));
+};
+
+// Start the hashing workers before the first login needs them
+const warmPasswordWorkers = () => {
+  const workers = getPool();
+  if (workers) workers.warm();
+};
+
+module.exports = {
+  hashPassword,
+  comparePassword,
+  warmPasswordWorkers
+};
@@ -0,0 +1,84 @@
+const crypto = require('crypto');
+const LRUCache = require('./lruCache');
+const { now, recordTiming } = require('./metrics');
+
+// Does an If-None-Match header list this ETag? Weak comparison, as RFC 9110
+// prescribes for If-None-Match, so W/"x" matches "x".
+const matchesETag = (header, etag) => {
+  if (!header) return false;
+  return header.split(',').some(tag => {
+    const value = tag.trim();
+    return value === '*' || value === etag || value === `W/${etag}`;
+  });
+};
+
+// In-process cache of serialized JSON responses with strong ETags.
+// A hit never reaches the route handler; a matching If-None-Match gets a 304.
+class ResponseCache {
+  constructor({ max = 1000, ttl = 0, maxEntryBytes = 512 * 1024 } = {}) {
+    this.entries = new LRUCache({ max, ttl });
+    this.maxEntryBytes = maxEntryBytes;
+    // Bumped on every invalidation so responses computed before a write are not stored
+    this.generation = 0;
+    this.notModified = 0;
+    this.bytesServed = 0;
+    this.bytesSaved = 0;
+  }
+
+  // Express middleware caching 200 responses of res.json() under keyFor(req)
+  middleware(keyFor) {
+    return (req, res, next) => {
+      const key = keyFor(req);
+      const cached = this.entries.get(key);
+      if (cached) {
+        return this.send(req, res, cached, 'HIT');
+      }
+
+      const generation = this.generation;
+      const json = res.json.bind(res);
+      res.json = (payload) => {
+        if (res.statusCode !== 200) return json(payload);
+
+        const startedAt = now();
+        const body = Buffer.from(JSON.stringify(payload));
+        recordTiming('serialize', now() - startedAt);
+        const entry = {
+          body,
+          etag: `"${crypto.createHash('sha1').update(body).digest('base64url')}"`
+        };
+        if (generation === this.generation && body.length <= this.maxEntryBytes) {
+          this.entries.set(key, entry);
+        }
+        return this.send(req, res, entry, 'MISS');
+      };
+      next();
+    };
+  }
+
+  send(req, res, entry, status) {
+    res.set({ ETag: entry.etag, 'X-Cache': status });
+    if (matchesETag(req.get('If-None-Match'), entry.etag)) {
+      this.notModified++;
+      this.bytesSaved += entry.body.length;
+      return res.status(304).end();
+    }
+    if (status === 'HIT') this.bytesServed += entry.body.length;
+    return res.type('json').send(entry.body);
+  }
+
+  invalidate(predicate) {
+    this.generation++;
+    return this.entries.deleteWhere(predicate);
+  }
+
+  stats() {
+    return {
+      ...this.entries.stats(),
+      notModified: this.notModified,
+      bytesServed: this.bytesServed,
+      bytesSaved: this.bytesSaved
+    };
+  }
+}
+
+module.exports = ResponseCache;
@@ -0,0 +1,45 @@
+// Tokenising shared by the listing search index and search queries
+
+const MIN_PREFIX_LENGTH = 2;
+const MAX_PREFIX_LENGTH = 15;
+
+// Lowercase, strip accents and split on anything that is not a letter or digit
+const tokenize = (text) => {
+  if (!text) return [];
+  return String(text)
+    .normalize('NFKD')
+    .replace(/[\u0300-\u036f]/g, '')
+    .toLowerCase()
+    .split(/[^a-z0-9]+/)
+    .filter(Boolean);
+};
+
+// Every leading substring of each token, used for prefix/typeahead matching
+const buildPrefixes = (...texts) => {
+  const prefixes = new Set();
+  texts.forEach(text => {
+    tokenize(text).forEach(token => {
+      const max = Math.min(token.length, MAX_PREFIX_LENGTH);
+      for (let length = MIN_PREFIX_LENGTH; length <= max; length++) {
+        prefixes.add(token.slice(0, length));
+      }
+    });
+  });
+  return [...prefixes];
+};
+
+// Query-side tokens matching what buildPrefixes stored, null if too short to use
+const queryPrefixes = (text) => {
+  const tokens = tokenize(text)
+    .filter(token => token.length >= MIN_PREFIX_LENGTH)
+    .map(token => token.slice(0, MAX_PREFIX_LENGTH));
+  return tokens.length > 0 ? [...new Set(tokens)] : null;
+};
+
+module.exports = {
+  MIN_PREFIX_LENGTH,
+  MAX_PREFIX_LENGTH,
+  tokenize,
+  buildPrefixes,
+  queryPrefixes
+};
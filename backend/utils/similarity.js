@@ -0,0 +1,209 @@
+const Listing = require('../models/Listing');
+const ListingNeighbors = require('../models/ListingNeighbors');
+const { distanceMeters } = require('./geo');
+
+// Precomputed "similar listings". Every listing keeps its top-k most similar
+// listings in ListingNeighbors, so a detail page reads them with one indexed
+// lookup. Writes in routes/listings.js patch the affected lists incrementally;
+// scripts/rebuildSimilarListings.js recomputes all of them.
+//   SIMILAR_LISTINGS_K  neighbors kept per listing (default 12)
+
+// Listing fields that feed the score
+const SIMILARITY_FIELDS = ['type', 'price', 'squareFeet', 'facilities', 'geo'];
+// Fields a client edits to change them (geo follows latitude/longitude)
+const SOURCE_FIELDS = ['type', 'price', 'squareFeet', 'facilities', 'latitude', 'longitude'];
+
+// Score weights, summing to 1
+const WEIGHTS = {
+  type: 0.3,
+  price: 0.2,
+  squareFeet: 0.15,
+  facilities: 0.15,
+  distance: 0.2
+};
+
+// Distance at which the distance term has decayed to 1/e
+const DISTANCE_SCALE_KM = 25;
+
+// Candidates per side of the price band, and from the surrounding area
+const PRICE_CANDIDATES = 100;
+const NEARBY_CANDIDATES = 100;
+const NEARBY_RADIUS_KM = 50;
+
+const neighborCount = () => Number(process.env.SIMILAR_LISTINGS_K) || 12;
+
+// 1 for equal values, falling to 0 at a factor of two apart
+const ratioCloseness = (a, b) => {
+  if (!(a > 0) || !(b > 0)) return a === b ? 1 : 0;
+  return Math.max(0, 1 - Math.abs(Math.log2(a / b)));
+};
+
+const jaccard = (a = [], b = []) => {
+  const left = new Set(a);
+  const right = new Set(b);
+  let shared = 0;
+  right.forEach(item => { if (left.has(item)) shared++; });
+  const union = left.size + right.size - shared;
+  return union > 0 ? shared / union : 0;
+};
+
+const coordinatesOf = listing =>
+  (listing.geo && listing.geo.coordinates && listing.geo.coordinates.length === 2 ? listing.geo.coordinates : null);
+
+// Symmetric similarity in [0, 1] of two listings holding SIMILARITY_FIELDS
+const similarity = (a, b) => {
+  let score = 0;
+  if (a.type === b.type) score += WEIGHTS.type;
+  score += WEIGHTS.price * ratioCloseness(a.price, b.price);
+  score += WEIGHTS.squareFeet * ratioCloseness(a.squareFeet, b.squareFeet);
+  score += WEIGHTS.facilities * jaccard(a.facilities, b.facilities);
+  const from = coordinatesOf(a);
+  const to = coordinatesOf(b);
+  if (from && to) {
+    score += WEIGHTS.distance * Math.exp(-distanceMeters(from, to) / 1000 / DISTANCE_SCALE_KM);
+  }
+  return Math.round(score * 10000) / 10000;
+};
+
+const byScore = (a, b) => b.score - a.score || String(a.listingId).localeCompare(String(b.listingId));
+
+// Listings that can plausibly make the top k: the closest prices of the same
+// type on either side, from the { type, price } index, plus the nearest
+// listings of any type, from the 2dsphere index
+const findCandidates = async (listing) => {
+  const select = SIMILARITY_FIELDS.join(' ');
+  const others = { _id: { $ne: listing._id } };
+  const lookups = [
+    Listing.find({ ...others, type: listing.type, price: { $gte: listing.price, $lte: listing.price * 2 } })
+      .select(select).sort({ price: 1 }).limit(PRICE_CANDIDATES).lean(),
+    Listing.find({ ...others, type: listing.type, price: { $lt: listing.price, $gte: listing.price / 2 } })
+      .select(select).sort({ price: -1 }).limit(PRICE_CANDIDATES).lean()
+  ];
+  const center = coordinatesOf(listing);
+  if (center) {
+    lookups.push(Listing.find({
+      ...others,
+      geo: {
+        $nearSphere: {
+          $geometry: { type: 'Point', coordinates: center },
+          $maxDistance: NEARBY_RADIUS_KM * 1000
+        }
+      }
+    }).select(select).limit(NEARBY_CANDIDATES).lean());
+  }
+
+  const candidates = new Map();
+  (await Promise.all(lookups)).flat().forEach(candidate => {
+    candidates.set(String(candidate._id), candidate);
+  });
+  return [...candidates.values()];
+};
+
+// Top-k neighbor list of a listing among the given candidates
+const rankNeighbors = (listing, candidates) => candidates
+  .map(candidate => ({ listingId: candidate._id, score: similarity(listing, candidate) }))
+  .sort(byScore)
+  .slice(0, neighborCount());
+
+const computeNeighbors = async listing => rankNeighbors(listing, await findCandidates(listing));
+
+const replaceNeighbors = (listingId, neighbors) => ({
+  updateOne: {
+    filter: { listingId },
+    update: { $set: { neighbors, updatedAt: new Date() } },
+    upsert: true
+  }
+});
+
+// Recompute a created or changed listing's own list, and move it into, within
+// or out of the lists of the listings around it. Lists it drops out of keep a
+// free slot until their next update or rebuild.
+const updateListingNeighbors = async (listingId) => {
+  const listing = await Listing.findById(listingId).select(SIMILARITY_FIELDS.join(' ')).lean();
+  if (!listing) return removeListingNeighbors(listingId);
+
+  const candidates = await findCandidates(listing);
+  const id = String(listing._id);
+  const k = neighborCount();
+
+  // Lists that may change: those of the candidates, and those already holding the listing
+  const lists = await ListingNeighbors.find({
+    $or: [
+      { listingId: { $in: candidates.map(candidate => candidate._id) } },
+      { 'neighbors.listingId': listing._id }
+    ]
+  }).lean();
+
+  // Referrers that are no longer candidates still need a fresh score
+  const known = new Map(candidates.map(candidate => [String(candidate._id), candidate]));
+  const missing = lists.map(list => list.listingId).filter(other => !known.has(String(other)));
+  if (missing.length > 0) {
+    const referrers = await Listing.find({ _id: { $in: missing } }).select(SIMILARITY_FIELDS.join(' ')).lean();
+    referrers.forEach(referrer => known.set(String(referrer._id), referrer));
+  }
+
+  const writes = [replaceNeighbors(listing._id, rankNeighbors(listing, candidates))];
+  lists.forEach(({ listingId: otherId, neighbors }) => {
+    const other = known.get(String(otherId));
+    const rest = neighbors.filter(neighbor => String(neighbor.listingId) !== id);
+    const updated = other
+      ? [...rest, { listingId: listing._id, score: similarity(listing, other) }].sort(byScore).slice(0, k)
+      : rest;
+    const unchanged = updated.length === neighbors.length &&
+      updated.every((neighbor, i) => String(neighbor.listingId) === String(neighbors[i].listingId) &&
+        neighbor.score === neighbors[i].score);
+    if (!unchanged) writes.push(replaceNeighbors(otherId, updated));
+  });
+
+  await ListingNeighbors.bulkWrite(writes, { ordered: false });
+};
+
+// Drop a deleted listing's list and recompute the lists that held it
+const removeListingNeighbors = async (listingId) => {
+  await ListingNeighbors.deleteOne({ listingId });
+  const referrers = await ListingNeighbors.find({ 'neighbors.listingId': listingId }).select('listingId').lean();
+  if (referrers.length === 0) return;
+
+  const listings = await Listing.find({ _id: { $in: referrers.map(referrer => referrer.listingId) } })
+    .select(SIMILARITY_FIELDS.join(' '))
+    .lean();
+  const writes = [];
+  for (const listing of listings) {
+    writes.push(replaceNeighbors(listing._id, await computeNeighbors(listing)));
+  }
+  await ListingNeighbors.bulkWrite(writes, { ordered: false });
+};
+
+// Whether unsaved changes to a listing document can change its neighbors
+const affectsSimilarity = listing => SOURCE_FIELDS.some(field => listing.isModified(field));
+
+// Run after the response; failures only leave lists stale until the next rebuild
+const scheduleNeighborUpdate = (listingId) => {
+  setImmediate(() => {
+    updateListingNeighbors(listingId).catch(error => {
+      console.error('Similar listings update error:', error);
+    });
+  });
+};
+
+// Same for many listings at once, such as an import, one at a time so the
+// database is not flooded
+const scheduleNeighborUpdates = (listingIds) => {
+  setImmediate(async () => {
+    for (const listingId of listingIds) {
+      await updateListingNeighbors(listingId).catch(error => {
+        console.error('Similar listings update error:', error);
+      });
+    }
+  });
+};
+
+module.exports = {
+  SIMILARITY_FIELDS,
+  neighborCount,
+  similarity,
+  computeNeighbors,
+  affectsSimilarity,
+  scheduleNeighborUpdate,
+  scheduleNeighborUpdates
+};
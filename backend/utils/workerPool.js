@@ -0,0 +1,124 @@
+const { Worker } = require('worker_threads');
+const { registerGauge } = require('./metrics');
+
+// Fixed-size pool of worker threads running one script, with a bounded queue.
+// Workers are started on demand and unref'd, so an idle pool never keeps the
+// process alive. A worker replies to each message with { result } or { error }.
+const pools = new Set();
+
+class WorkerPool {
+  constructor({ name, filename, size = 1, maxQueue = 100 }) {
+    this.name = name;
+    this.filename = filename;
+    this.size = size;
+    this.maxQueue = maxQueue;
+    this.workers = new Set();
+    this.idle = [];
+    this.queue = [];
+    this.completed = 0;
+    this.failed = 0;
+    this.rejected = 0;
+    pools.add(this);
+  }
+
+  run(message) {
+    return new Promise((resolve, reject) => {
+      const task = { message, resolve, reject };
+      const worker = this.idle.pop() || (this.workers.size < this.size ? this.spawn() : null);
+      if (worker) {
+        this.dispatch(worker, task);
+      } else if (this.queue.length >= this.maxQueue) {
+        this.rejected++;
+        const error = new Error(`${this.name} queue is full`);
+        error.code = 'QUEUE_FULL';
+        reject(error);
+      } else {
+        this.queue.push(task);
+      }
+    });
+  }
+
+  spawn() {
+    const worker = new Worker(this.filename);
+    worker.unref();
+    this.workers.add(worker);
+
+    worker.on('message', ({ result, error }) => {
+      const { task } = worker;
+      worker.task = null;
+      if (error) {
+        this.failed++;
+        task.reject(new Error(error));
+      } else {
+        this.completed++;
+        task.resolve(result);
+      }
+      this.release(worker);
+    });
+
+    // A crashed worker fails its task and is replaced on the next dispatch
+    const retire = (error) => {
+      if (!this.workers.delete(worker)) return;
+      this.idle = this.idle.filter(w => w !== worker);
+      if (worker.task) {
+        this.failed++;
+        worker.task.reject(error || new Error(`${this.name} worker exited`));
+      }
+      if (this.queue.length > 0) this.dispatch(this.spawn(), this.queue.shift());
+    };
+    worker.on('error', retire);
+    worker.on('exit', () => retire());
+    return worker;
+  }
+
+  // Start every worker ahead of the first task
+  warm() {
+    while (this.workers.size < this.size) this.idle.push(this.spawn());
+  }
+
+  dispatch(worker, task) {
+    worker.task = task;
+    worker.postMessage(task.message);
+  }
+
+  release(worker) {
+    const next = this.queue.shift();
+    if (next) {
+      this.dispatch(worker, next);
+    } else {
+      this.idle.push(worker);
+    }
+  }
+
+  async close() {
+    pools.delete(this);
+    const workers = [...this.workers];
+    this.workers.clear();
+    this.idle = [];
+    await Promise.all(workers.map(worker => worker.terminate()));
+  }
+
+  static closeAll() {
+    return Promise.all([...pools].map(pool => pool.close()));
+  }
+
+  stats() {
+    return {
+      size: this.size,
+      workers: this.workers.size,
+      busy: this.workers.size - this.idle.length,
+      queued: this.queue.length,
+      maxQueue: this.maxQueue,
+      completed: this.completed,
+      failed: this.failed,
+      rejected: this.rejected
+    };
+  }
+}
+
+const poolSeries = (stat) => () => [...pools].map(pool => ({ labels: { pool: pool.name }, value: pool.stats()[stat] }));
+registerGauge('worker_pool_busy_workers', 'Worker threads currently running a task', poolSeries('busy'));
+registerGauge('worker_pool_queue_depth', 'Tasks waiting for a free worker thread', poolSeries('queued'));
+registerGauge('worker_pool_rejected_total', 'Tasks rejected because the queue was full', poolSeries('rejected'), 'counter');
+
+module.exports = WorkerPool;
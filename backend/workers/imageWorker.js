@@ -0,0 +1,33 @@
+const { parentPort } = require('worker_threads');
+const path = require('path');
+const sharp = require('sharp');
+
+// Resized copies of uploaded listing images for utils/images.js. Parallelism
+// comes from the pool size, so each job uses a single libvips thread, and
+// nothing is cached between jobs.
+sharp.concurrency(1);
+sharp.cache(false);
+
+const QUALITY = { webp: 75, jpeg: 80 };
+const EXTENSIONS = { webp: 'webp', jpeg: 'jpg' };
+
+parentPort.on('message', async ({ input, outputDir, name, widths, formats }) => {
+  try {
+    // Apply EXIF orientation once, then stream each variant from the same input
+    const image = sharp(input, { failOn: 'error' }).rotate();
+    const variants = [];
+    for (const width of widths) {
+      for (const format of formats) {
+        const file = `${name}-${width}.${EXTENSIONS[format]}`;
+        const info = await image.clone()
+          .resize({ width, withoutEnlargement: true })
+          .toFormat(format, { quality: QUALITY[format] })
+          .toFile(path.join(outputDir, file));
+        variants.push({ width: info.width, format, file, bytes: info.size });
+      }
+    }
+    parentPort.postMessage({ result: variants });
+  } catch (error) {
+    parentPort.postMessage({ error: error.message });
+  }
+});
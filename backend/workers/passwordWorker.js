@@ -0,0 +1,14 @@
+const { parentPort } = require('worker_threads');
+const bcrypt = require('bcryptjs');
+
+// bcrypt rounds for utils/passwords.js, off the main event loop
+parentPort.on('message', ({ op, password, hash, cost }) => {
+  try {
+    const result = op === 'hash'
+      ? bcrypt.hashSync(password, cost)
+      : bcrypt.compareSync(password, hash);
+    parentPort.postMessage({ result });
+  } catch (error) {
+    parentPort.postMessage({ error: error.message });
+  }
+});
@@ -8,21 +8,22 @@ import requests
 import json
 import sys
 import os
+import re
+import math
+import time
+import zlib
+import struct
+import asyncio
+import argparse
+import functools
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
-# Get backend URL from frontend .env file
-def get_backend_url():
-    try:
-        with open('/app/frontend/.env', 'r') as f:
-            for line in f:
-                if line.startswith('REACT_APP_BACKEND_URL='):
-                    return line.split('=', 1)[1].strip()
-    except:
-        pass
-    return 'http://localhost:8001'
+from api_client import ApiClient, UserNamespace, BASE_URL, API_URL
 
-BASE_URL = get_backend_url()
-API_URL = f"{BASE_URL}/api"
+# Pooled keep-alive client for the functional tests, and this run's unique users
+CLIENT = ApiClient()
+NAMESPACE = UserNamespace()
 
 class Colors:
     GREEN = '\033[92m'
@@ -40,17 +41,8 @@ def log(message, color=None):
 
 def test_api_endpoint(method, endpoint, data=None, headers=None, expected_status=200):
     """Test API endpoint and return response"""
-    url = f"{API_URL}{endpoint}"
-    
     try:
-        if method.upper() == 'GET':
-            response = requests.get(url, headers=headers, timeout=10)
-        elif method.upper() == 'POST':
-            response = requests.post(url, json=data, headers=headers, timeout=10)
-        elif method.upper() == 'PUT':
-            response = requests.put(url, json=data, headers=headers, timeout=10)
-        elif method.upper() == 'DELETE':
-            response = requests.delete(url, headers=headers, timeout=10)
+        response = CLIENT.request(method, endpoint, data, headers)
         
         log(f"  {method} {endpoint} -> {response.status_code}", 
             Colors.GREEN if response.status_code == expected_status else Colors.RED)
@@ -65,6 +57,32 @@ def test_api_endpoint(method, endpoint, data=None, headers=None, expected_status
         log(f"  ERROR: {method} {endpoint} -> {str(e)}", Colors.RED)
         return None
 
+def tiny_png(width=64, height=48):
+    """A solid-colour RGB PNG for the upload tests"""
+    def chunk(kind, payload):
+        return struct.pack(">I", len(payload)) + kind + payload + struct.pack(">I", zlib.crc32(kind + payload))
+    rows = b"".join(b"\x00" + b"\x1f\x6f\xb4" * width for _ in range(height))
+    return (b"\x89PNG\r\n\x1a\n"
+            + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(rows))
+            + chunk(b"IEND", b""))
+
+# Listing payload shared by the functional tests and the load scenario
+SAMPLE_LISTING = {
+    "title": "Beautiful Downtown Apartment with City Views",
+    "type": "house",
+    "price": 2000,
+    "squareFeet": 1500,
+    "addressText": "123 Main Street, Downtown City, State 12345",
+    "latitude": 40.7128,
+    "longitude": -74.0060,
+    "facilities": ["WiFi", "Parking", "Air Conditioning", "Gym"],
+    "images": ["https://picsum.photos/800/600?random=1", "https://picsum.photos/800/600?random=2"],
+    "description": "Spacious apartment in the heart of downtown with amazing city views",
+    "bedrooms": 2,
+    "bathrooms": 2
+}
+
 def main():
     log(f"\n{Colors.BOLD}🧪 RENTAL MARKETPLACE BACKEND API TESTING{Colors.ENDC}")
     log(f"Backend URL: {BASE_URL}")
@@ -73,13 +91,13 @@ def main():
     # Test data
     owner_user = {
         "name": "Sarah Johnson",
-        "email": "sarah.owner@rentease.com",
+        "email": NAMESPACE.email("sarah.owner"),
         "password": "securepass123"
     }
     
     customer_user = {
         "name": "Mike Chen",
-        "email": "mike.customer@rentease.com", 
+        "email": NAMESPACE.email("mike.customer"),
         "password": "securepass456"
     }
     
@@ -263,20 +281,7 @@ def main():
     
     # Create Listing (Owner)
     log("  Creating Listing (Owner)...")
-    listing_data = {
-        "title": "Beautiful Downtown Apartment with City Views",
-        "type": "house",
-        "price": 2000,
-        "squareFeet": 1500,
-        "addressText": "123 Main Street, Downtown City, State 12345",
-        "latitude": 40.7128,
-        "longitude": -74.0060,
-        "facilities": ["WiFi", "Parking", "Air Conditioning", "Gym"],
-        "images": ["https://picsum.photos/800/600?random=1", "https://picsum.photos/800/600?random=2"],
-        "description": "Spacious apartment in the heart of downtown with amazing city views",
-        "bedrooms": 2,
-        "bathrooms": 2
-    }
+    listing_data = dict(SAMPLE_LISTING)
     response = test_api_endpoint('POST', '/listings', listing_data, headers=owner_headers, expected_status=201)
     if response and response.status_code == 201:
         data = response.json()
@@ -311,6 +316,20 @@ def main():
     else:
         check_test(False, "Listings retrieval")
     
+    # Facet counts for the filter panel
+    log("  Getting listing facets...")
+    response = test_api_endpoint('GET', '/listings/facets?type=house')
+    if response and response.status_code == 200:
+        data = response.json()
+        facets = data.get('facets', {})
+        check_test(data.get('success') == True, "Listing facets success")
+        check_test(data.get('total', 0) > 0, "Facet total counts the filtered listings")
+        check_test(any(f.get('value') == 'house' for f in facets.get('types', [])), "Type facet counts houses")
+        check_test(sum(b.get('count', 0) for b in facets.get('price', [])) == data.get('total'),
+                   "Price buckets add up to the total")
+    else:
+        check_test(False, "Listing facets")
+    
     # Get Single Listing
     if listing_id:
         log("  Getting single listing...")
@@ -322,7 +341,79 @@ def main():
             check_test('ownerId' in data.get('listing', {}), "Owner details populated")
         else:
             check_test(False, "Single listing retrieval")
-    
+
+        # Conditional GET against the listing response cache
+        log("  Revalidating single listing with its ETag...")
+        etag = response.headers.get('ETag') if response else None
+        check_test(bool(etag), "Listing response carries an ETag")
+        if etag:
+            response = test_api_endpoint('GET', f'/listings/{listing_id}',
+                                         headers={'If-None-Match': etag}, expected_status=304)
+            check_test(response is not None and response.status_code == 304, "Unchanged listing returns 304")
+
+            test_api_endpoint('PUT', f'/listings/{listing_id}', {"price": 2100}, headers=owner_headers)
+            response = test_api_endpoint('GET', f'/listings/{listing_id}', headers={'If-None-Match': etag})
+            check_test(response is not None and response.status_code == 200 and
+                       response.json().get('listing', {}).get('price') == 2100,
+                       "Updated listing invalidates the cached response")
+
+        # Precomputed similar listings (neighbor lists are updated after the response)
+        log("  Getting similar listings...")
+        response = test_api_endpoint('GET', f'/listings/{listing_id}/similar?limit=3')
+        if response and response.status_code == 200:
+            data = response.json()
+            similar = data.get('listings', [])
+            check_test(data.get('success') == True, "Similar listings success")
+            check_test(len(similar) <= 3, "Similar listings respect the limit")
+            check_test(all(item.get('_id') != listing_id for item in similar), "Listing is not similar to itself")
+            scores = [item.get('similarity', 0) for item in similar]
+            check_test(scores == sorted(scores, reverse=True), "Similar listings ordered by score")
+        else:
+            check_test(False, "Similar listings")
+
+        # Streamed upload, resized in the background by the image worker pool
+        log("  Uploading a listing image...")
+        try:
+            response = CLIENT.session.post(f"{API_URL}/listings/{listing_id}/images",
+                                           files=[('images', ('photo.png', tiny_png(), 'image/png'))],
+                                           headers=owner_headers, timeout=10)
+        except requests.RequestException as e:
+            log(f"  ERROR: POST /listings/{listing_id}/images -> {e}", Colors.RED)
+            response = None
+        if response is not None and response.status_code == 202:
+            uploaded = response.json().get('images', [])
+            check_test(len(uploaded) == 1 and uploaded[0].startswith('/uploads/'), "Upload returns the stored image path")
+            original = CLIENT.session.get(f"{BASE_URL}{uploaded[0]}", timeout=10) if uploaded else None
+            check_test(original is not None and original.status_code == 200, "Uploaded image is served")
+
+            variants = []
+            for _ in range(20):
+                listing = test_api_endpoint('GET', f'/listings/{listing_id}').json().get('listing', {})
+                variants = [v for entry in listing.get('imageVariants', []) if entry.get('src') in uploaded
+                            for v in entry.get('variants', [])]
+                if variants:
+                    break
+                time.sleep(0.25)
+            check_test({v.get('format') for v in variants} == {'webp', 'jpeg'}, "WebP and JPEG variants generated")
+        else:
+            check_test(False, "Listing image upload")
+
+        response = CLIENT.session.post(f"{API_URL}/listings/{listing_id}/images",
+                                       files=[('images', ('notes.txt', b'not an image', 'text/plain'))],
+                                       headers=owner_headers, timeout=10)
+        check_test(response.status_code == 400, "Non-image upload rejected")
+
+        # Clearing the coordinates takes the listing out of nearby search
+        log("  Clearing listing coordinates...")
+        near = f"/listings?near={listing_data['latitude']},{listing_data['longitude']}&radiusKm=1&ownerId={owner_id}"
+        nearby = lambda: [item.get('_id') for item in test_api_endpoint('GET', near).json().get('listings', [])]
+        check_test(listing_id in nearby(), "Listing found near its coordinates")
+        test_api_endpoint('PUT', f'/listings/{listing_id}', {"latitude": None, "longitude": None}, headers=owner_headers)
+        check_test(listing_id not in nearby(), "Listing without coordinates left out of nearby search")
+        test_api_endpoint('PUT', f'/listings/{listing_id}',
+                          {"latitude": listing_data['latitude'], "longitude": listing_data['longitude']},
+                          headers=owner_headers)
+
     # Get Listings by Owner
     if owner_id:
         log("  Getting listings by owner...")
@@ -340,6 +431,69 @@ def main():
     invalid_listing['type'] = 'invalid_type'
     response = test_api_endpoint('POST', '/listings', invalid_listing, headers=owner_headers, expected_status=400)
     check_test(response and response.status_code == 400, "Invalid listing type rejected")
+
+    # Bulk import with one bad row, then export the portfolio back
+    log("  Bulk importing listings (NDJSON)...")
+    rows = [
+        dict(SAMPLE_LISTING, title="Bulk Import Cottage"),
+        dict(SAMPLE_LISTING, title="Bulk Import Broken", type="castle"),
+        dict(SAMPLE_LISTING, title="Bulk Import Studio", type="studio"),
+    ]
+    body = "".join(json.dumps(row) + "\n" for row in rows)
+    response = CLIENT.session.post(f"{API_URL}/owner/listings/import", data=body.encode(),
+                                   headers={**owner_headers, 'Content-Type': 'application/x-ndjson'}, timeout=30)
+    if response.status_code == 200:
+        data = response.json()
+        check_test(data.get('inserted') == 2 and data.get('failed') == 1, "Valid rows imported, invalid row rejected")
+        check_test([e.get('row') for e in data.get('errors', [])] == [2], "Rejected row reported by number")
+    else:
+        check_test(False, "Bulk listing import")
+
+    log("  Exporting listings (CSV)...")
+    response = CLIENT.session.get(f"{API_URL}/owner/listings/export", params={'format': 'csv'},
+                                  headers=owner_headers, timeout=30)
+    check_test(response.status_code == 200 and response.headers.get('Content-Type', '').startswith('text/csv'),
+               "CSV export returned")
+    if response.status_code == 200:
+        check_test(response.text.startswith('_id,title,') and 'Bulk Import Studio' in response.text
+                   and 'Bulk Import Broken' not in response.text, "Export contains the imported listings")
+
+    # Booked ranges hide a listing from searches for overlapping stays
+    if listing_id and owner_id:
+        log("  Booking dates and searching by availability...")
+        stay = {"start": "2031-07-01", "end": "2031-07-15", "kind": "booked"}
+        response = test_api_endpoint('POST', f'/listings/{listing_id}/availability', stay,
+                                     headers=owner_headers, expected_status=201)
+        range_id = response.json().get('range', {}).get('id') if response and response.status_code == 201 else None
+        check_test(bool(range_id), "Booked range stored")
+        response = test_api_endpoint('POST', f'/listings/{listing_id}/availability',
+                                     dict(stay, start="2031-07-10", end="2031-07-20"),
+                                     headers=owner_headers, expected_status=409)
+        check_test(response is not None and response.status_code == 409, "Overlapping booking rejected")
+
+        def listed(start, end):
+            response = test_api_endpoint('GET', f'/listings?ownerId={owner_id}&from={start}&to={end}&limit=100')
+            return response is not None and any(l.get('_id') == listing_id for l in response.json().get('listings', []))
+
+        check_test(not listed("2031-07-14", "2031-07-20"), "Listing hidden for an overlapping stay")
+        check_test(listed("2031-07-15", "2031-07-20"), "Listing shown for a stay starting at checkout")
+        if range_id:
+            test_api_endpoint('DELETE', f'/listings/{listing_id}/availability/{range_id}', headers=owner_headers)
+            check_test(listed("2031-07-01", "2031-07-05"), "Listing shown again once the range is removed")
+
+        # The same dates booked from several clients at once: one booking wins
+        rush = dict(stay, start="2031-09-01", end="2031-09-08")
+        with ThreadPoolExecutor(max_workers=6) as pool:
+            responses = list(pool.map(lambda _: CLIENT.request('POST', f'/listings/{listing_id}/availability',
+                                                                rush, owner_headers), range(6)))
+        statuses = sorted(r.status_code for r in responses)
+        check_test(statuses == [201] + [409] * 5, f"Concurrent overlapping bookings: one stored ({statuses})")
+        for r in responses:
+            if r.status_code == 201:
+                test_api_endpoint('DELETE', f"/listings/{listing_id}/availability/{r.json()['range']['id']}",
+                                  headers=owner_headers)
+        response = test_api_endpoint('GET', '/listings?from=2031-07-05', expected_status=400)
+        check_test(response is not None and response.status_code == 400, "from without to rejected")
     
     # 6. REVIEWS TESTING
     log(f"\n{Colors.BLUE}6. ⭐ REVIEWS TESTING{Colors.ENDC}")
@@ -382,6 +536,17 @@ def main():
             check_test('averageRating' in data, "Average rating calculated")
         else:
             check_test(False, "Reviews retrieval")
+
+        # Owner dashboard counters, kept up to date by the listing and review routes
+        log("  Getting owner dashboard stats...")
+        response = test_api_endpoint('GET', '/owner/stats', headers=owner_headers)
+        if response and response.status_code == 200:
+            stats = response.json().get('stats', {})
+            check_test(stats.get('listings', {}).get('total', 0) >= 1, "Owner listings counted")
+            check_test(stats.get('reviews', {}).get('count', 0) >= 1, "Owner reviews counted")
+            check_test(stats.get('reviews', {}).get('averageRating', 0) > 0, "Owner average rating calculated")
+        else:
+            check_test(False, "Owner stats retrieval")
     
     # Test invalid rating
     log("  Testing invalid rating...")
@@ -414,6 +579,8 @@ def main():
     log("  Testing role-based access control...")
     response = test_api_endpoint('POST', '/owner/profile', profile_data, headers=customer_headers, expected_status=403)
     check_test(response and response.status_code == 403, "Customer blocked from owner endpoints")
+    response = test_api_endpoint('GET', '/owner/stats', headers=customer_headers, expected_status=403)
+    check_test(response and response.status_code == 403, "Customer blocked from owner stats")
     
     # 8. EDGE CASES & VALIDATION
     log(f"\n{Colors.BLUE}8. 🧪 EDGE CASES & VALIDATION{Colors.ENDC}")
@@ -457,6 +624,271 @@ def main():
     
     return tests_failed == 0
 
+# =============================================================================
+# LOAD MODE
+# Runs the register -> select-role -> create listing -> list/search -> review
+# scenario for many virtual users at once and reports per-route latency.
+# =============================================================================
+
+# Upper bounds (ms) of the latency histogram buckets in the JSON report
+LATENCY_BUCKETS_MS = [5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+
+DEFAULT_REPORT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'test_reports', 'load_report.json')
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = math.ceil(pct / 100.0 * len(sorted_values)) - 1
+    return sorted_values[max(0, min(rank, len(sorted_values) - 1))]
+
+class RouteStats:
+    """Latency samples and outcome counters for a single route"""
+
+    def __init__(self):
+        self.latencies_ms = []
+        self.errors = 0
+        self.status_codes = {}
+
+    def record(self, latency_ms, status, ok):
+        self.latencies_ms.append(latency_ms)
+        key = str(status) if status is not None else 'network_error'
+        self.status_codes[key] = self.status_codes.get(key, 0) + 1
+        if not ok:
+            self.errors += 1
+
+    def summary(self, elapsed_seconds):
+        values = sorted(self.latencies_ms)
+        count = len(values)
+        histogram = {}
+        for bound in LATENCY_BUCKETS_MS:
+            histogram[f"le_{bound}"] = sum(1 for v in values if v <= bound)
+        histogram["le_inf"] = count
+        return {
+            "count": count,
+            "errors": self.errors,
+            "error_rate": round(self.errors / count, 4) if count else 0.0,
+            "throughput_rps": round(count / elapsed_seconds, 2) if elapsed_seconds > 0 else 0.0,
+            "latency_ms": {
+                "min": round(values[0], 2) if values else 0.0,
+                "mean": round(sum(values) / count, 2) if count else 0.0,
+                "p50": round(percentile(values, 50), 2),
+                "p95": round(percentile(values, 95), 2),
+                "p99": round(percentile(values, 99), 2),
+                "max": round(values[-1], 2) if values else 0.0
+            },
+            "histogram_ms": histogram,
+            "status_codes": self.status_codes
+        }
+
+class LoadGenerator:
+    """Drives N virtual users through the backend scenario at a target request rate"""
+
+    def __init__(self, users, rate, duration, timeout=10, api_url=API_URL):
+        self.api_url = api_url
+        self.users = users
+        self.rate = rate
+        self.duration = duration
+        self.timeout = timeout
+        self.namespace = UserNamespace()
+        self.run_id = self.namespace.run_id
+        self.stats = {}
+        self.executor = ThreadPoolExecutor(max_workers=users)
+        self._interval = 1.0 / rate if rate > 0 else 0
+        self._next_slot = None
+
+    async def _pace(self):
+        """Wait for the next request slot so the whole run stays at the target rate"""
+        if not self._interval:
+            return
+        now = asyncio.get_running_loop().time()
+        if self._next_slot is None or self._next_slot < now:
+            self._next_slot = now
+        delay = self._next_slot - now
+        self._next_slot += self._interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def request(self, session, route, method, endpoint, data=None, headers=None, expected_status=200):
+        """Issue one request and record its latency under the given route name"""
+        await self._pace()
+        loop = asyncio.get_running_loop()
+        call = functools.partial(
+            session.request, method, f"{self.api_url}{endpoint}",
+            json=data, headers=headers, timeout=self.timeout
+        )
+        start = time.perf_counter()
+        try:
+            response = await loop.run_in_executor(self.executor, call)
+            status = response.status_code
+        except requests.RequestException:
+            response = None
+            status = None
+        latency_ms = (time.perf_counter() - start) * 1000
+        ok = status == expected_status
+        self.stats.setdefault(route, RouteStats()).record(latency_ms, status, ok)
+        return response if ok else None
+
+    async def _register(self, session, kind, index, role):
+        """Register a uniquely named user and select its role, returning the token"""
+        user = {
+            "name": f"Load {kind.title()} {index}",
+            "email": self.namespace.email(f"load.{kind}", index),
+            "password": "loadtest123"
+        }
+        response = await self.request(session, 'POST /auth/register', 'POST', '/auth/register', user, expected_status=201)
+        if not response:
+            return None
+        token = response.json().get('token')
+        headers = {"Authorization": f"Bearer {token}"}
+        response = await self.request(session, 'POST /user/select-role', 'POST', '/user/select-role', {"role": role}, headers)
+        return headers if response else None
+
+    async def virtual_user(self, index, deadline):
+        loop = asyncio.get_running_loop()
+        session = requests.Session()
+        try:
+            owner_headers = await self._register(session, 'owner', index, 'OWNER')
+            customer_headers = await self._register(session, 'customer', index, 'CUSTOMER')
+            if not owner_headers or not customer_headers:
+                return
+
+            listing_data = dict(SAMPLE_LISTING, title=f"{SAMPLE_LISTING['title']} #{self.run_id}-{index}")
+            response = await self.request(session, 'POST /listings', 'POST', '/listings', listing_data, owner_headers, expected_status=201)
+            listing_id = response.json().get('listing', {}).get('_id') if response else None
+            reviewed = False
+
+            while loop.time() < deadline:
+                await self.request(session, 'GET /listings', 'GET', '/listings')
+                await self.request(session, 'GET /listings?search', 'GET', '/listings?search=Downtown')
+                if listing_id:
+                    await self.request(session, 'GET /listings/:id', 'GET', f'/listings/{listing_id}')
+                    if not reviewed:
+                        review_data = {"listingId": listing_id, "rating": 5, "comment": "Load test review"}
+                        await self.request(session, 'POST /reviews', 'POST', '/reviews', review_data, customer_headers, expected_status=201)
+                        reviewed = True
+                    await self.request(session, 'GET /reviews/listing/:listingId', 'GET', f'/reviews/listing/{listing_id}')
+        finally:
+            session.close()
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        started_at = datetime.utcnow().isoformat() + 'Z'
+        start = loop.time()
+        deadline = start + self.duration
+        await asyncio.gather(*(self.virtual_user(i, deadline) for i in range(self.users)))
+        elapsed = loop.time() - start
+        self.executor.shutdown(wait=True)
+        return self.report(started_at, elapsed)
+
+    def report(self, started_at, elapsed):
+        overall = RouteStats()
+        for stats in self.stats.values():
+            overall.latencies_ms.extend(stats.latencies_ms)
+            overall.errors += stats.errors
+            for code, count in stats.status_codes.items():
+                overall.status_codes[code] = overall.status_codes.get(code, 0) + count
+        return {
+            "api_url": self.api_url,
+            "run_id": self.run_id,
+            "started_at": started_at,
+            "config": {
+                "users": self.users,
+                "target_rps": self.rate,
+                "duration_seconds": self.duration,
+                "timeout_seconds": self.timeout
+            },
+            "elapsed_seconds": round(elapsed, 3),
+            "overall": overall.summary(elapsed),
+            "routes": {route: stats.summary(elapsed) for route, stats in sorted(self.stats.items())}
+        }
+
+METRIC_LINE = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*)(?:\{(.*)\})?\s+(\S+)$')
+METRIC_LABEL = re.compile(r'(\w+)="((?:[^"\\]|\\.)*)"')
+
+def scrape_metrics(api_url=API_URL, timeout=5):
+    """Fetch /api/metrics as {(name, frozenset(labels)): value}, empty if unavailable"""
+    try:
+        response = requests.get(f"{api_url}/metrics", timeout=timeout)
+        response.raise_for_status()
+    except requests.RequestException:
+        return {}
+    samples = {}
+    for line in response.text.splitlines():
+        match = METRIC_LINE.match(line)
+        if not match:
+            continue
+        name, labels, value = match.groups()
+        key = (name, frozenset(METRIC_LABEL.findall(labels or '')))
+        samples[key] = float(value)
+    return samples
+
+def server_breakdown(before, after):
+    """Per-route server-side time split between two scrapes, in ms per request"""
+    def delta(name, **labels):
+        total = 0.0
+        for (metric, metric_labels), value in after.items():
+            if metric == name and all((k, v) in metric_labels for k, v in labels.items()):
+                total += value - before.get((metric, metric_labels), 0.0)
+        return total
+
+    routes = sorted({dict(labels)['route'] for name, labels in after if name == 'http_request_duration_seconds_count'})
+    breakdown = {}
+    for route in routes:
+        count = delta('http_request_duration_seconds_count', route=route)
+        if count <= 0:
+            continue
+        per_request = lambda seconds: round(seconds * 1000 / count, 3)
+        breakdown[route] = {
+            "requests": int(count),
+            "total_ms": per_request(delta('http_request_duration_seconds_sum', route=route)),
+            "db_ms": per_request(delta('http_request_phase_seconds_total', route=route, phase='db')),
+            "auth_ms": per_request(delta('http_request_phase_seconds_total', route=route, phase='auth')),
+            "serialize_ms": per_request(delta('http_request_phase_seconds_total', route=route, phase='serialize')),
+            "db_queries": round(delta('http_request_db_queries_total', route=route) / count, 2),
+            "db_documents": round(delta('http_request_db_documents_total', route=route) / count, 2)
+        }
+    return breakdown
+
+def run_load(users, rate, duration, output=DEFAULT_REPORT_PATH, timeout=10):
+    """Run the load scenario and write the JSON report, returning it"""
+    log(f"\n{Colors.BOLD}🚦 RENTAL MARKETPLACE LOAD TEST{Colors.ENDC}")
+    log(f"API Base: {API_URL}")
+    log(f"Users: {users}, target rate: {rate or 'unbounded'} req/s, duration: {duration}s")
+
+    before = scrape_metrics()
+    report = asyncio.run(LoadGenerator(users, rate, duration, timeout).run())
+    report["server"] = server_breakdown(before, scrape_metrics())
+
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    for route, summary in report["routes"].items():
+        latency = summary["latency_ms"]
+        log(f"  {route:<36} n={summary['count']:<6} p50={latency['p50']:>8.1f}ms "
+            f"p95={latency['p95']:>8.1f}ms p99={latency['p99']:>8.1f}ms err={summary['error_rate']:.2%}",
+            Colors.GREEN if summary["errors"] == 0 else Colors.YELLOW)
+    for route, split in report["server"].items():
+        log(f"  server {route:<29} total={split['total_ms']:>7.1f}ms db={split['db_ms']:>7.1f}ms "
+            f"({split['db_queries']} queries) auth={split['auth_ms']:>6.1f}ms serialize={split['serialize_ms']:>6.1f}ms")
+    log(f"Report written to {output}")
+    return report
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Rental Marketplace backend API tests")
+    parser.add_argument('--load', action='store_true', help="run the concurrent load scenario instead of the functional tests")
+    parser.add_argument('--users', type=int, default=10, help="number of virtual users (load mode)")
+    parser.add_argument('--rate', type=float, default=50, help="target requests per second across all users, 0 for unbounded (load mode)")
+    parser.add_argument('--duration', type=float, default=30, help="seconds each virtual user keeps browsing (load mode)")
+    parser.add_argument('--timeout', type=float, default=10, help="per-request timeout in seconds (load mode)")
+    parser.add_argument('--output', default=DEFAULT_REPORT_PATH, help="where to write the JSON report (load mode)")
+    return parser.parse_args(argv)
+
 if __name__ == "__main__":
+    args = parse_args()
+    if args.load:
+        report = run_load(args.users, args.rate, args.duration, args.output, args.timeout)
+        sys.exit(0 if report["overall"]["count"] > 0 else 1)
     success = main()
     sys.exit(0 if success else 1)
\ No newline at end of file
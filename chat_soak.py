@@ -0,0 +1,452 @@
+#!/usr/bin/env python3
+"""
+Chat Soak Test for Rental Marketplace
+Holds thousands of authenticated Socket.IO clients across many conversations
+for a long run, driving joinConversation, sendMessage, typing and markAsRead
+at configurable rates. Reports sender-to-receiver receiveMessage latency,
+lost messages, reconnects, and the server's memory, sockets and rooms over
+time, so chat capacity per node can be sized and room leaks caught.
+
+    python chat_soak.py --conversations 1000 --duration 1800 --message-rate 0.2 --churn 0.05
+
+Each conversation has a customer and an owner, one socket each. Messages
+alternate between them as a Poisson process; the receiver marks the
+conversation read on delivery, like ChatModal does. With --churn, clients
+drop their connection and come back, rejoining their room on connect.
+
+Point it at a single backend process (server.js): /api/metrics is per
+process. Thousands of sockets need a matching open file limit (ulimit -n)
+on both sides. Created users and conversations can be kept with
+--pairs-file and reused by later runs.
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+import socketio
+
+from api_client import ApiClient, UserNamespace, API_URL
+from backend_test import Colors, log, percentile, scrape_metrics, SAMPLE_LISTING
+
+DEFAULT_REPORT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'test_reports', 'chat_soak.json')
+SOAK_PASSWORD = 'soaktest123'
+# How long a message may take before it counts as lost
+DELIVERY_TIMEOUT = 10.0
+
+def register(client, namespace, kind, index, role):
+    user = namespace.user(f"soak.{kind}", f"Soak {kind.title()} {index}", SOAK_PASSWORD, index)
+    response = client.request('POST', '/auth/register', user)
+    if response.status_code != 201:
+        raise RuntimeError(f"register failed: {response.status_code} {response.text[:200]}")
+    body = response.json()
+    headers = {'Authorization': f"Bearer {body['token']}"}
+    client.request('POST', '/user/select-role', {'role': role}, headers)
+    return body['token'], headers
+
+def create_conversation(client, namespace, index):
+    """A customer, an owner with one listing, and their conversation"""
+    owner_token, owner_headers = register(client, namespace, 'owner', index, 'OWNER')
+    customer_token, customer_headers = register(client, namespace, 'customer', index, 'CUSTOMER')
+
+    listing_data = dict(SAMPLE_LISTING, title=f"{SAMPLE_LISTING['title']} chat #{namespace.run_id}-{index}")
+    response = client.request('POST', '/listings', listing_data, owner_headers)
+    if response.status_code != 201:
+        raise RuntimeError(f"listing failed: {response.status_code} {response.text[:200]}")
+    listing = response.json()['listing']
+    owner_id = listing['ownerId']['_id'] if isinstance(listing['ownerId'], dict) else listing['ownerId']
+
+    response = client.request('POST', '/conversations', {'listingId': listing['_id'], 'ownerId': owner_id},
+                              customer_headers)
+    if response.status_code != 200:
+        raise RuntimeError(f"conversation failed: {response.status_code} {response.text[:200]}")
+    return {
+        'conversationId': response.json()['conversation']['_id'],
+        'customerToken': customer_token,
+        'ownerToken': owner_token,
+        'ownerId': owner_id,
+    }
+
+def create_conversations(client, count, workers=16):
+    """count conversations created in parallel over REST"""
+    namespace = UserNamespace()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(lambda index: create_conversation(client, namespace, index), range(count)))
+
+def load_conversations(client, count, pairs_file=None, workers=16):
+    """Reuse conversations saved by an earlier run, creating the missing ones"""
+    pairs = []
+    if pairs_file and os.path.exists(pairs_file):
+        with open(pairs_file) as f:
+            pairs = json.load(f)[:count]
+    if len(pairs) < count:
+        log(f"Creating {count - len(pairs)} conversations...")
+        pairs.extend(create_conversations(client, count - len(pairs), workers))
+        if pairs_file:
+            with open(pairs_file, 'w') as f:
+                json.dump(pairs, f)
+    return pairs
+
+def server_sample(api_url):
+    """Memory, sockets and rooms of the backend process right now"""
+    samples = scrape_metrics(api_url)
+    value = lambda name, **labels: next((v for (metric, metric_labels), v in samples.items()
+                                        if metric == name and all((k, str(l)) in metric_labels
+                                                                  for k, l in labels.items())), None)
+    return {
+        'rss_bytes': value('process_resident_memory_bytes'),
+        'heap_used_bytes': value('nodejs_heap_bytes', kind='used'),
+        'clients': value('socketio_connected_clients'),
+        'rooms': value('socketio_rooms'),
+    }
+
+def growth_per_hour(points):
+    """Least-squares slope of [(seconds, value)] scaled to one hour"""
+    points = [(t, v) for t, v in points if v is not None]
+    if len(points) < 2:
+        return None
+    mean_t = sum(t for t, _ in points) / len(points)
+    mean_v = sum(v for _, v in points) / len(points)
+    spread = sum((t - mean_t) ** 2 for t, _ in points)
+    if not spread:
+        return None
+    return sum((t - mean_t) * (v - mean_v) for t, v in points) / spread * 3600
+
+class SoakClient:
+    """One user's socket in one conversation, rejoining its room on every connect"""
+
+    def __init__(self, harness, conversation_id, token, role):
+        self.harness = harness
+        self.conversation_id = conversation_id
+        self.token = token
+        self.role = role
+        self.peer = None
+        self.joined = False
+        self.connects = 0
+        self.disconnected_at = None
+        self.sio = socketio.AsyncClient(reconnection=True, reconnection_delay=1, reconnection_delay_max=5)
+        self.sio.on('connect', self.on_connect)
+        self.sio.on('disconnect', self.on_disconnect)
+        self.sio.on('receiveMessage', self.on_message)
+        self.sio.on('userTyping', self.on_typing)
+        self.sio.on('messagesRead', self.on_read)
+        self.sio.on('error', self.on_error)
+
+    async def connect(self):
+        started = time.perf_counter()
+        try:
+            await self.sio.connect(self.harness.socket_url, auth={'token': self.token}, transports=['websocket'],
+                                   wait_timeout=30)
+        except socketio.exceptions.ConnectionError:
+            self.harness.count('connect_failures')
+            return False
+        self.harness.connect_ms.append((time.perf_counter() - started) * 1000)
+        return True
+
+    async def on_connect(self):
+        self.connects += 1
+        if self.disconnected_at is not None:
+            self.harness.reconnect_ms.append((time.perf_counter() - self.disconnected_at) * 1000)
+            self.harness.count('reconnects')
+            self.disconnected_at = None
+        # Not awaited here: the acknowledgement arrives after this handler returns
+        asyncio.ensure_future(self.join())
+
+    async def join(self):
+        try:
+            reply = await self.sio.call('joinConversation', self.conversation_id, timeout=10)
+        except (socketio.exceptions.TimeoutError, socketio.exceptions.BadNamespaceError):
+            reply = None
+        if reply and reply.get('success'):
+            self.joined = True
+        else:
+            self.harness.count('join_failures')
+
+    async def on_disconnect(self, *args):
+        self.joined = False
+        self.disconnected_at = time.perf_counter()
+        self.harness.count('disconnects')
+
+    async def on_message(self, message):
+        text = message.get('messageText', '')
+        sent = self.harness.in_flight.get(text)
+        if sent is None or sent['from'] is self:
+            return
+        self.harness.in_flight.pop(text, None)
+        self.harness.delivered(time.perf_counter() - sent['at'])
+        if random.random() < self.harness.read_probability:
+            await self.sio.emit('markAsRead', {'conversationId': self.conversation_id})
+            self.harness.count('reads_sent')
+
+    async def on_typing(self, data):
+        self.harness.count('typing_received')
+
+    async def on_read(self, data):
+        self.harness.count('read_receipts')
+
+    async def on_error(self, data):
+        self.harness.count('errors')
+
+class SoakHarness:
+    """All clients of one soak run, the traffic drivers and what they measured"""
+
+    def __init__(self, api_url, pairs, message_rate, typing_rate, read_probability, churn, churn_downtime):
+        self.api_url = api_url
+        self.socket_url = api_url[:-len('/api')] if api_url.endswith('/api') else api_url
+        self.pairs = pairs
+        self.message_rate = message_rate
+        self.typing_rate = typing_rate
+        self.read_probability = read_probability
+        self.churn = churn
+        self.churn_downtime = churn_downtime
+        self.clients = []
+        self.in_flight = {}
+        self.counters = {}
+        self.latencies_ms = []
+        self.window_ms = []
+        self.connect_ms = []
+        self.reconnect_ms = []
+        self.timeline = []
+        self.sequence = 0
+        self.running = True
+
+    def count(self, name, value=1):
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def delivered(self, seconds):
+        self.latencies_ms.append(seconds * 1000)
+        self.window_ms.append(seconds * 1000)
+        self.count('delivered')
+
+    async def connect_all(self, ramp):
+        """Connect every client, spread evenly over ramp seconds"""
+        for pair in self.pairs:
+            customer = SoakClient(self, pair['conversationId'], pair['customerToken'], 'CUSTOMER')
+            owner = SoakClient(self, pair['conversationId'], pair['ownerToken'], 'OWNER')
+            customer.peer, owner.peer = owner, customer
+            self.clients.extend([customer, owner])
+
+        delay = ramp / len(self.clients) if self.clients else 0
+        pending = []
+        for client in self.clients:
+            pending.append(asyncio.ensure_future(client.connect()))
+            if delay:
+                await asyncio.sleep(delay)
+        await asyncio.gather(*pending)
+
+        # Rooms are joined once the server acknowledges, shortly after connecting
+        deadline = time.perf_counter() + 10
+        while time.perf_counter() < deadline and not all(client.joined for client in self.clients
+                                                         if client.sio.connected):
+            await asyncio.sleep(0.1)
+
+    async def converse(self, customer, owner):
+        """Poisson message arrivals, alternating senders"""
+        sender, receiver = customer, owner
+        while self.running:
+            await asyncio.sleep(random.expovariate(self.message_rate))
+            if not self.running or not sender.joined:
+                continue
+            self.sequence += 1
+            text = f"soak:{sender.conversation_id}:{self.sequence}"
+            if not receiver.joined:
+                self.count('sent_while_peer_away')
+            else:
+                self.in_flight[text] = {'at': time.perf_counter(), 'from': sender}
+            try:
+                await sender.sio.emit('sendMessage', {'conversationId': sender.conversation_id, 'messageText': text})
+                self.count('sent')
+            except socketio.exceptions.BadNamespaceError:
+                self.in_flight.pop(text, None)
+            sender, receiver = receiver, sender
+
+    async def typing_loop(self, client):
+        is_typing = False
+        while self.running:
+            await asyncio.sleep(random.expovariate(self.typing_rate))
+            if self.running and client.joined:
+                is_typing = not is_typing
+                try:
+                    await client.sio.emit('typing', {'conversationId': client.conversation_id, 'isTyping': is_typing})
+                    self.count('typing_sent')
+                except socketio.exceptions.BadNamespaceError:
+                    pass
+
+    async def churn_clients(self):
+        """Each second, drop clients at the --churn rate per minute and bring them back"""
+        async def bounce(client):
+            await client.sio.disconnect()
+            await asyncio.sleep(self.churn_downtime)
+            if self.running:
+                client.disconnected_at = time.perf_counter()
+                await client.connect()
+
+        while self.running:
+            await asyncio.sleep(1)
+            for client in self.clients:
+                if client.joined and random.random() < self.churn / 60:
+                    self.count('churned')
+                    asyncio.ensure_future(bounce(client))
+
+    def expire(self):
+        now = time.perf_counter()
+        for text, sent in list(self.in_flight.items()):
+            if now - sent['at'] > DELIVERY_TIMEOUT:
+                del self.in_flight[text]
+                self.count('lost')
+
+    async def sample(self, interval, started):
+        loop = asyncio.get_running_loop()
+        while self.running:
+            await asyncio.sleep(interval)
+            self.expire()
+            window, self.window_ms = sorted(self.window_ms), []
+            point = await loop.run_in_executor(None, server_sample, self.api_url)
+            point.update({
+                't': round(time.perf_counter() - started, 1),
+                'connected': sum(1 for client in self.clients if client.joined),
+                'delivered': len(window),
+                'p95_ms': round(percentile(window, 95), 2),
+                'in_flight': len(self.in_flight),
+            })
+            self.timeline.append(point)
+            heap = point['heap_used_bytes']
+            log(f"  t={point['t']:>7.0f}s connected={point['connected']:<6} delivered={len(window):<6} "
+                f"p95={point['p95_ms']:>7.1f}ms heap={heap / 2**20 if heap else 0:>7.1f}MB "
+                f"sockets={point['clients']} rooms={point['rooms']}")
+
+    async def run(self, duration, ramp, sample_interval):
+        log(f"Connecting {len(self.pairs) * 2} clients over {ramp:.0f}s...")
+        await self.connect_all(ramp)
+        connected = sum(1 for client in self.clients if client.joined)
+        log(f"{connected} clients connected, soaking for {duration:.0f}s", Colors.BOLD)
+
+        started = time.perf_counter()
+        baseline = server_sample(self.api_url)
+        tasks = [asyncio.ensure_future(self.sample(sample_interval, started))]
+        for customer, owner in zip(self.clients[::2], self.clients[1::2]):
+            tasks.append(asyncio.ensure_future(self.converse(customer, owner)))
+            if self.typing_rate > 0:
+                tasks.extend(asyncio.ensure_future(self.typing_loop(client)) for client in (customer, owner))
+        if self.churn > 0:
+            tasks.append(asyncio.ensure_future(self.churn_clients()))
+
+        await asyncio.sleep(duration)
+        self.running = False
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        # Let the last messages arrive, then leave and check the server let go
+        await asyncio.sleep(min(DELIVERY_TIMEOUT, 3))
+        self.expire()
+        self.count('lost', len(self.in_flight))
+        await asyncio.gather(*(client.sio.disconnect() for client in self.clients), return_exceptions=True)
+        await asyncio.sleep(3)
+        after = server_sample(self.api_url)
+        return self.report(duration, baseline, after)
+
+    def report(self, duration, baseline, after):
+        latencies = sorted(self.latencies_ms)
+        connects = sorted(self.connect_ms)
+        reconnects = sorted(self.reconnect_ms)
+        sent = self.counters.get('sent', 0)
+        measured = sent - self.counters.get('sent_while_peer_away', 0)
+        warm = [point for point in self.timeline if point['t'] >= duration * 0.2]
+        return {
+            'api_url': self.api_url,
+            'config': {
+                'conversations': len(self.pairs),
+                'clients': len(self.clients),
+                'message_rate_per_conversation': self.message_rate,
+                'typing_rate_per_client': self.typing_rate,
+                'read_probability': self.read_probability,
+                'churn_per_minute': self.churn,
+                'duration_seconds': duration,
+            },
+            'counters': self.counters,
+            'messages_per_second': round(self.counters.get('delivered', 0) / duration, 2) if duration else 0.0,
+            'loss_rate': round(self.counters.get('lost', 0) / measured, 5) if measured else 0.0,
+            'latency_ms': {
+                'p50': round(percentile(latencies, 50), 2),
+                'p95': round(percentile(latencies, 95), 2),
+                'p99': round(percentile(latencies, 99), 2),
+                'max': round(latencies[-1], 2) if latencies else 0.0,
+            },
+            'connect_ms': {'p50': round(percentile(connects, 50), 2), 'p99': round(percentile(connects, 99), 2)},
+            'reconnect_ms': {'p50': round(percentile(reconnects, 50), 2), 'p99': round(percentile(reconnects, 99), 2)},
+            'server': {
+                'before': baseline,
+                'after_disconnect': after,
+                'heap_growth_bytes_per_hour': growth_per_hour([(p['t'], p['heap_used_bytes']) for p in warm]),
+                'rss_growth_bytes_per_hour': growth_per_hour([(p['t'], p['rss_bytes']) for p in warm]),
+                'peak_rss_bytes': max((p['rss_bytes'] for p in self.timeline if p['rss_bytes']), default=None),
+            },
+            'timeline': self.timeline,
+        }
+
+def run_soak(api_url=API_URL, conversations=500, duration=300, ramp=30, message_rate=0.2, typing_rate=0.5,
+             read_probability=1.0, churn=0.0, churn_downtime=2.0, sample_interval=10, pairs_file=None,
+             output=DEFAULT_REPORT_PATH):
+    """Run the soak and write the JSON report, returning it"""
+    log(f"\n{Colors.BOLD}💬 RENTAL MARKETPLACE CHAT SOAK{Colors.ENDC}")
+    log(f"API Base: {api_url}")
+
+    client = ApiClient(api_url)
+    try:
+        pairs = load_conversations(client, conversations, pairs_file)
+    finally:
+        client.close()
+
+    harness = SoakHarness(api_url, pairs, message_rate, typing_rate, read_probability, churn, churn_downtime)
+    report = asyncio.run(harness.run(duration, ramp, sample_interval))
+
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    latency, server = report['latency_ms'], report['server']
+    log(f"\nDelivered {report['counters'].get('delivered', 0)} of {report['counters'].get('sent', 0)} messages "
+        f"({report['messages_per_second']:.1f}/s), lost {report['loss_rate']:.3%}", Colors.BOLD)
+    log(f"  receiveMessage latency p50={latency['p50']:.1f}ms p95={latency['p95']:.1f}ms "
+        f"p99={latency['p99']:.1f}ms max={latency['max']:.1f}ms")
+    log(f"  connect p50={report['connect_ms']['p50']:.0f}ms, {report['counters'].get('reconnects', 0)} reconnects "
+        f"p50={report['reconnect_ms']['p50']:.0f}ms p99={report['reconnect_ms']['p99']:.0f}ms, "
+        f"{report['counters'].get('connect_failures', 0)} connect failures")
+    if server['heap_growth_bytes_per_hour'] is not None:
+        log(f"  heap growth {server['heap_growth_bytes_per_hour'] / 2**20:+.1f}MB/h, "
+            f"peak RSS {(server['peak_rss_bytes'] or 0) / 2**20:.0f}MB")
+    after = server['after_disconnect']
+    leaked = (after['clients'] or 0) - (server['before']['clients'] or 0)
+    log(f"  after disconnect: sockets={after['clients']} rooms={after['rooms']}",
+        Colors.GREEN if leaked <= 0 else Colors.RED)
+    log(f"Report written to {output}")
+    return report
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Soak the Socket.IO chat with many clients")
+    parser.add_argument('--api-url', default=API_URL)
+    parser.add_argument('--conversations', type=int, default=500, help="conversations, two clients each")
+    parser.add_argument('--duration', type=float, default=300, help="seconds of traffic after the ramp")
+    parser.add_argument('--ramp', type=float, default=30, help="seconds over which clients connect")
+    parser.add_argument('--message-rate', type=float, default=0.2, help="messages per second per conversation")
+    parser.add_argument('--typing-rate', type=float, default=0.5, help="typing events per second per client, 0 for none")
+    parser.add_argument('--read-probability', type=float, default=1.0, help="chance a delivery is marked read")
+    parser.add_argument('--churn', type=float, default=0.0, help="fraction of clients reconnecting per minute")
+    parser.add_argument('--churn-downtime', type=float, default=2.0, help="seconds a churned client stays away")
+    parser.add_argument('--sample-interval', type=float, default=10, help="seconds between server samples")
+    parser.add_argument('--pairs-file', help="save created conversations here and reuse them next time")
+    parser.add_argument('--output', default=DEFAULT_REPORT_PATH, help="where to write the JSON report")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_args()
+    report = run_soak(args.api_url, args.conversations, args.duration, args.ramp, args.message_rate,
+                      args.typing_rate, args.read_probability, args.churn, args.churn_downtime,
+                      args.sample_interval, args.pairs_file, args.output)
+    sys.exit(0 if report['counters'].get('delivered', 0) > 0 else 1)
@@ -1,10 +1,42 @@
+import { useState, useEffect } from 'react';
+import axios from 'axios';
 import { Calendar } from 'lucide-react';
 import { Card, CardHeader, CardTitle, CardContent } from '@/components/ui/card';
 import { Badge } from '@/components/ui/badge';
 
-export const AvailabilityCalendar = ({ availability }) => {
-  const isAvailableNow = availability.availableFrom === 'immediate';
-  
+const API_URL = process.env.REACT_APP_BACKEND_URL || 'http://localhost:8001';
+
+const formatDate = (date) => new Date(date).toLocaleDateString('en-US', {
+  month: 'short',
+  day: 'numeric',
+  year: 'numeric'
+});
+
+// Upcoming booked and blocked ranges of a listing (the next year)
+export const AvailabilityCalendar = ({ listingId, availableFrom }) => {
+  const [ranges, setRanges] = useState([]);
+
+  useEffect(() => {
+    fetchAvailability();
+  }, [listingId]);
+
+  const fetchAvailability = async () => {
+    try {
+      const response = await axios.get(`${API_URL}/api/listings/${listingId}/availability`);
+      if (response.data.success) {
+        setRanges(response.data.ranges);
+      }
+    } catch (error) {
+      console.error('Error fetching availability:', error);
+    }
+  };
+
+  const now = new Date();
+  const current = ranges.find(range => new Date(range.start) <= now && now < new Date(range.end));
+  const notYet = availableFrom && new Date(availableFrom) > now;
+  const isAvailableNow = !current && !notYet;
+  const nextFree = current ? current.end : availableFrom;
+
   return (
     <Card data-testid="availability-calendar">
       <CardHeader>
@@ -28,40 +60,30 @@ export const AvailabilityCalendar = ({ availability }) => {
             </Badge>
           </div>
 
-          {!isAvailableNow && (
+          {!isAvailableNow && nextFree && (
             <div className="flex items-center justify-between">
               <span className="text-sm text-gray-600">Available from:</span>
               <span className="font-semibold" style={{ color: '#1F2937' }} data-testid="available-from">
-                {new Date(availability.availableFrom).toLocaleDateString('en-US', { 
-                  month: 'short', 
-                  day: 'numeric',
-                  year: 'numeric'
-                })}
+                {formatDate(nextFree)}
               </span>
             </div>
           )}
 
-          <div className="flex items-center justify-between">
-            <span className="text-sm text-gray-600">Minimum stay:</span>
-            <span className="font-semibold" style={{ color: '#1F2937' }} data-testid="min-stay">
-              {availability.minStay}
-            </span>
-          </div>
-
-          <div className="flex items-center justify-between">
-            <span className="text-sm text-gray-600">Maximum stay:</span>
-            <span className="font-semibold" style={{ color: '#1F2937' }} data-testid="max-stay">
-              {availability.maxStay}
-            </span>
-          </div>
-
-          <div className="mt-6 p-4 bg-gray-50 rounded-lg border border-gray-200">
-            <div className="text-center space-y-2">
-              <Calendar className="h-12 w-12 mx-auto text-gray-400" />
-              <p className="text-sm text-gray-600">Interactive calendar</p>
-              <p className="text-xs text-gray-400 italic">Calendar integration placeholder</p>
+          {ranges.length > 0 && (
+            <div>
+              <span className="text-sm text-gray-600">Unavailable:</span>
+              <ul className="mt-2 space-y-1" data-testid="unavailable-ranges">
+                {ranges.map(range => (
+                  <li key={range.id} className="flex items-center justify-between text-sm">
+                    <span style={{ color: '#1F2937' }}>
+                      {formatDate(range.start)} – {formatDate(range.end)}
+                    </span>
+                    <span className="text-xs text-gray-500 capitalize">{range.kind}</span>
+                  </li>
+                ))}
+              </ul>
             </div>
-          </div>
+          )}
         </div>
       </CardContent>
     </Card>
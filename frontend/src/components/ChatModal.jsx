@@ -5,9 +5,11 @@ import { useSocket } from '../contexts/SocketContext';
 import { useAuth } from '../contexts/AuthContext';
 import axios from 'axios';
 import { format } from 'date-fns';
+import { withParticipants } from '../lib/chat';
 
 const ChatModal = ({ isOpen, onClose, conversation, ownerId, listingId }) => {
   const [messages, setMessages] = useState([]);
+  const [olderCursor, setOlderCursor] = useState(null);
   const [newMessage, setNewMessage] = useState('');
   const [loading, setLoading] = useState(false);
   const [sending, setSending] = useState(false);
@@ -89,7 +91,8 @@ const ChatModal = ({ isOpen, onClose, conversation, ownerId, listingId }) => {
         `${process.env.REACT_APP_BACKEND_URL}/api/conversations/${currentConversation._id}/messages`,
         { headers: { Authorization: `Bearer ${token}` } }
       );
-      setMessages(response.data.messages);
+      setMessages(withParticipants(response.data.messages, response.data.participants));
+      setOlderCursor(response.data.hasMore ? response.data.cursors.before : null);
       markAsRead();
     } catch (error) {
       console.error('Error loading messages:', error);
@@ -98,6 +101,20 @@ const ChatModal = ({ isOpen, onClose, conversation, ownerId, listingId }) => {
     }
   };
 
+  const loadOlderMessages = async () => {
+    if (!olderCursor || !currentConversation) return;
+    try {
+      const response = await axios.get(
+        `${process.env.REACT_APP_BACKEND_URL}/api/conversations/${currentConversation._id}/messages`,
+        { params: { before: olderCursor }, headers: { Authorization: `Bearer ${token}` } }
+      );
+      setMessages((prev) => [...withParticipants(response.data.messages, response.data.participants), ...prev]);
+      setOlderCursor(response.data.hasMore ? response.data.cursors.before : null);
+    } catch (error) {
+      console.error('Error loading older messages:', error);
+    }
+  };
+
   const markAsRead = async () => {
     if (!currentConversation) return;
     try {
@@ -190,6 +207,13 @@ const ChatModal = ({ isOpen, onClose, conversation, ownerId, listingId }) => {
 
         {/* Messages */}
         <div className="flex-1 overflow-y-auto p-4 space-y-3 bg-gray-50">
+          {olderCursor && (
+            <div className="text-center">
+              <Button variant="ghost" size="sm" onClick={loadOlderMessages}>
+                Load earlier messages
+              </Button>
+            </div>
+          )}
           {loading ? (
             <div className="flex justify-center items-center h-full">
               <Loader2 className="w-8 h-8 animate-spin text-blue-600" />
@@ -4,11 +4,15 @@ import { Label } from '@/components/ui/label';
 import { Checkbox } from '@/components/ui/checkbox';
 import { RadioGroup, RadioGroupItem } from '@/components/ui/radio-group';
 import { Slider } from '@/components/ui/slider';
+import { Input } from '@/components/ui/input';
 import { Button } from '@/components/ui/button';
 
-export const FilterPanel = ({ filters, onFilterChange, onReset }) => {
+export const FilterPanel = ({ filters, facets, onFilterChange, onReset }) => {
   const [priceRange, setPriceRange] = useState([0, 5000]);
 
+  // Server-side counts per type for the current filters, if loaded
+  const typeCounts = Object.fromEntries((facets?.types || []).map(({ value, count }) => [value, count]));
+
   const handlePriceChange = (value) => {
     setPriceRange(value);
     onFilterChange({ ...filters, minPrice: value[0], maxPrice: value[1] });
@@ -29,6 +33,10 @@ export const FilterPanel = ({ filters, onFilterChange, onReset }) => {
     onFilterChange({ ...filters, mode });
   };
 
+  const handleDateChange = (field) => (e) => {
+    onFilterChange({ ...filters, [field]: e.target.value });
+  };
+
   return (
     <Card data-testid="filter-panel">
       <CardHeader>
@@ -69,6 +77,11 @@ export const FilterPanel = ({ filters, onFilterChange, onReset }) => {
                   data-testid={`type-filter-${type}`}
                 />
                 <Label htmlFor={`type-${type}`} className="cursor-pointer capitalize">{type}</Label>
+                {facets && (
+                  <span className="ml-auto text-xs text-gray-500" data-testid={`type-count-${type}`}>
+                    {typeCounts[type] || 0}
+                  </span>
+                )}
               </div>
             ))}
           </div>
@@ -117,6 +130,29 @@ export const FilterPanel = ({ filters, onFilterChange, onReset }) => {
           />
         </div>
 
+        <div>
+          <Label className="text-sm font-semibold mb-3 block" style={{ color: '#1F2937' }}>
+            Available Between
+          </Label>
+          <div className="space-y-2">
+            <Input
+              type="date"
+              value={filters.from || ''}
+              onChange={handleDateChange('from')}
+              aria-label="Move in"
+              data-testid="available-from-filter"
+            />
+            <Input
+              type="date"
+              value={filters.to || ''}
+              min={filters.from || undefined}
+              onChange={handleDateChange('to')}
+              aria-label="Move out"
+              data-testid="available-to-filter"
+            />
+          </div>
+        </div>
+
         <Button
           variant="outline"
           className="w-full"
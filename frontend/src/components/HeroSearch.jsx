@@ -1,16 +1,46 @@
-import { useState } from 'react';
+import { useState, useEffect } from 'react';
 import { useNavigate } from 'react-router-dom';
+import axios from 'axios';
 import { Search, MapPin, Home, Building2, Mountain } from 'lucide-react';
 import { Button } from '@/components/ui/button';
 import { Input } from '@/components/ui/input';
 import { Card } from '@/components/ui/card';
 import { useAuth } from '@/contexts/AuthContext';
 
+const API_URL = process.env.REACT_APP_BACKEND_URL || 'http://localhost:8001';
+const SUGGEST_DEBOUNCE_MS = 250;
+
 export const HeroSearch = () => {
   const navigate = useNavigate();
   const { isAuthenticated } = useAuth();
   const [searchQuery, setSearchQuery] = useState('');
   const [selectedType, setSelectedType] = useState('');
+  const [suggestions, setSuggestions] = useState([]);
+
+  // Debounced typeahead against the listing prefix index
+  useEffect(() => {
+    if (searchQuery.trim().length < 2) {
+      setSuggestions([]);
+      return;
+    }
+    let cancelled = false;
+    const timer = setTimeout(async () => {
+      try {
+        const response = await axios.get(`${API_URL}/api/listings/suggest`, {
+          params: { q: searchQuery }
+        });
+        if (!cancelled && response.data.success) {
+          setSuggestions(response.data.suggestions);
+        }
+      } catch (error) {
+        console.error('Error fetching suggestions:', error);
+      }
+    }, SUGGEST_DEBOUNCE_MS);
+    return () => {
+      cancelled = true;
+      clearTimeout(timer);
+    };
+  }, [searchQuery]);
 
   const handleSearch = (e) => {
     e.preventDefault();
@@ -45,6 +75,28 @@ export const HeroSearch = () => {
                 className="pl-10 h-12"
                 data-testid="hero-search-input"
               />
+              {suggestions.length > 0 && (
+                <ul
+                  className="absolute z-10 left-0 right-0 mt-1 bg-white border border-gray-200 rounded-md shadow-lg overflow-hidden"
+                  data-testid="hero-search-suggestions"
+                >
+                  {suggestions.map((suggestion) => (
+                    <li key={suggestion._id}>
+                      <button
+                        type="button"
+                        className="w-full text-left px-4 py-2 hover:bg-gray-50"
+                        onClick={() => {
+                          setSuggestions([]);
+                          navigate(isAuthenticated ? `/listing/${suggestion._id}` : '/login');
+                        }}
+                      >
+                        <span className="block text-sm font-medium text-gray-900">{suggestion.title}</span>
+                        <span className="block text-xs text-gray-500">{suggestion.addressText}</span>
+                      </button>
+                    </li>
+                  ))}
+                </ul>
+              )}
             </div>
             <Button
               type="submit"
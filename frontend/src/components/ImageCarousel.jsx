@@ -1,8 +1,9 @@
 import { useState } from 'react';
 import { ChevronLeft, ChevronRight } from 'lucide-react';
 import { Button } from '@/components/ui/button';
+import { ListingImage } from '@/components/ListingImage';
 
-export const ImageCarousel = ({ images, title }) => {
+export const ImageCarousel = ({ images, variants, title }) => {
   const [currentIndex, setCurrentIndex] = useState(0);
 
   const goToPrevious = () => {
@@ -24,8 +25,10 @@ export const ImageCarousel = ({ images, title }) => {
   return (
     <div className="relative w-full" data-testid="image-carousel">
       <div className="relative h-96 md:h-[500px] overflow-hidden rounded-lg">
-        <img
+        <ListingImage
           src={images[currentIndex]}
+          variants={variants}
+          sizes="(min-width: 1024px) 1024px, 100vw"
           alt={`${title} - Image ${currentIndex + 1}`}
           className="w-full h-full object-cover transition-opacity duration-300"
           data-testid={`carousel-image-${currentIndex}`}
@@ -89,8 +92,10 @@ export const ImageCarousel = ({ images, title }) => {
               }`}
               data-testid={`thumbnail-${index}`}
             >
-              <img
+              <ListingImage
                 src={image}
+                variants={variants}
+                sizes="160px"
                 alt={`Thumbnail ${index + 1}`}
                 className="w-full h-full object-cover"
               />
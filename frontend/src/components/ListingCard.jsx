@@ -5,6 +5,7 @@ import { Button } from '@/components/ui/button';
 import { Card, CardContent } from '@/components/ui/card';
 import { Badge } from '@/components/ui/badge';
 import { addFavorite, removeFavorite, isFavorite } from '@/utils/localStorage';
+import { ListingImage } from '@/components/ListingImage';
 
 export const ListingCard = ({ listing }) => {
   const [favorite, setFavorite] = useState(false);
@@ -45,8 +46,10 @@ export const ListingCard = ({ listing }) => {
     <Link to={`/listing/${listing.id}`} data-testid={`listing-card-${listing.id}`}>
       <Card className="overflow-hidden hover:shadow-lg transition-shadow duration-300 h-full">
         <div className="relative">
-          <img
+          <ListingImage
             src={listing.images[0]}
+            variants={listing.imageVariants}
+            sizes="(min-width: 1024px) 33vw, (min-width: 768px) 50vw, 100vw"
             alt={listing.title}
             className="w-full h-48 object-cover"
           />
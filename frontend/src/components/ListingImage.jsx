@@ -0,0 +1,34 @@
+const API_URL = process.env.REACT_APP_BACKEND_URL || 'http://localhost:8001';
+
+// Uploaded images are stored as backend paths, external ones as full URLs
+export const resolveImageUrl = (src) => (src && src.startsWith('/') ? `${API_URL}${src}` : src);
+
+const srcSetFor = (entry, format) => entry.variants
+  .filter(variant => variant.format === format)
+  .map(variant => `${resolveImageUrl(variant.url)} ${variant.width}w`)
+  .join(', ');
+
+// One listing image, letting the browser pick the smallest resized copy that
+// fits `sizes` (WebP where supported) once the backend has generated them
+export const ListingImage = ({ src, variants = [], sizes = '100vw', alt, className, ...props }) => {
+  const entry = variants.find(item => item.src === src);
+
+  if (!entry || entry.variants.length === 0) {
+    return <img src={resolveImageUrl(src)} alt={alt} className={className} loading="lazy" {...props} />;
+  }
+
+  return (
+    <picture>
+      <source type="image/webp" srcSet={srcSetFor(entry, 'webp')} sizes={sizes} />
+      <img
+        src={resolveImageUrl(src)}
+        srcSet={srcSetFor(entry, 'jpeg')}
+        sizes={sizes}
+        alt={alt}
+        className={className}
+        loading="lazy"
+        {...props}
+      />
+    </picture>
+  );
+};
@@ -1,13 +1,29 @@
-import { mockListings } from '@/data/mockListings';
+import { useState, useEffect } from 'react';
+import axios from 'axios';
 import { ListingCard } from '@/components/ListingCard';
 
-export const SimilarListings = ({ currentListingId, type, maxItems = 3 }) => {
-  const similarListings = mockListings
-    .filter(listing => 
-      listing.id !== currentListingId && 
-      listing.type === type
-    )
-    .slice(0, maxItems);
+const API_URL = process.env.REACT_APP_BACKEND_URL || 'http://localhost:8001';
+
+export const SimilarListings = ({ currentListingId, maxItems = 3 }) => {
+  const [similarListings, setSimilarListings] = useState([]);
+
+  useEffect(() => {
+    fetchSimilarListings();
+  }, [currentListingId, maxItems]);
+
+  const fetchSimilarListings = async () => {
+    try {
+      const response = await axios.get(
+        `${API_URL}/api/listings/${currentListingId}/similar?limit=${maxItems}`
+      );
+      if (response.data.success) {
+        setSimilarListings(response.data.listings);
+      }
+    } catch (error) {
+      console.error('Error fetching similar listings:', error);
+      setSimilarListings([]);
+    }
+  };
 
   if (similarListings.length === 0) {
     return null;
@@ -20,7 +36,7 @@ export const SimilarListings = ({ currentListingId, type, maxItems = 3 }) => {
       </h2>
       <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-6">
         {similarListings.map(listing => (
-          <ListingCard key={listing.id} listing={listing} />
+          <ListingCard key={listing._id} listing={listing} />
         ))}
       </div>
     </div>
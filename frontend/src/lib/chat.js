@@ -0,0 +1,11 @@
+// Message history pages carry participants once instead of populating every
+// message. Re-attach them so messages match the populated shape that
+// 'receiveMessage' socket events and POST /api/messages return.
+export function withParticipants(messages, participants = []) {
+  const byId = new Map(participants.map((participant) => [participant._id, participant]));
+  return messages.map((message) => ({
+    ...message,
+    senderId: byId.get(message.senderId) || { _id: message.senderId },
+    receiverId: byId.get(message.receiverId) || { _id: message.receiverId }
+  }));
+}
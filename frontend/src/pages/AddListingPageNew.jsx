@@ -9,6 +9,7 @@ const AddListingPageNew = () => {
   const navigate = useNavigate();
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState('');
+  const [imageFiles, setImageFiles] = useState([]);
   const [formData, setFormData] = useState({
     title: '',
     type: 'room',
@@ -64,6 +65,17 @@ const AddListingPageNew = () => {
     setFormData(prev => ({ ...prev, images: urls }));
   };
 
+  const handleImageFiles = (e) => {
+    setImageFiles(Array.from(e.target.files));
+  };
+
+  // Sent after the listing exists; thumbnails are generated in the background
+  const uploadImages = async (listingId) => {
+    const upload = new FormData();
+    imageFiles.forEach(file => upload.append('images', file));
+    await axios.post(`${API_URL}/api/listings/${listingId}/images`, upload);
+  };
+
   const handleSubmit = async (e) => {
     e.preventDefault();
     setError('');
@@ -103,6 +115,14 @@ const AddListingPageNew = () => {
       const response = await axios.post(`${API_URL}/api/listings`, listingData);
 
       if (response.data.success) {
+        if (imageFiles.length > 0) {
+          try {
+            await uploadImages(response.data.listing._id);
+          } catch (uploadError) {
+            console.error('Error uploading images:', uploadError);
+            alert(uploadError.response?.data?.message || 'Listing created, but the images could not be uploaded');
+          }
+        }
         alert('Listing created successfully!');
         navigate('/owner/dashboard');
       }
@@ -383,6 +403,22 @@ https://example.com/image2.jpg"
                   Add image URLs (e.g., from Unsplash, Imgur, or your own hosting)
                 </p>
               </div>
+              <div className="mt-4">
+                <label htmlFor="imageFiles" className="block text-sm font-medium text-gray-700 mb-1">
+                  Or upload photos
+                </label>
+                <input
+                  id="imageFiles"
+                  type="file"
+                  accept="image/jpeg,image/png,image/webp"
+                  multiple
+                  onChange={handleImageFiles}
+                  className="w-full text-sm text-gray-700"
+                />
+                <p className="mt-1 text-sm text-gray-500">
+                  JPEG, PNG or WebP, up to 10 MB each
+                </p>
+              </div>
             </div>
 
             {/* Submit */}
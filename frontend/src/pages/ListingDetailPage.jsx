@@ -13,6 +13,8 @@ import {
 import { addFavorite, removeFavorite, isFavorite } from '@/utils/localStorage';
 import ChatButton from '@/components/ChatButton';
 import ChatModal from '@/components/ChatModal';
+import { SimilarListings } from '@/components/SimilarListings';
+import { AvailabilityCalendar } from '@/components/AvailabilityCalendar';
 
 const API_URL = process.env.REACT_APP_BACKEND_URL || 'http://localhost:8001';
 
@@ -23,6 +25,8 @@ export default function ListingDetailPage() {
   
   const [listing, setListing] = useState(null);
   const [reviews, setReviews] = useState([]);
+  const [ratingStats, setRatingStats] = useState(null);
+  const [reviewsCursor, setReviewsCursor] = useState(null);
   const [loading, setLoading] = useState(true);
   const [favorite, setFavorite] = useState(false);
   const [rating, setRating] = useState(0);
@@ -54,11 +58,15 @@ export default function ListingDetailPage() {
     }
   };
 
-  const fetchReviews = async () => {
+  const fetchReviews = async (cursor = null) => {
     try {
-      const response = await axios.get(`${API_URL}/api/reviews/listing/${params.id}`);
+      const response = await axios.get(`${API_URL}/api/reviews/listing/${params.id}`, {
+        params: cursor ? { cursor } : {}
+      });
       if (response.data.success) {
-        setReviews(response.data.reviews);
+        setReviews(prev => (cursor ? [...prev, ...response.data.reviews] : response.data.reviews));
+        setRatingStats(response.data.ratingStats);
+        setReviewsCursor(response.data.nextCursor);
       }
     } catch (error) {
       console.error('Error fetching reviews:', error);
@@ -177,7 +185,7 @@ export default function ListingDetailPage() {
 
         {/* Image Carousel */}
         <div className="mb-8">
-          <ImageCarousel images={listing.images || []} />
+          <ImageCarousel images={listing.images || []} variants={listing.imageVariants} title={listing.title} />
         </div>
 
         <div className="grid grid-cols-1 lg:grid-cols-3 gap-8">
@@ -282,14 +290,14 @@ export default function ListingDetailPage() {
                   <h2 className="text-xl font-bold text-gray-900 mb-4">Reviews & Ratings</h2>
                   
                   {/* Average Rating */}
-                  {reviews.length > 0 && (
+                  {ratingStats?.count > 0 && (
                     <div className="mb-6 p-4 bg-gray-50 rounded-lg">
                       <div className="flex items-center mb-2">
                         <Star className="h-6 w-6 text-yellow-500 fill-current" />
                         <span className="text-2xl font-bold ml-2">
-                          {reviews.reduce((acc, r) => acc + r.rating, 0) / reviews.length}
+                          {ratingStats.average.toFixed(1)}
                         </span>
-                        <span className="text-gray-600 ml-2">({reviews.length} reviews)</span>
+                        <span className="text-gray-600 ml-2">({ratingStats.count} reviews)</span>
                       </div>
                     </div>
                   )}
@@ -368,6 +376,11 @@ export default function ListingDetailPage() {
                         </div>
                       ))
                     )}
+                    {reviewsCursor && (
+                      <Button variant="outline" size="sm" onClick={() => fetchReviews(reviewsCursor)}>
+                        Show more reviews
+                      </Button>
+                    )}
                   </div>
                 </CardContent>
               </Card>
@@ -411,6 +424,8 @@ export default function ListingDetailPage() {
               </Card>
             )}
 
+            <AvailabilityCalendar listingId={listing._id} availableFrom={listing.availableFrom} />
+
             {/* Property Status */}
             <Card>
               <CardContent className="pt-6">
@@ -433,6 +448,8 @@ export default function ListingDetailPage() {
             </Card>
           </div>
         </div>
+
+        <SimilarListings currentListingId={listing._id} />
       </div>
       
       {/* Chat Modal */}
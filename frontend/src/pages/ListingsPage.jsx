@@ -8,41 +8,69 @@ import { SlidersHorizontal } from 'lucide-react';
 import { SkeletonList } from '@/components/SkeletonLoader';
 
 const API_URL = process.env.REACT_APP_BACKEND_URL || 'http://localhost:8001';
+const PAGE_SIZE = 24;
 
 export default function ListingsPage() {
   const [searchParams] = useSearchParams();
   const [showMobileFilters, setShowMobileFilters] = useState(false);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [listings, setListings] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [facets, setFacets] = useState(null);
+  const [total, setTotal] = useState(0);
   const [filters, setFilters] = useState({
     types: [],
     duration: 'all',
     mode: 'all',
     minPrice: 0,
-    maxPrice: 5000
+    maxPrice: 5000,
+    from: '',
+    to: ''
   });
 
   useEffect(() => {
     fetchListings();
   }, [searchParams, filters]);
 
+  const buildParams = () => {
+    const type = searchParams.get('type');
+    const search = searchParams.get('search');
+    const types = filters.types.length > 0 ? filters.types : (type ? [type] : []);
+
+    // Build query params
+    const params = new URLSearchParams();
+    if (types.length > 0) params.append('type', types.join(','));
+    if (search) params.append('search', search);
+    if (filters.minPrice > 0) params.append('minPrice', filters.minPrice);
+    if (filters.maxPrice < 5000) params.append('maxPrice', filters.maxPrice);
+    // Only once both dates are picked and in order
+    if (filters.from && filters.to && filters.from < filters.to) {
+      params.append('from', filters.from);
+      params.append('to', filters.to);
+    }
+    return params;
+  };
+
   const fetchListings = async () => {
     setLoading(true);
     try {
-      const type = searchParams.get('type');
-      const search = searchParams.get('search');
-      
-      // Build query params
-      const params = new URLSearchParams();
-      if (type) params.append('type', type);
-      if (search) params.append('search', search);
-      if (filters.minPrice > 0) params.append('minPrice', filters.minPrice);
-      if (filters.maxPrice < 5000) params.append('maxPrice', filters.maxPrice);
-
-      const response = await axios.get(`${API_URL}/api/listings?${params.toString()}`);
+      // First page and filter-panel counts for the same filters, side by side
+      const params = buildParams();
+      const facetsRequest = axios.get(`${API_URL}/api/listings/facets?${params.toString()}`);
+      params.append('limit', PAGE_SIZE);
+      const [response, facetsResponse] = await Promise.all([
+        axios.get(`${API_URL}/api/listings?${params.toString()}`),
+        facetsRequest
+      ]);
       
       if (response.data.success) {
         setListings(response.data.listings);
+        setNextCursor(response.data.nextCursor);
+      }
+      if (facetsResponse.data.success) {
+        setFacets(facetsResponse.data.facets);
+        setTotal(facetsResponse.data.total);
       }
     } catch (error) {
       console.error('Error fetching listings:', error);
@@ -51,12 +79,25 @@ export default function ListingsPage() {
     }
   };
 
-  const filteredListings = listings.filter(listing => {
-    if (filters.types.length > 0 && !filters.types.includes(listing.type)) {
-      return false;
+  const loadMore = async () => {
+    if (!nextCursor) return;
+    setLoadingMore(true);
+    try {
+      const params = buildParams();
+      params.append('limit', PAGE_SIZE);
+      params.append('cursor', nextCursor);
+      const response = await axios.get(`${API_URL}/api/listings?${params.toString()}`);
+
+      if (response.data.success) {
+        setListings(prev => [...prev, ...response.data.listings]);
+        setNextCursor(response.data.nextCursor);
+      }
+    } catch (error) {
+      console.error('Error fetching more listings:', error);
+    } finally {
+      setLoadingMore(false);
     }
-    return true;
-  });
+  };
 
   const handleResetFilters = () => {
     setFilters({
@@ -64,7 +105,9 @@ export default function ListingsPage() {
       duration: 'all',
       mode: 'all',
       minPrice: 0,
-      maxPrice: 5000
+      maxPrice: 5000,
+      from: '',
+      to: ''
     });
   };
 
@@ -77,7 +120,7 @@ export default function ListingsPage() {
               Available Properties
             </h1>
             <p className="text-gray-600 mt-2" data-testid="listings-count">
-              {filteredListings.length} {filteredListings.length === 1 ? 'property' : 'properties'} found
+              {total} {total === 1 ? 'property' : 'properties'} found
             </p>
           </div>
           
@@ -96,6 +139,7 @@ export default function ListingsPage() {
           <aside className={`lg:w-80 ${showMobileFilters ? 'block' : 'hidden lg:block'}`}>
             <FilterPanel
               filters={filters}
+              facets={facets}
               onFilterChange={setFilters}
               onReset={handleResetFilters}
             />
@@ -104,7 +148,7 @@ export default function ListingsPage() {
           <main className="flex-1">
             {loading ? (
               <SkeletonList count={9} />
-            ) : filteredListings.length === 0 ? (
+            ) : listings.length === 0 ? (
               <div className="text-center py-12" data-testid="no-listings-message">
                 <p className="text-xl text-gray-600">No properties match your filters.</p>
                 <Button
@@ -117,11 +161,23 @@ export default function ListingsPage() {
               </div>
             ) : (
               <div className="grid grid-cols-1 md:grid-cols-2 xl:grid-cols-3 gap-6" data-testid="listings-grid">
-                {filteredListings.map(listing => (
+                {listings.map(listing => (
                   <ListingCard key={listing.id} listing={listing} />
                 ))}
               </div>
             )}
+            {!loading && nextCursor && (
+              <div className="text-center mt-8">
+                <Button
+                  variant="outline"
+                  onClick={loadMore}
+                  disabled={loadingMore}
+                  data-testid="load-more-listings"
+                >
+                  {loadingMore ? 'Loading...' : 'Load more'}
+                </Button>
+              </div>
+            )}
           </main>
         </div>
       </div>
@@ -3,6 +3,7 @@ import { Link } from 'react-router-dom';
 import { useAuth } from '@/contexts/AuthContext';
 import axios from 'axios';
 import { Plus, Home, Star, Eye, MessageCircle } from 'lucide-react';
+import { ListingImage } from '@/components/ListingImage';
 
 const API_URL = process.env.REACT_APP_BACKEND_URL || 'http://localhost:8001';
 
@@ -25,11 +26,21 @@ const OwnerDashboard = () => {
     try {
       setLoading(true);
       
-      // Fetch owner's listings
-      const listingsRes = await axios.get(`${API_URL}/api/listings?ownerId=${user.id}`);
+      // Fetch owner's listings and the precomputed dashboard counters
+      const [listingsRes, statsRes] = await Promise.all([
+        axios.get(`${API_URL}/api/listings?ownerId=${user.id}&limit=100`),
+        axios.get(`${API_URL}/api/owner/stats`)
+      ]);
       if (listingsRes.data.success) {
         setListings(listingsRes.data.listings);
-        setStats(prev => ({ ...prev, totalListings: listingsRes.data.listings.length }));
+      }
+      if (statsRes.data.success) {
+        const { listings: listingCounts, reviews } = statsRes.data.stats;
+        setStats({
+          totalListings: listingCounts.total,
+          totalReviews: reviews.count,
+          averageRating: reviews.averageRating
+        });
       }
 
       // Fetch owner profile
@@ -56,6 +67,7 @@ const OwnerDashboard = () => {
     try {
       await axios.delete(`${API_URL}/api/listings/${id}`);
       setListings(listings.filter(l => l._id !== id));
+      setStats(prev => ({ ...prev, totalListings: Math.max(0, prev.totalListings - 1) }));
     } catch (error) {
       alert('Failed to delete listing');
     }
@@ -185,8 +197,10 @@ const OwnerDashboard = () => {
                   <div key={listing._id} className="border border-gray-200 rounded-lg overflow-hidden">
                     <div className="h-48 bg-gray-200">
                       {listing.images && listing.images.length > 0 ? (
-                        <img
+                        <ListingImage
                           src={listing.images[0]}
+                          variants={listing.imageVariants}
+                          sizes="(min-width: 1024px) 33vw, (min-width: 768px) 50vw, 100vw"
                           alt={listing.title}
                           className="w-full h-full object-cover"
                         />
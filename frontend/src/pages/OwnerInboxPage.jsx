@@ -6,11 +6,14 @@ import { useSocket } from '../contexts/SocketContext';
 import { useNavigate } from 'react-router-dom';
 import axios from 'axios';
 import { format } from 'date-fns';
+import { withParticipants } from '../lib/chat';
 
 const OwnerInboxPage = () => {
   const [conversations, setConversations] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
   const [selectedConversation, setSelectedConversation] = useState(null);
   const [messages, setMessages] = useState([]);
+  const [olderCursor, setOlderCursor] = useState(null);
   const [newMessage, setNewMessage] = useState('');
   const [loading, setLoading] = useState(true);
   const [sending, setSending] = useState(false);
@@ -74,6 +77,7 @@ const OwnerInboxPage = () => {
         { headers: { Authorization: `Bearer ${token}` } }
       );
       setConversations(response.data.conversations);
+      setNextCursor(response.data.nextCursor);
     } catch (error) {
       console.error('Error loading conversations:', error);
     } finally {
@@ -81,19 +85,48 @@ const OwnerInboxPage = () => {
     }
   };
 
+  const loadMoreConversations = async () => {
+    if (!nextCursor) return;
+    try {
+      const response = await axios.get(
+        `${process.env.REACT_APP_BACKEND_URL}/api/conversations`,
+        { params: { cursor: nextCursor }, headers: { Authorization: `Bearer ${token}` } }
+      );
+      setConversations((prev) => [...prev, ...response.data.conversations]);
+      setNextCursor(response.data.nextCursor);
+    } catch (error) {
+      console.error('Error loading more conversations:', error);
+    }
+  };
+
   const loadMessages = async (conversationId) => {
     try {
       const response = await axios.get(
         `${process.env.REACT_APP_BACKEND_URL}/api/conversations/${conversationId}/messages`,
         { headers: { Authorization: `Bearer ${token}` } }
       );
-      setMessages(response.data.messages);
+      setMessages(withParticipants(response.data.messages, response.data.participants));
+      setOlderCursor(response.data.hasMore ? response.data.cursors.before : null);
       markAsRead(conversationId);
     } catch (error) {
       console.error('Error loading messages:', error);
     }
   };
 
+  const loadOlderMessages = async () => {
+    if (!olderCursor || !selectedConversation) return;
+    try {
+      const response = await axios.get(
+        `${process.env.REACT_APP_BACKEND_URL}/api/conversations/${selectedConversation._id}/messages`,
+        { params: { before: olderCursor }, headers: { Authorization: `Bearer ${token}` } }
+      );
+      setMessages((prev) => [...withParticipants(response.data.messages, response.data.participants), ...prev]);
+      setOlderCursor(response.data.hasMore ? response.data.cursors.before : null);
+    } catch (error) {
+      console.error('Error loading older messages:', error);
+    }
+  };
+
   const markAsRead = async (conversationId) => {
     try {
       await axios.put(
@@ -239,6 +272,13 @@ const OwnerInboxPage = () => {
                   );
                 })
               )}
+              {!loading && nextCursor && (
+                <div className="p-4 text-center">
+                  <Button variant="outline" size="sm" onClick={loadMoreConversations}>
+                    Load older conversations
+                  </Button>
+                </div>
+              )}
             </div>
           </div>
 
@@ -258,6 +298,13 @@ const OwnerInboxPage = () => {
 
                 {/* Messages */}
                 <div className="flex-1 overflow-y-auto p-4 space-y-3 bg-gray-50">
+                  {olderCursor && (
+                    <div className="text-center">
+                      <Button variant="ghost" size="sm" onClick={loadOlderMessages}>
+                        Load earlier messages
+                      </Button>
+                    </div>
+                  )}
                   {messages.length === 0 ? (
                     <div className="flex items-center justify-center h-full text-gray-500">
                       <p>No messages yet</p>
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Bulk Listing Transfer for Rental Marketplace
+Moves an owner's portfolio in and out through the streaming bulk endpoints,
+/api/owner/listings/import and /api/owner/listings/export.
+
+    python listing_transfer.py --email owner@example.com --password secret export listings.ndjson
+    python listing_transfer.py --email owner@example.com --password secret import listings.csv
+
+Imports are sent in chunks of --chunk-rows records (the server takes at most
+IMPORT_MAX_ROWS per request). Rejected rows are reported with their record
+number in the input file.
+"""
+
+import io
+import os
+import csv
+import sys
+import json
+import time
+import argparse
+
+from api_client import ApiClient, API_URL
+from backend_test import Colors, log
+
+CONTENT_TYPES = {'ndjson': 'application/x-ndjson', 'csv': 'text/csv'}
+
+def detect_format(path, format):
+    if format:
+        return format
+    return 'csv' if path.lower().endswith('.csv') else 'ndjson'
+
+def login(client, email, password):
+    response = client.request('POST', '/auth/login', {'email': email, 'password': password})
+    if response.status_code != 200:
+        raise SystemExit(f"Login failed: {response.status_code} {response.text[:200]}")
+    return response.json()['token']
+
+def read_chunks(path, format, chunk_rows):
+    """Yield (first record number, encoded body) per chunk, CSV chunks each with the header.
+    Records are numbered like the server does: from 1, skipping blank lines and the header."""
+    with open(path, newline='' if format == 'csv' else None, encoding='utf-8') as f:
+        if format == 'csv':
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if header is None:
+                return
+            rows, first, number = [], 1, 0
+            for record in reader:
+                if not record:
+                    continue
+                number += 1
+                rows.append(record)
+                if len(rows) == chunk_rows:
+                    yield first, encode_csv(header, rows)
+                    rows, first = [], number + 1
+            if rows:
+                yield first, encode_csv(header, rows)
+        else:
+            lines, first, number = [], 1, 0
+            for line in f:
+                if not line.strip():
+                    continue
+                number += 1
+                lines.append(line if line.endswith('\n') else line + '\n')
+                if len(lines) == chunk_rows:
+                    yield first, ''.join(lines).encode('utf-8')
+                    lines, first = [], number + 1
+            if lines:
+                yield first, ''.join(lines).encode('utf-8')
+
+def encode_csv(header, rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    writer.writerows(rows)
+    return buffer.getvalue().encode('utf-8')
+
+def import_listings(client, headers, path, format, chunk_rows, errors_path=None):
+    totals = {'received': 0, 'inserted': 0, 'failed': 0}
+    errors = []
+    started = time.perf_counter()
+
+    for first, body in read_chunks(path, format, chunk_rows):
+        response = client.session.post(
+            f"{client.api_url}/owner/listings/import",
+            data=body,
+            headers={**headers, 'Content-Type': CONTENT_TYPES[format]},
+            timeout=max(client.timeout, 120),
+        )
+        summary = response.json()
+        if response.status_code not in (200, 400) or 'received' not in summary:
+            raise SystemExit(f"Import failed at record {first}: {response.status_code} {response.text[:200]}")
+        if summary.get('truncated'):
+            raise SystemExit(f"Server accepted fewer rows than --chunk-rows {chunk_rows}, lower it and retry")
+
+        for key in totals:
+            totals[key] += summary[key]
+        for error in summary['errors']:
+            errors.append({'row': first + error['row'] - 1, 'message': error['message']})
+        log(f"  records {first}-{first + summary['received'] - 1}: "
+            f"{summary['inserted']} inserted, {summary['failed']} rejected",
+            Colors.GREEN if summary['failed'] == 0 else Colors.YELLOW)
+
+    elapsed = time.perf_counter() - started
+    log(f"\nImported {totals['inserted']} of {totals['received']} listings in {elapsed:.1f}s "
+        f"({totals['inserted'] / elapsed if elapsed else 0:.0f}/s)", Colors.BOLD)
+    for error in errors[:20]:
+        log(f"  record {error['row']}: {error['message']}", Colors.RED)
+    if len(errors) > 20:
+        log(f"  ... {len(errors) - 20} more", Colors.RED)
+    if totals['failed'] > len(errors):
+        log(f"  {totals['failed'] - len(errors)} rejections were not itemised by the server", Colors.YELLOW)
+    if errors_path:
+        with open(errors_path, 'w') as f:
+            for error in errors:
+                f.write(json.dumps(error) + '\n')
+    return totals
+
+def export_listings(client, headers, path, format):
+    started = time.perf_counter()
+    written = 0
+    with client.session.get(f"{client.api_url}/owner/listings/export", params={'format': format},
+                            headers=headers, stream=True, timeout=client.timeout) as response:
+        if response.status_code != 200:
+            raise SystemExit(f"Export failed: {response.status_code} {response.text[:200]}")
+        with open(path, 'wb') as f:
+            for chunk in response.iter_content(chunk_size=64 * 1024):
+                f.write(chunk)
+                written += len(chunk)
+
+    with open(path, newline='', encoding='utf-8') as f:
+        if format == 'csv':
+            records = max(0, sum(1 for record in csv.reader(f) if record) - 1)
+        else:
+            records = sum(1 for line in f if line.strip())
+    elapsed = time.perf_counter() - started
+    log(f"Exported {records} listings ({written / 1024:.0f} KB) to {path} in {elapsed:.1f}s", Colors.BOLD)
+    return records
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk import or export an owner's listings")
+    parser.add_argument('--api-url', default=API_URL)
+    parser.add_argument('--email', default=os.environ.get('OWNER_EMAIL'))
+    parser.add_argument('--password', default=os.environ.get('OWNER_PASSWORD'))
+    parser.add_argument('--token', default=os.environ.get('OWNER_TOKEN'), help="JWT instead of email/password")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    export = commands.add_parser('export', help="download all listings")
+    export.add_argument('output')
+    export.add_argument('--format', choices=sorted(CONTENT_TYPES), default=None,
+                        help="default from the file extension, ndjson unless .csv")
+
+    upload = commands.add_parser('import', help="create listings from a file")
+    upload.add_argument('input')
+    upload.add_argument('--format', choices=sorted(CONTENT_TYPES), default=None,
+                        help="default from the file extension, ndjson unless .csv")
+    upload.add_argument('--chunk-rows', type=int, default=5000, help="records per request")
+    upload.add_argument('--errors', help="write rejected records as NDJSON to this file")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_args()
+    client = ApiClient(args.api_url)
+    try:
+        token = args.token
+        if not token:
+            if not (args.email and args.password):
+                raise SystemExit("Pass --token, or --email and --password")
+            token = login(client, args.email, args.password)
+        headers = {'Authorization': f'Bearer {token}'}
+
+        if args.command == 'export':
+            export_listings(client, headers, args.output, detect_format(args.output, args.format))
+        else:
+            totals = import_listings(client, headers, args.input, detect_format(args.input, args.format),
+                                     args.chunk_rows, args.errors)
+            sys.exit(1 if totals['failed'] else 0)
+    finally:
+        client.close()
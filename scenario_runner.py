@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Parallel Scenario Runner for Rental Marketplace
+Runs the full owner/customer scenario many times at once, each run with its
+own users, and checks invariants that only break under concurrency.
+
+    python scenario_runner.py --parallel 8 --iterations 32 --race 8
+"""
+
+import sys
+import time
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from api_client import ApiClient, UserNamespace, API_URL
+from backend_test import Colors, log, SAMPLE_LISTING
+
+class ScenarioFailure(AssertionError):
+    pass
+
+class Scenario:
+    """One isolated owner/customer walk-through; every failure is recorded, not raised"""
+
+    def __init__(self, client, namespace, index, race):
+        self.client = client
+        self.namespace = namespace
+        self.index = index
+        self.race = race
+        self.failures = []
+        self.requests = 0
+
+    def call(self, method, endpoint, data=None, headers=None, expected_status=200):
+        self.requests += 1
+        response = self.client.request(method, endpoint, data, headers)
+        if response.status_code != expected_status:
+            raise ScenarioFailure(f"{method} {endpoint} -> {response.status_code} "
+                                  f"(expected {expected_status}): {response.text[:200]}")
+        return response.json()
+
+    def check(self, condition, message):
+        if not condition:
+            self.failures.append(message)
+
+    def register(self, kind, role):
+        user = self.namespace.user(kind, f"Scenario {kind.title()} {self.index}", "scenario123", self.index)
+        data = self.call('POST', '/auth/register', user, expected_status=201)
+        headers = {"Authorization": f"Bearer {data['token']}"}
+        selected = self.call('POST', '/user/select-role', {"role": role}, headers)
+        self.check(selected['user']['role'] == role, f"select-role returned role {selected['user']['role']}")
+        me = self.call('GET', '/user/me', headers=headers)
+        self.check(me['user']['role'] == role and not me['requiresRoleSelection'],
+                   f"/user/me shows role {me['user']['role']} after selecting {role}")
+        return headers
+
+    def race_reviews(self, listing_id, headers):
+        """Fire the same review from one customer on several threads at once"""
+        barrier = threading.Barrier(self.race)
+        review = {"listingId": listing_id, "rating": 4, "comment": "Concurrent review"}
+
+        def post():
+            barrier.wait()
+            return self.client.request('POST', '/reviews', review, headers).status_code
+
+        with ThreadPoolExecutor(max_workers=self.race) as pool:
+            statuses = list(pool.map(lambda _: post(), range(self.race)))
+        self.requests += self.race
+        return statuses
+
+    def run(self):
+        try:
+            owner = self.register('scenario.owner', 'OWNER')
+            customer = self.register('scenario.customer', 'CUSTOMER')
+
+            self.call('POST', '/owner/profile', {"contactNumber": "1234567890", "description": "Scenario owner"},
+                      owner, expected_status=201)
+            # Derived fields in the body are ignored; the rating checks below would see them
+            listing = self.call('POST', '/listings',
+                                dict(SAMPLE_LISTING, title=f"{SAMPLE_LISTING['title']} #{self.namespace.run_id}-{self.index}",
+                                     ratingStats={"count": 50, "sum": 250, "average": 5}),
+                                owner, expected_status=201)['listing']
+            listing_id = listing['_id']
+
+            page = self.call('GET', f"/listings?ownerId={listing['ownerId']['_id']}")
+            self.check([l['_id'] for l in page['listings']] == [listing_id],
+                       "owner listing page does not contain exactly the new listing")
+            self.call('GET', f'/listings/{listing_id}')
+
+            statuses = self.race_reviews(listing_id, customer) if self.race > 1 else [
+                self.client.request('POST', '/reviews', {"listingId": listing_id, "rating": 4}, customer).status_code
+            ]
+            self.check(statuses.count(201) == 1, f"expected exactly one review to be created, got {statuses}")
+            self.check(all(status in (201, 400) for status in statuses), f"duplicate reviews must get 400, got {statuses}")
+
+            reviews = self.call('GET', f'/reviews/listing/{listing_id}')
+            self.check(len(reviews['reviews']) == 1, f"listing has {len(reviews['reviews'])} reviews, expected 1")
+            self.check(reviews['ratingStats']['count'] == 1,
+                       f"ratingStats.count is {reviews['ratingStats']['count']}, expected 1")
+
+            detail = self.call('GET', f'/listings/{listing_id}')['listing']
+            self.check(detail.get('ratingStats', {}).get('average') == 4,
+                       "listing detail still shows stale ratingStats after the review")
+        except ScenarioFailure as e:
+            self.failures.append(str(e))
+        except Exception as e:
+            self.failures.append(f"{type(e).__name__}: {e}")
+        return self
+
+def run_scenarios(parallel, iterations, race, api_url=API_URL):
+    """Run the scenario iterations times across parallel threads, returning a summary"""
+    namespace = UserNamespace()
+    client = ApiClient(api_url)
+    started = time.perf_counter()
+    results = []
+    try:
+        with ThreadPoolExecutor(max_workers=parallel) as pool:
+            futures = [pool.submit(Scenario(client, namespace, i, race).run) for i in range(iterations)]
+            for future in as_completed(futures):
+                scenario = future.result()
+                results.append(scenario)
+                if scenario.failures:
+                    log(f"  ❌ scenario {scenario.index}: {'; '.join(scenario.failures)}", Colors.RED)
+    finally:
+        client.close()
+
+    elapsed = time.perf_counter() - started
+    failed = [s for s in results if s.failures]
+    requests_sent = sum(s.requests for s in results)
+    return {
+        "run_id": namespace.run_id,
+        "iterations": iterations,
+        "parallel": parallel,
+        "race": race,
+        "failed": len(failed),
+        "requests": requests_sent,
+        "elapsed_seconds": round(elapsed, 3),
+        "throughput_rps": round(requests_sent / elapsed, 2) if elapsed > 0 else 0.0,
+        "failures": {s.index: s.failures for s in failed}
+    }
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run the backend scenario many times in parallel")
+    parser.add_argument('--parallel', type=int, default=8, help="scenarios running at the same time")
+    parser.add_argument('--iterations', type=int, default=32, help="total scenarios to run")
+    parser.add_argument('--race', type=int, default=8, help="concurrent duplicate review attempts per scenario")
+    parser.add_argument('--api-url', default=API_URL)
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_args()
+    log(f"\n{Colors.BOLD}🧵 RENTAL MARKETPLACE PARALLEL SCENARIOS{Colors.ENDC}")
+    log(f"API Base: {args.api_url}")
+    summary = run_scenarios(args.parallel, args.iterations, args.race, args.api_url)
+    color = Colors.GREEN if summary["failed"] == 0 else Colors.RED
+    log(f"{summary['iterations'] - summary['failed']}/{summary['iterations']} scenarios passed in "
+        f"{summary['elapsed_seconds']}s ({summary['requests']} requests, {summary['throughput_rps']} req/s)", color)
+    sys.exit(0 if summary["failed"] == 0 else 1)
@@ -0,0 +1,420 @@
+#!/usr/bin/env python3
+"""
+Synthetic Data Seeder for Rental Marketplace benchmarks
+Streams users, listings, reviews, conversations and messages into MongoDB
+with batched bulk inserts. The same --seed always produces the same dataset.
+
+    python seed_data.py --listings 1000000 --drop
+"""
+
+import os
+import re
+import sys
+import math
+import time
+import array
+import bisect
+import random
+import argparse
+import subprocess
+import unicodedata
+from datetime import datetime, timedelta
+
+try:
+    from bson import ObjectId
+    from pymongo import MongoClient
+except ImportError:  # pragma: no cover - only needed when actually seeding
+    ObjectId = MongoClient = None
+
+DEFAULT_PASSWORD = "password123"
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend')
+
+# All timestamps are relative to a fixed epoch so runs are byte-for-byte reproducible
+EPOCH = datetime(2026, 1, 1)
+HISTORY_DAYS = 730
+
+# City clusters taken from frontend/src/data/mockListings.js; weight is relative
+# market size and spread_km the standard deviation around the center
+CITIES = [
+    ("San Francisco", "Downtown", 37.7749, -122.4194, 10, 6),
+    ("Austin", "Suburb Area", 30.2672, -97.7431, 7, 12),
+    ("Colorado", "Mountain Resort", 39.5501, -105.7821, 2, 25),
+    ("Seattle", "City Center", 47.6062, -122.3321, 8, 8),
+    ("Miami", "Coastal Area", 25.7617, -80.1918, 7, 10),
+    ("Oregon", "Forest Area", 43.8041, -120.5542, 1, 40),
+    ("New York", "Manhattan", 40.7831, -73.9712, 15, 5),
+    ("Portland", "Suburban", 45.5152, -122.6784, 4, 10),
+    ("Minnesota", "Lakeside", 46.7296, -94.6859, 1, 30),
+    ("Boston", "University District", 42.3601, -71.0589, 6, 6),
+    ("Chicago", "Downtown", 41.8781, -87.6298, 9, 9),
+    ("Vermont", "Ski Resort", 44.2601, -72.5754, 1, 20),
+    ("Los Angeles", "Arts District", 34.0522, -118.2437, 12, 15),
+    ("Nashville", "Suburbs", 36.1627, -86.7816, 4, 10),
+    ("Montana", "Riverside", 46.8797, -110.3626, 1, 35),
+]
+
+# (type, weight, median monthly price, (min, max) bedrooms)
+TYPES = [
+    ("apartment", 30, 1800, (1, 3)),
+    ("room", 20, 650, (1, 1)),
+    ("studio", 12, 1100, (1, 1)),
+    ("house", 12, 2600, (2, 5)),
+    ("pg", 8, 450, (1, 1)),
+    ("hostel", 5, 300, (1, 1)),
+    ("villa", 4, 4500, (3, 6)),
+    ("cottage", 4, 1600, (1, 3)),
+    ("lodge", 3, 1400, (1, 4)),
+    ("farmhouse", 2, 2200, (2, 5)),
+]
+
+# Facility and probability of a listing offering it, following the frequencies
+# in mockListings.js and the options offered by AddListingPageNew.jsx
+FACILITIES = [
+    ("WiFi", 0.92), ("Parking", 0.65), ("Kitchen", 0.45), ("AC", 0.4), ("Furnished", 0.35),
+    ("Heating", 0.3), ("Laundry", 0.3), ("Washing Machine", 0.25), ("Refrigerator", 0.25),
+    ("Pet-Friendly", 0.2), ("Garden", 0.18), ("Balcony", 0.18), ("Security", 0.15),
+    ("Gym", 0.12), ("Elevator", 0.12), ("TV", 0.12), ("Fireplace", 0.1), ("Microwave", 0.1),
+    ("Water Supply", 0.1), ("Power Backup", 0.08), ("CCTV", 0.08), ("Pool", 0.06),
+]
+
+ADJECTIVES = ["Cozy", "Spacious", "Modern", "Sunny", "Quiet", "Luxury", "Charming", "Rustic",
+              "Bright", "Elegant", "Peaceful", "Renovated", "Stylish", "Affordable"]
+HIGHLIGHTS = ["City Views", "Garden", "Lake Access", "Rooftop Terrace", "Parking", "Balcony",
+              "Fireplace", "Pool", "Mountain Views", "Backyard", "Workspace", "Beach Access"]
+STREETS = ["Main Street", "Park Avenue", "Lake Road", "Hill View", "Market Lane", "River Drive",
+           "Station Road", "Oak Street", "Maple Avenue", "Pine Street", "Cedar Lane", "Elm Street"]
+FIRST_NAMES = ["Sarah", "Mike", "Emma", "James", "Olivia", "Liam", "Ava", "Noah", "Mia", "Ethan",
+               "Priya", "Arjun", "Chen", "Sofia", "Lucas", "Zara", "Omar", "Hana", "Leo", "Nina"]
+LAST_NAMES = ["Johnson", "Chen", "Wilson", "Patel", "Garcia", "Kim", "Nguyen", "Smith", "Brown",
+              "Singh", "Lopez", "Martin", "Khan", "Rossi", "Silva", "Novak", "Sato", "Reyes"]
+REVIEW_COMMENTS = {
+    5: ["Amazing place, highly recommended!", "Exactly as described, wonderful host.", "Perfect stay."],
+    4: ["Great location, friendly owner.", "Very comfortable, minor issues.", "Good value for money."],
+    3: ["Decent place for the price.", "Okay overall, a bit noisy.", "Average experience."],
+    2: ["Not as clean as expected.", "Owner was slow to respond.", "Photos were misleading."],
+    1: ["Would not stay again.", "Many problems during the stay.", "Very disappointing."],
+}
+REVIEW_RATING_WEIGHTS = [(5, 45), (4, 32), (3, 13), (2, 6), (1, 4)]
+CHAT_LINES = ["Hi, is this still available?", "Yes, it is! When would you like to visit?",
+              "Is parking included?", "Could I see it this weekend?", "What is the minimum stay?",
+              "Are utilities included in the price?", "Sure, Saturday at 11 works.", "Thanks!",
+              "Can you share more photos of the kitchen?", "Is the deposit refundable?"]
+
+# Mirrors backend/utils/search.js
+MIN_PREFIX_LENGTH = 2
+MAX_PREFIX_LENGTH = 15
+
+
+def tokenize(text):
+    normalized = unicodedata.normalize("NFKD", text or "")
+    normalized = "".join(c for c in normalized if not unicodedata.combining(c)).lower()
+    return [token for token in re.split(r"[^a-z0-9]+", normalized) if token]
+
+
+def build_prefixes(*texts):
+    prefixes = []
+    seen = set()
+    for text in texts:
+        for token in tokenize(text):
+            for length in range(MIN_PREFIX_LENGTH, min(len(token), MAX_PREFIX_LENGTH) + 1):
+                prefix = token[:length]
+                if prefix not in seen:
+                    seen.add(prefix)
+                    prefixes.append(prefix)
+    return prefixes
+
+
+def query_prefixes(text):
+    return sorted({t[:MAX_PREFIX_LENGTH] for t in tokenize(text) if len(t) >= MIN_PREFIX_LENGTH})
+
+
+def hash_password(password):
+    """bcrypt hash compatible with bcryptjs, via python bcrypt or the backend's bcryptjs"""
+    try:
+        import bcrypt
+        return bcrypt.hashpw(password.encode(), bcrypt.gensalt(10)).decode()
+    except ImportError:
+        pass
+    script = "process.stdout.write(require('bcryptjs').hashSync(process.argv[1], 10))"
+    try:
+        return subprocess.check_output(["node", "-e", script, password], cwd=BACKEND_DIR).decode()
+    except (OSError, subprocess.CalledProcessError):
+        sys.exit("Need either the python bcrypt package or node with backend/node_modules installed")
+
+
+class WeightedChoice:
+    """O(log n) weighted sampling from a fixed population"""
+
+    def __init__(self, rng, population, weights):
+        self.rng = rng
+        self.population = population
+        self.cum_weights = []
+        total = 0
+        for weight in weights:
+            total += weight
+            self.cum_weights.append(total)
+        self.total = total
+
+    def __call__(self):
+        index = bisect.bisect_right(self.cum_weights, self.rng.random() * self.total)
+        return self.population[min(index, len(self.population) - 1)]
+
+
+class BatchWriter:
+    """Buffers documents per collection and flushes them with insert_many"""
+
+    def __init__(self, db, batch_size):
+        self.db = db
+        self.batch_size = batch_size
+        self.buffers = {}
+        self.counts = {}
+
+    def add(self, collection, document):
+        buffer = self.buffers.setdefault(collection, [])
+        buffer.append(document)
+        if len(buffer) >= self.batch_size:
+            self.flush(collection)
+
+    def flush(self, collection=None):
+        for name in ([collection] if collection else list(self.buffers)):
+            buffer = self.buffers.get(name)
+            if buffer:
+                self.db[name].insert_many(buffer, ordered=False)
+                self.counts[name] = self.counts.get(name, 0) + len(buffer)
+                self.buffers[name] = []
+
+
+class Seeder:
+    def __init__(self, db, args):
+        self.db = db
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.writer = BatchWriter(db, args.batch_size)
+        self.password_hash = hash_password(DEFAULT_PASSWORD)
+        self.owner_ids = []
+        self.customer_ids = []
+        # Compact per-listing state needed by conversations: 12-byte id + owner index
+        self.listing_ids = bytearray()
+        self.listing_owners = array.array('I')
+
+    def object_id(self):
+        return ObjectId(self.rng.getrandbits(96).to_bytes(12, 'big'))
+
+    def timestamp(self, after=None):
+        start = after or EPOCH - timedelta(days=HISTORY_DAYS)
+        span = (EPOCH - start).total_seconds()
+        return start + timedelta(seconds=self.rng.random() * span)
+
+    def progress(self, label, done, total, started):
+        if done % max(1, total // 20) == 0 or done == total:
+            rate = done / max(time.time() - started, 1e-9)
+            print(f"  {label}: {done:>10,}/{total:,} ({rate:,.0f}/s)", flush=True)
+
+    def seed_users(self):
+        args = self.args
+        owners = max(1, int(args.users * args.owner_fraction))
+        started = time.time()
+        for i in range(args.users):
+            user_id = self.object_id()
+            role = 'OWNER' if i < owners else 'CUSTOMER'
+            (self.owner_ids if role == 'OWNER' else self.customer_ids).append(user_id)
+            name = f"{self.rng.choice(FIRST_NAMES)} {self.rng.choice(LAST_NAMES)}"
+            self.writer.add('users', {
+                "_id": user_id,
+                "name": name,
+                "email": f"{role.lower()}.{i}@seed.rentease.com",
+                "password": self.password_hash,
+                "role": role,
+                "createdAt": self.timestamp(),
+                "__v": 0,
+            })
+            self.progress("users", i + 1, args.users, started)
+        self.writer.flush('users')
+
+    def seed_listings(self):
+        args = self.args
+        rng = self.rng
+        # Zipf-like owner skew: a few owners hold large portfolios
+        pick_owner = WeightedChoice(rng, range(len(self.owner_ids)),
+                                    [1 / (rank + 1) ** args.owner_skew for rank in range(len(self.owner_ids))])
+        pick_city = WeightedChoice(rng, CITIES, [city[4] for city in CITIES])
+        pick_type = WeightedChoice(rng, TYPES, [t[1] for t in TYPES])
+        pick_rating = WeightedChoice(rng, [r for r, _ in REVIEW_RATING_WEIGHTS], [w for _, w in REVIEW_RATING_WEIGHTS])
+        started = time.time()
+
+        for i in range(args.listings):
+            listing_id = self.object_id()
+            owner_index = pick_owner()
+            city, area, lat, lng, _, spread_km = pick_city()
+            kind, _, median_price, (min_bed, max_bed) = pick_type()
+
+            latitude = round(lat + rng.gauss(0, spread_km) / 111.0, 6)
+            longitude = round(lng + rng.gauss(0, spread_km) / (111.0 * math.cos(math.radians(lat))), 6)
+            bedrooms = rng.randint(min_bed, max_bed)
+            price = max(50, int(rng.lognormvariate(math.log(median_price), 0.35)))
+            facilities = [name for name, probability in FACILITIES if rng.random() < probability]
+            title = f"{rng.choice(ADJECTIVES)} {bedrooms}BR {kind.title()} with {rng.choice(HIGHLIGHTS)}"
+            address = f"{rng.randint(1, 9999)} {rng.choice(STREETS)}, {area}, {city}"
+            created_at = self.timestamp()
+
+            # Reviews from distinct customers; most listings have few, some have many
+            review_count = min(len(self.customer_ids), int(rng.expovariate(1 / args.reviews_per_listing)))
+            histogram = {str(star): 0 for star in range(1, 6)}
+            rating_sum = 0
+            for reviewer in rng.sample(self.customer_ids, review_count):
+                rating = pick_rating()
+                histogram[str(rating)] += 1
+                rating_sum += rating
+                self.writer.add('reviews', {
+                    "_id": self.object_id(),
+                    "listingId": listing_id,
+                    "userId": reviewer,
+                    "rating": rating,
+                    "comment": rng.choice(REVIEW_COMMENTS[rating]),
+                    "createdAt": self.timestamp(after=created_at),
+                    "__v": 0,
+                })
+
+            self.writer.add('listings', {
+                "_id": listing_id,
+                "ownerId": self.owner_ids[owner_index],
+                "title": title,
+                "type": kind,
+                "price": price,
+                "priceType": "monthly",
+                "monthlyPrice": price,
+                "squareFeet": int(bedrooms * rng.uniform(250, 550)),
+                "facilities": facilities,
+                "addressText": address,
+                "latitude": latitude,
+                "longitude": longitude,
+                "geo": {"type": "Point", "coordinates": [longitude, latitude]},
+                "searchPrefixes": build_prefixes(title, address),
+                "googleMapsLink": f"https://www.google.com/maps?q={latitude},{longitude}",
+                "images": [f"https://picsum.photos/seed/{listing_id}-{n}/800/600" for n in range(rng.randint(1, 5))],
+                "description": f"{title} in {area}, {city}. Offers {', '.join(facilities) or 'the essentials'}.",
+                "bedrooms": bedrooms,
+                "bathrooms": max(1, bedrooms - rng.randint(0, 1)),
+                "availableFrom": self.timestamp(after=created_at),
+                "status": "available" if rng.random() < 0.8 else rng.choice(["rented", "unavailable"]),
+                "ratingStats": {
+                    "count": review_count,
+                    "sum": rating_sum,
+                    "average": round(rating_sum / review_count, 2) if review_count else 0,
+                    "histogram": histogram,
+                },
+                "createdAt": created_at,
+                "updatedAt": created_at,
+                "__v": 0,
+            })
+            self.listing_ids += listing_id.binary
+            self.listing_owners.append(owner_index)
+            self.progress("listings", i + 1, args.listings, started)
+        self.writer.flush()
+
+    def seed_conversations(self):
+        args = self.args
+        rng = self.rng
+        listing_count = len(self.listing_owners)
+        if not listing_count or not self.customer_ids:
+            return
+        started = time.time()
+
+        for i in range(args.conversations):
+            # Newer listings attract more enquiries: bias towards the end of the range
+            index = min(listing_count - 1, int(listing_count * rng.random() ** 0.5))
+            listing_id = ObjectId(bytes(self.listing_ids[index * 12:(index + 1) * 12]))
+            owner_id = self.owner_ids[self.listing_owners[index]]
+            customer_id = rng.choice(self.customer_ids)
+            conversation_id = self.object_id()
+
+            message_count = max(1, int(rng.expovariate(1 / args.messages_per_conversation)))
+            unread_tail = rng.choice([0, 0, 0, 1, 2])
+            sent_at = self.timestamp()
+            sender, receiver = customer_id, owner_id
+            text = ""
+            for n in range(message_count):
+                sent_at += timedelta(minutes=rng.expovariate(1 / 90))
+                text = rng.choice(CHAT_LINES)
+                self.writer.add('messages', {
+                    "_id": self.object_id(),
+                    "conversationId": conversation_id,
+                    "senderId": sender,
+                    "receiverId": receiver,
+                    "messageText": text,
+                    "isRead": n < message_count - unread_tail,
+                    "createdAt": sent_at,
+                    "updatedAt": sent_at,
+                    "__v": 0,
+                })
+                if rng.random() < 0.7:
+                    sender, receiver = receiver, sender
+
+            self.writer.add('conversations', {
+                "_id": conversation_id,
+                "participants": [customer_id, owner_id],
+                "listingId": listing_id,
+                "lastMessage": text,
+                "createdAt": sent_at - timedelta(minutes=message_count * 90),
+                "updatedAt": sent_at,
+                "__v": 0,
+            })
+            self.progress("conversations", i + 1, args.conversations, started)
+        self.writer.flush()
+
+    def run(self):
+        started = time.time()
+        print("Seeding users...")
+        self.seed_users()
+        print("Seeding listings and reviews...")
+        self.seed_listings()
+        print("Seeding conversations and messages...")
+        self.seed_conversations()
+        elapsed = time.time() - started
+        for name, count in sorted(self.writer.counts.items()):
+            print(f"  {name:<14} {count:>12,}")
+        print(f"Done in {elapsed:.1f}s. Every seeded user's password is '{DEFAULT_PASSWORD}'.")
+        return self.writer.counts
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Seed a reproducible synthetic dataset into MongoDB")
+    parser.add_argument('--mongo-url', default=os.environ.get('MONGO_URL', 'mongodb://localhost:27017'))
+    parser.add_argument('--db', default=os.environ.get('DB_NAME', 'rental_marketplace_bench'))
+    parser.add_argument('--seed', type=int, default=42, help="random seed; same seed, same dataset")
+    parser.add_argument('--listings', type=int, default=100000)
+    parser.add_argument('--users', type=int, default=None, help="default: listings / 5, at least 10")
+    parser.add_argument('--owner-fraction', type=float, default=0.2, help="share of users who are owners")
+    parser.add_argument('--owner-skew', type=float, default=1.1, help="Zipf exponent of listings per owner")
+    parser.add_argument('--reviews-per-listing', type=float, default=3.0, help="mean reviews per listing")
+    parser.add_argument('--conversations', type=int, default=None, help="default: listings / 2")
+    parser.add_argument('--messages-per-conversation', type=float, default=8.0, help="mean messages per conversation")
+    parser.add_argument('--batch-size', type=int, default=5000)
+    parser.add_argument('--drop', action='store_true', help="drop the target collections first")
+    args = parser.parse_args(argv)
+    if args.users is None:
+        args.users = max(10, args.listings // 5)
+    if args.conversations is None:
+        args.conversations = args.listings // 2
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if MongoClient is None:
+        sys.exit("pymongo is required: pip install pymongo")
+
+    client = MongoClient(args.mongo_url)
+    db = client[args.db]
+    print(f"Seeding {args.mongo_url}/{args.db} with seed {args.seed}")
+    if args.drop:
+        for name in ('users', 'listings', 'reviews', 'conversations', 'messages'):
+            db[name].drop()
+
+    Seeder(db, args).run()
+    print("Start the backend (or its rebuild scripts) against this database to build the declared indexes.")
+    client.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -4,33 +4,19 @@ Simple Backend API Test for Rental Marketplace
 Focus on core functionality verification
 """
 
-import requests
 import json
 import sys
 
-# Get backend URL from frontend .env file
-def get_backend_url():
-    try:
-        with open('/app/frontend/.env', 'r') as f:
-            for line in f:
-                if line.startswith('REACT_APP_BACKEND_URL='):
-                    return line.split('=', 1)[1].strip()
-    except:
-        pass
-    return 'http://localhost:8001'
+from api_client import ApiClient, UserNamespace, BASE_URL, API_URL
 
-BASE_URL = get_backend_url()
-API_URL = f"{BASE_URL}/api"
+# Pooled keep-alive client, and unique users so the test can be rerun
+CLIENT = ApiClient()
+NAMESPACE = UserNamespace()
 
 def test_request(method, endpoint, data=None, headers=None):
     """Make API request and return response"""
-    url = f"{API_URL}{endpoint}"
-    
     try:
-        if method.upper() == 'GET':
-            response = requests.get(url, headers=headers, timeout=10)
-        elif method.upper() == 'POST':
-            response = requests.post(url, json=data, headers=headers, timeout=10)
+        response = CLIENT.request(method, endpoint, data, headers)
         
         print(f"  {method} {endpoint} -> {response.status_code}")
         return response
@@ -59,7 +45,7 @@ def main():
     # Register Owner
     owner_data = {
         "name": "John Owner",
-        "email": "john.owner@test.com",
+        "email": NAMESPACE.email("john.owner"),
         "password": "password123"
     }
     
@@ -81,7 +67,7 @@ def main():
     # Register Customer
     customer_data = {
         "name": "Jane Customer", 
-        "email": "jane.customer@test.com",
+        "email": NAMESPACE.email("jane.customer"),
         "password": "password123"
     }
     
@@ -0,0 +1,70 @@
+"""
+Start and stop a local backend process for the benchmarks that compare
+server configurations. Needs node and the backend's node_modules.
+"""
+
+import os
+import time
+import signal
+import shutil
+import socket
+import subprocess
+
+import pytest
+import requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BACKEND_DIR = os.path.join(ROOT, "backend")
+
+requires_node_backend = [
+    pytest.mark.skipif(shutil.which("node") is None, reason="node is not installed"),
+    pytest.mark.skipif(not os.path.isdir(os.path.join(BACKEND_DIR, "node_modules")),
+                       reason="backend dependencies are not installed"),
+]
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def spawn_backend(port, script="server.js", backend_dir=BACKEND_DIR, **env):
+    """Run <backend_dir>/<script> on port with extra environment, without waiting"""
+    env = dict(os.environ, PORT=str(port), **{key: str(value) for key, value in env.items()})
+    return subprocess.Popen(
+        ["node", script], cwd=backend_dir, env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True
+    )
+
+
+def start_backend(port, script="server.js", backend_dir=BACKEND_DIR, **env):
+    """Run <backend_dir>/<script> on port with extra environment, once it reports ready.
+
+    Revisions without /api/health/ready count as ready when /api answers.
+    """
+    process = spawn_backend(port, script, backend_dir, **env)
+    probe = f"http://127.0.0.1:{port}/api/health/ready"
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        if process.poll() is not None:
+            pytest.fail(f"{script} exited with {process.returncode}")
+        try:
+            status = requests.get(probe, timeout=1).status_code
+            if status == 404:
+                probe = f"http://127.0.0.1:{port}/api"
+            elif status == 200:
+                return process
+        except requests.RequestException:
+            pass
+        time.sleep(0.25)
+    stop_backend(process)
+    pytest.fail(f"{script} did not become healthy on port {port}")
+
+
+def stop_backend(process):
+    try:
+        os.killpg(process.pid, signal.SIGTERM)
+        process.wait(timeout=10)
+    except (ProcessLookupError, subprocess.TimeoutExpired):
+        os.killpg(process.pid, signal.SIGKILL)
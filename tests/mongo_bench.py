@@ -0,0 +1,67 @@
+"""
+Shared scaffold of the benchmarks that seed their own MongoDB database with
+pymongo instead of going through the backend: a throwaway database, growing
+a collection in batches, and query timing.
+
+Environment:
+    BENCH_MONGO_URL  default mongodb://localhost:27017
+    BENCH_DB_NAME    default rental_marketplace_bench
+"""
+
+import os
+import json
+import time
+import statistics
+from contextlib import contextmanager
+
+import pytest
+import pymongo
+
+MONGO_URL = os.environ.get("BENCH_MONGO_URL", "mongodb://localhost:27017")
+DB_NAME = os.environ.get("BENCH_DB_NAME", "rental_marketplace_bench")
+
+
+@contextmanager
+def fresh_database():
+    """An empty benchmark database, dropped again afterwards; skips the test if mongod is not reachable"""
+    client = pymongo.MongoClient(MONGO_URL, serverSelectionTimeoutMS=2000)
+    try:
+        client.admin.command("ping")
+    except pymongo.errors.PyMongoError as exc:
+        pytest.skip(f"MongoDB not reachable at {MONGO_URL}: {exc}")
+
+    client.drop_database(DB_NAME)
+    try:
+        yield client[DB_NAME]
+    finally:
+        client.drop_database(DB_NAME)
+        client.close()
+
+
+def grow_to(collection, size, make_batch, batch_size):
+    """Insert make_batch(current, count) until the collection holds size documents"""
+    current = collection.estimated_document_count()
+    while current < size:
+        batch = make_batch(current, min(batch_size, size - current))
+        collection.insert_many(batch, ordered=False)
+        current += len(batch)
+
+
+def median_ms(run, repeats):
+    """p50 and p95 wall time of repeats calls to run, in ms"""
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        run()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        "p50": round(statistics.median(samples), 3),
+        "p95": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 3),
+    }
+
+
+def write_report(path, report):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2, default=str)
@@ -0,0 +1,191 @@
+"""
+Availability benchmark: "free between from and to" queries as booked and
+blocked intervals grow into the millions.
+
+Compares the unbounded overlap condition (start < to, end > from) with the
+windowed form used by backend/models/ListingAvailability.js, where pieces
+are at most MAX_PIECE_DAYS long so start is bounded on both sides. Measures
+a single-listing overlap probe and a first page of free listings, with and
+without type/price filters.
+
+Seeds its own MongoDB database, so it needs pymongo and a reachable mongod.
+Opt in with RUN_BENCHMARKS=1:
+
+    RUN_BENCHMARKS=1 python -m pytest tests/test_availability_benchmark.py -s
+
+Environment:
+    BENCH_MONGO_URL          default mongodb://localhost:27017
+    BENCH_DB_NAME            default rental_marketplace_bench
+    AVAIL_BENCH_LISTINGS     default 20000
+    AVAIL_BENCH_INTERVALS    default 100000,1000000,3000000
+    AVAIL_BENCH_REPEATS      default 20
+"""
+
+import os
+import json
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+pymongo = pytest.importorskip("pymongo")
+
+if not os.environ.get("RUN_BENCHMARKS"):
+    pytest.skip("set RUN_BENCHMARKS=1 to run benchmarks", allow_module_level=True)
+
+from tests.mongo_bench import fresh_database, grow_to, median_ms, write_report
+
+LISTINGS = int(os.environ.get("AVAIL_BENCH_LISTINGS", "20000"))
+SIZES = sorted(int(n) for n in os.environ.get("AVAIL_BENCH_INTERVALS", "100000,1000000,3000000").split(","))
+REPEATS = int(os.environ.get("AVAIL_BENCH_REPEATS", "20"))
+PAGE_SIZE = 20
+BATCH_SIZE = 10000
+
+# Same as MAX_PIECE_DAYS in backend/models/ListingAvailability.js
+MAX_PIECE_DAYS = 31
+
+EPOCH = datetime(2026, 1, 1)
+TYPES = ["room", "house", "lodge", "pg", "hostel", "apartment", "villa", "cottage", "farmhouse", "studio"]
+
+# (label, from offset in days from EPOCH, stay length in days)
+STAYS = [
+    ("weekend_next_month", 30, 2),
+    ("two_weeks_in_summer", 180, 14),
+    ("month_next_year", 400, 30),
+]
+
+REPORT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                           "test_reports", "availability_benchmark.json")
+
+
+def make_pieces(rng, listing_id):
+    """One booking or block spread over two years, split like ListingAvailability.split"""
+    start = EPOCH + timedelta(days=rng.uniform(-365, 365))
+    days = rng.choice([1, 2, 3, 5, 7, 7, 14, 30]) if rng.random() < 0.97 else rng.randint(60, 180)
+    end = start + timedelta(days=days)
+    range_id = rng.getrandbits(64)
+    pieces = []
+    while start < end:
+        piece_end = min(start + timedelta(days=MAX_PIECE_DAYS), end)
+        pieces.append({
+            "listingId": listing_id,
+            "rangeId": range_id,
+            "start": start,
+            "end": piece_end,
+            "kind": "booked" if rng.random() < 0.8 else "blocked",
+        })
+        start = piece_end
+    return pieces
+
+
+def unbounded(start, end):
+    return {"start": {"$lt": end}, "end": {"$gt": start}}
+
+
+def windowed(start, end):
+    return {"start": {"$gt": start - timedelta(days=MAX_PIECE_DAYS), "$lt": end}, "end": {"$gt": start}}
+
+
+def free_page_by_exclusion(db, start, end, query):
+    """Collect every busy listing first, then page the rest"""
+    busy = db.availability.distinct("listingId", unbounded(start, end))
+    return list(db.listings.find({**query, "_id": {"$nin": busy}}).sort([("createdAt", -1), ("_id", -1)]).limit(PAGE_SIZE))
+
+
+def free_page_by_probe(db, start, end, query):
+    """The GET /api/listings pipeline: walk the sorted listings, one windowed probe each"""
+    return list(db.listings.aggregate([
+        {"$match": query},
+        {"$sort": {"createdAt": -1, "_id": -1}},
+        {"$lookup": {
+            "from": "availability",
+            "localField": "_id",
+            "foreignField": "listingId",
+            "pipeline": [{"$match": windowed(start, end)}, {"$limit": 1}, {"$project": {"_id": 1}}],
+            "as": "busy",
+        }},
+        {"$match": {"busy": {"$size": 0}}},
+        {"$limit": PAGE_SIZE},
+    ]))
+
+
+@pytest.fixture(scope="module")
+def db():
+    with fresh_database() as database:
+        # Same indexes as backend/models/Listing.js and ListingAvailability.js declare
+        database.listings.create_index([("createdAt", -1), ("_id", -1)])
+        database.listings.create_index([("type", 1), ("createdAt", -1), ("_id", -1)])
+        database.availability.create_index([("listingId", 1), ("start", 1), ("end", 1)])
+
+        rng = random.Random(7)
+        listings = [{
+            "type": rng.choice(TYPES),
+            "price": rng.randint(300, 8000),
+            "status": "available",
+            "createdAt": EPOCH - timedelta(seconds=i),
+        } for i in range(LISTINGS)]
+        database.listings.insert_many(listings, ordered=False)
+
+        yield database
+
+
+def make_intervals(rng, listing_ids, count):
+    batch = []
+    while len(batch) < count:
+        batch.extend(make_pieces(rng, rng.choice(listing_ids)))
+    return batch
+
+
+def keys_examined(cursor_explain):
+    return cursor_explain["executionStats"]["totalKeysExamined"]
+
+
+def test_overlap_latency_by_interval_count(db):
+    rng = random.Random(11)
+    listing_ids = [doc["_id"] for doc in db.listings.find({}, {"_id": 1})]
+    probe_ids = rng.sample(listing_ids, 50)
+    filtered = {"type": "house", "price": {"$lte": 3000}}
+    report = {"listings": LISTINGS, "page_size": PAGE_SIZE, "repeats": REPEATS, "intervals": {}}
+
+    for size in SIZES:
+        grow_to(db.availability, size, lambda current, count: make_intervals(rng, listing_ids, count), BATCH_SIZE)
+        results = {}
+        for label, offset, days in STAYS:
+            start = EPOCH + timedelta(days=offset)
+            end = start + timedelta(days=days)
+            probe = lambda condition: [db.availability.find_one({"listingId": listing_id, **condition(start, end)},
+                                                                 {"_id": 1}) for listing_id in probe_ids]
+            results[label] = {
+                "probe_50_listings_unbounded_ms": median_ms(lambda: probe(unbounded), REPEATS),
+                "probe_50_listings_windowed_ms": median_ms(lambda: probe(windowed), REPEATS),
+                "free_page_exclusion_ms": median_ms(lambda: free_page_by_exclusion(db, start, end, {}), REPEATS),
+                "free_page_probe_ms": median_ms(lambda: free_page_by_probe(db, start, end, {}), REPEATS),
+                "filtered_page_exclusion_ms": median_ms(lambda: free_page_by_exclusion(db, start, end, filtered), REPEATS),
+                "filtered_page_probe_ms": median_ms(lambda: free_page_by_probe(db, start, end, filtered), REPEATS),
+            }
+        report["intervals"][str(size)] = results
+
+        print(f"\n{size:>9} intervals over {LISTINGS} listings")
+        for label, timings in results.items():
+            print(f"  {label:<20} probe x50 unbounded={timings['probe_50_listings_unbounded_ms']['p50']:>8.2f}ms "
+                  f"windowed={timings['probe_50_listings_windowed_ms']['p50']:>8.2f}ms  "
+                  f"page exclusion={timings['free_page_exclusion_ms']['p50']:>9.2f}ms "
+                  f"probe={timings['free_page_probe_ms']['p50']:>8.2f}ms")
+
+    # The windowed bound must keep a probe to the keys around the stay
+    start = EPOCH + timedelta(days=180)
+    end = start + timedelta(days=14)
+    busiest = next(db.availability.aggregate([
+        {"$group": {"_id": "$listingId", "n": {"$sum": 1}}}, {"$sort": {"n": -1}}, {"$limit": 1},
+    ]))["_id"]
+    plans = {
+        name: db.command("explain", {"find": "availability", "filter": {"listingId": busiest, **condition(start, end)}},
+                         verbosity="executionStats")
+        for name, condition in (("unbounded", unbounded), ("windowed", windowed))
+    }
+    report["busiest_listing_keys_examined"] = {name: keys_examined(plan) for name, plan in plans.items()}
+
+    write_report(REPORT_PATH, report)
+
+    assert "IXSCAN" in json.dumps(plans["windowed"], default=str)
+    assert keys_examined(plans["windowed"]) <= keys_examined(plans["unbounded"])
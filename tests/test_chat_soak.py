@@ -0,0 +1,61 @@
+"""
+Short chat soak through chat_soak.py: many Socket.IO clients with churn
+against a fresh backend/server.js.
+
+Checks that messages are delivered with low loss, that churned clients come
+back, and that the server holds no sockets or rooms once every client has
+left. Needs node, the backend's node_modules, a reachable MongoDB, requests
+and python-socketio[asyncio_client]. Opt in with RUN_BENCHMARKS=1:
+
+    RUN_BENCHMARKS=1 python -m pytest tests/test_chat_soak.py -s
+
+Run chat_soak.py directly for long soaks against a deployed node.
+
+Environment:
+    SOAK_CONVERSATIONS   default 100 (two clients each)
+    SOAK_SECONDS         default 60
+    SOAK_CHURN           default 0.2 (fraction of clients reconnecting per minute)
+    BENCH_DB_NAME        default rental_marketplace_bench
+"""
+
+import os
+
+import pytest
+
+requests = pytest.importorskip("requests")
+pytest.importorskip("socketio")
+pytest.importorskip("aiohttp")
+
+if not os.environ.get("RUN_BENCHMARKS"):
+    pytest.skip("set RUN_BENCHMARKS=1 to run benchmarks", allow_module_level=True)
+
+from chat_soak import run_soak
+from tests.backend_process import ROOT, free_port, start_backend, stop_backend, requires_node_backend
+
+pytestmark = requires_node_backend
+
+REPORT_PATH = os.path.join(ROOT, "test_reports", "chat_soak.json")
+
+CONVERSATIONS = int(os.environ.get("SOAK_CONVERSATIONS", "100"))
+SECONDS = float(os.environ.get("SOAK_SECONDS", "60"))
+CHURN = float(os.environ.get("SOAK_CHURN", "0.2"))
+DB_NAME = os.environ.get("BENCH_DB_NAME", "rental_marketplace_bench")
+
+
+def test_chat_soak_delivers_and_releases_rooms():
+    port = free_port()
+    process = start_backend(port, DB_NAME=DB_NAME)
+    try:
+        report = run_soak(f"http://127.0.0.1:{port}/api", conversations=CONVERSATIONS, duration=SECONDS,
+                          ramp=5, message_rate=1.0, typing_rate=1.0, churn=CHURN, sample_interval=5,
+                          output=REPORT_PATH)
+    finally:
+        stop_backend(process)
+
+    counters = report["counters"]
+    assert counters.get("delivered", 0) > 0
+    assert report["loss_rate"] <= 0.01
+    assert counters.get("connect_failures", 0) == 0
+    assert counters.get("reconnects", 0) >= counters.get("churned", 0) * 0.9
+    assert report["server"]["after_disconnect"]["clients"] == 0
+    assert report["server"]["after_disconnect"]["rooms"] == 0
@@ -0,0 +1,191 @@
+"""
+Chat throughput benchmark: Socket.IO messages per second and delivery latency
+through backend/socket.js.
+
+Each pair of a customer and an owner shares one conversation. The customer
+keeps CHAT_BENCH_WINDOW messages in flight, each preceded by a typing event,
+and the owner marks the conversation read on every delivery, the way
+ChatModal does. A message counts once the sender receives its own
+receiveMessage broadcast.
+
+With CHAT_BENCH_BASELINE_REF set, the same load also runs against that
+revision of the backend (checked out in a temporary git worktree sharing
+backend/node_modules) and the speedup is asserted to be at least
+CHAT_BENCH_MIN_SPEEDUP. Users and conversations are created through the
+current tree first and reused, so both runs see the same data.
+
+Needs node, the backend's node_modules, a reachable MongoDB, requests and
+python-socketio[asyncio_client]. Opt in with RUN_BENCHMARKS=1:
+
+    RUN_BENCHMARKS=1 CHAT_BENCH_BASELINE_REF=ddbf218 python -m pytest tests/test_chat_throughput_benchmark.py -s
+
+Environment:
+    CHAT_BENCH_PAIRS          default 50 (conversations, two sockets each)
+    CHAT_BENCH_WINDOW         default 8 (messages in flight per sender)
+    CHAT_BENCH_SECONDS        default 15
+    CHAT_BENCH_BASELINE_REF   git revision to compare with, default none
+    CHAT_BENCH_MIN_SPEEDUP    default 5
+    BENCH_DB_NAME             default rental_marketplace_bench
+"""
+
+import os
+import json
+import time
+import shutil
+import asyncio
+import tempfile
+import subprocess
+
+import pytest
+
+requests = pytest.importorskip("requests")
+socketio = pytest.importorskip("socketio")
+pytest.importorskip("aiohttp")
+
+if not os.environ.get("RUN_BENCHMARKS"):
+    pytest.skip("set RUN_BENCHMARKS=1 to run benchmarks", allow_module_level=True)
+
+from api_client import ApiClient
+from backend_test import percentile
+from chat_soak import create_conversations
+from tests.backend_process import ROOT, BACKEND_DIR, free_port, start_backend, stop_backend, requires_node_backend
+
+pytestmark = requires_node_backend
+
+REPORT_PATH = os.path.join(ROOT, "test_reports", "chat_throughput.json")
+
+PAIRS = int(os.environ.get("CHAT_BENCH_PAIRS", "50"))
+WINDOW = int(os.environ.get("CHAT_BENCH_WINDOW", "8"))
+SECONDS = float(os.environ.get("CHAT_BENCH_SECONDS", "15"))
+BASELINE_REF = os.environ.get("CHAT_BENCH_BASELINE_REF")
+MIN_SPEEDUP = float(os.environ.get("CHAT_BENCH_MIN_SPEEDUP", "5"))
+DB_NAME = os.environ.get("BENCH_DB_NAME", "rental_marketplace_bench")
+
+
+async def connect(url, token, conversation_id):
+    client = socketio.AsyncClient(reconnection=False)
+    await client.connect(url, auth={"token": token}, transports=["websocket"])
+    await client.emit("joinConversation", conversation_id)
+    return client
+
+
+async def run_pair(url, pair, deadline, latencies, errors):
+    conversation_id, owner_id = pair["conversationId"], pair["ownerId"]
+    customer_token, owner_token = pair["customerToken"], pair["ownerToken"]
+    customer = await connect(url, customer_token, conversation_id)
+    owner = await connect(url, owner_token, conversation_id)
+    sent_at = {}
+    in_flight = asyncio.Semaphore(WINDOW)
+
+    @customer.on("receiveMessage")
+    async def delivered(message):
+        started = sent_at.pop(message.get("messageText"), None)
+        if started is not None:
+            latencies.append((time.perf_counter() - started) * 1000)
+            in_flight.release()
+
+    @customer.on("error")
+    async def failed(data):
+        errors.append(data)
+
+    @owner.on("receiveMessage")
+    async def read(message):
+        await owner.emit("markAsRead", {"conversationId": conversation_id})
+
+    # Let both joins land before the first message
+    await asyncio.sleep(0.5)
+    try:
+        seq = 0
+        while time.perf_counter() < deadline:
+            try:
+                await asyncio.wait_for(in_flight.acquire(), timeout=max(0.01, deadline - time.perf_counter()))
+            except asyncio.TimeoutError:
+                break
+            seq += 1
+            text = f"{conversation_id}:{seq}"
+            await customer.emit("typing", {"conversationId": conversation_id, "isTyping": True})
+            sent_at[text] = time.perf_counter()
+            await customer.emit("sendMessage", {"conversationId": conversation_id, "receiverId": owner_id,
+                                                "messageText": text})
+        return seq
+    finally:
+        await customer.disconnect()
+        await owner.disconnect()
+
+
+async def drive(url, pairs):
+    latencies, errors = [], []
+    started = time.perf_counter()
+    deadline = started + SECONDS
+    sent = await asyncio.gather(*(run_pair(url, pair, deadline, latencies, errors) for pair in pairs))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "sent": sum(sent),
+        "delivered": len(latencies),
+        "errors": len(errors),
+        "messages_per_second": round(len(latencies) / elapsed, 2),
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+    }
+
+
+def baseline_checkout(ref):
+    """Detached worktree of ref whose backend shares this tree's node_modules"""
+    path = tempfile.mkdtemp(prefix="chat-baseline-")
+    subprocess.run(["git", "worktree", "add", "--detach", path, ref], cwd=ROOT, check=True,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    os.symlink(os.path.join(BACKEND_DIR, "node_modules"), os.path.join(path, "backend", "node_modules"))
+    return path
+
+
+def remove_checkout(path):
+    subprocess.run(["git", "worktree", "remove", "--force", path], cwd=ROOT,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    shutil.rmtree(path, ignore_errors=True)
+
+
+def run_mode(backend_dir, pairs=None):
+    port = free_port()
+    process = start_backend(port, backend_dir=backend_dir, DB_NAME=DB_NAME)
+    client = ApiClient(f"http://127.0.0.1:{port}/api", retries=0)
+    try:
+        pairs = pairs or create_conversations(client, PAIRS)
+        return pairs, asyncio.run(drive(f"http://127.0.0.1:{port}", pairs))
+    finally:
+        client.close()
+        stop_backend(process)
+
+
+def test_chat_message_throughput():
+    report = {"pairs": PAIRS, "window": WINDOW, "seconds": SECONDS, "modes": {}}
+
+    pairs, report["modes"]["current"] = run_mode(BACKEND_DIR)
+    if BASELINE_REF:
+        checkout = baseline_checkout(BASELINE_REF)
+        try:
+            _, report["modes"]["baseline"] = run_mode(os.path.join(checkout, "backend"), pairs)
+        finally:
+            remove_checkout(checkout)
+        report["baseline_ref"] = BASELINE_REF
+
+    for mode, result in report["modes"].items():
+        print(f"\n{mode:>9}: {result['messages_per_second']:>8.1f} msg/s  "
+              f"p50={result['p50_ms']:.1f}ms p95={result['p95_ms']:.1f}ms p99={result['p99_ms']:.1f}ms  "
+              f"errors={result['errors']}")
+
+    baseline = report["modes"].get("baseline")
+    if baseline and baseline["messages_per_second"]:
+        report["speedup"] = round(report["modes"]["current"]["messages_per_second"] / baseline["messages_per_second"], 2)
+        print(f"  speedup x{report['speedup']}")
+
+    os.makedirs(os.path.dirname(REPORT_PATH), exist_ok=True)
+    with open(REPORT_PATH, "w") as f:
+        json.dump(report, f, indent=2)
+
+    current = report["modes"]["current"]
+    assert current["delivered"] > 0
+    assert current["errors"] == 0
+    if baseline:
+        assert report.get("speedup", float("inf")) >= MIN_SPEEDUP
@@ -0,0 +1,76 @@
+"""
+Throughput scaling of the clustered backend (backend/cluster.js) with worker count.
+
+Starts the backend once per worker count with WEB_CONCURRENCY set, drives it
+with the backend_test.py load scenario at an unbounded request rate and records
+overall throughput and latency per run. Needs node, the backend's node_modules,
+a reachable MongoDB and the requests package. Opt in with RUN_BENCHMARKS=1:
+
+    RUN_BENCHMARKS=1 python -m pytest tests/test_cluster_scaling_benchmark.py -s
+
+Environment:
+    CLUSTER_BENCH_WORKERS   default 1,2,4 (capped at the CPU count)
+    CLUSTER_BENCH_USERS     default 64
+    CLUSTER_BENCH_DURATION  default 15 (seconds per worker count)
+    BENCH_DB_NAME           default rental_marketplace_bench
+"""
+
+import os
+import json
+import asyncio
+
+import pytest
+
+requests = pytest.importorskip("requests")
+
+if not os.environ.get("RUN_BENCHMARKS"):
+    pytest.skip("set RUN_BENCHMARKS=1 to run benchmarks", allow_module_level=True)
+
+from backend_test import LoadGenerator
+from tests.backend_process import ROOT, free_port, start_backend, stop_backend, requires_node_backend
+
+pytestmark = requires_node_backend
+
+REPORT_PATH = os.path.join(ROOT, "test_reports", "cluster_scaling.json")
+
+CPU_COUNT = os.cpu_count() or 1
+WORKER_COUNTS = sorted({
+    min(int(n), CPU_COUNT)
+    for n in os.environ.get("CLUSTER_BENCH_WORKERS", "1,2,4").split(",")
+})
+USERS = int(os.environ.get("CLUSTER_BENCH_USERS", "64"))
+DURATION = float(os.environ.get("CLUSTER_BENCH_DURATION", "15"))
+DB_NAME = os.environ.get("BENCH_DB_NAME", "rental_marketplace_bench")
+
+
+def test_throughput_scales_with_workers():
+    report = {"cpu_count": CPU_COUNT, "users": USERS, "duration_seconds": DURATION, "runs": {}}
+
+    for workers in WORKER_COUNTS:
+        port = free_port()
+        process = start_backend(port, "cluster.js", WEB_CONCURRENCY=workers, DB_NAME=DB_NAME)
+        try:
+            generator = LoadGenerator(USERS, 0, DURATION, api_url=f"http://127.0.0.1:{port}/api")
+            result = asyncio.run(generator.run())
+        finally:
+            stop_backend(process)
+
+        overall = result["overall"]
+        report["runs"][str(workers)] = {
+            "throughput_rps": overall["throughput_rps"],
+            "error_rate": overall["error_rate"],
+            "latency_ms": overall["latency_ms"],
+        }
+        print(f"\n{workers:>3} workers: {overall['throughput_rps']:>9.1f} req/s  "
+              f"p50={overall['latency_ms']['p50']:.1f}ms p99={overall['latency_ms']['p99']:.1f}ms  "
+              f"errors={overall['error_rate']:.2%}")
+
+    baseline = report["runs"][str(WORKER_COUNTS[0])]["throughput_rps"]
+    for run in report["runs"].values():
+        run["speedup"] = round(run["throughput_rps"] / baseline, 2) if baseline else 0.0
+
+    os.makedirs(os.path.dirname(REPORT_PATH), exist_ok=True)
+    with open(REPORT_PATH, "w") as f:
+        json.dump(report, f, indent=2)
+
+    assert all(run["throughput_rps"] > 0 for run in report["runs"].values())
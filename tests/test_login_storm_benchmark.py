@@ -0,0 +1,129 @@
+"""
+Login storm benchmark: /api/auth/login throughput and the tail latency of
+concurrent GET /api/listings while bcrypt runs inline on the event loop
+(PASSWORD_HASH_WORKERS=0, the old behaviour) versus on the worker pool.
+
+Starts backend/server.js once per mode. Each mode first measures listing reads
+alone, then the same reads during a burst of logins. Needs node, the
+backend's node_modules, a reachable MongoDB and the requests package. Opt in
+with RUN_BENCHMARKS=1:
+
+    RUN_BENCHMARKS=1 python -m pytest tests/test_login_storm_benchmark.py -s
+
+Environment:
+    LOGIN_STORM_USERS     default 32 (concurrent login loops, one user each)
+    LOGIN_STORM_READERS   default 8 (concurrent listing readers)
+    LOGIN_STORM_SECONDS   default 10 (per phase)
+    LOGIN_STORM_WORKERS   pool size for the worker mode, default the server default
+    BENCH_DB_NAME         default rental_marketplace_bench
+"""
+
+import os
+import json
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+requests = pytest.importorskip("requests")
+
+if not os.environ.get("RUN_BENCHMARKS"):
+    pytest.skip("set RUN_BENCHMARKS=1 to run benchmarks", allow_module_level=True)
+
+from api_client import ApiClient, UserNamespace
+from backend_test import percentile
+from tests.backend_process import ROOT, free_port, start_backend, stop_backend, requires_node_backend
+
+pytestmark = requires_node_backend
+
+REPORT_PATH = os.path.join(ROOT, "test_reports", "login_storm.json")
+
+USERS = int(os.environ.get("LOGIN_STORM_USERS", "32"))
+READERS = int(os.environ.get("LOGIN_STORM_READERS", "8"))
+SECONDS = float(os.environ.get("LOGIN_STORM_SECONDS", "10"))
+DB_NAME = os.environ.get("BENCH_DB_NAME", "rental_marketplace_bench")
+
+MODES = {
+    "inline": {"PASSWORD_HASH_WORKERS": 0},
+    "worker_pool": {"PASSWORD_HASH_WORKERS": os.environ["LOGIN_STORM_WORKERS"]}
+    if os.environ.get("LOGIN_STORM_WORKERS") else {},
+}
+
+
+def hammer(client, method, endpoint, body, deadline):
+    """Repeat one request until the deadline, returning latencies (ms) and status counts"""
+    latencies, statuses = [], Counter()
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            status = client.request(method, endpoint, body).status_code
+        except requests.RequestException:
+            status = None
+        latencies.append((time.perf_counter() - start) * 1000)
+        statuses[status] += 1
+    return latencies, statuses
+
+
+def run_phase(client, credentials):
+    """Listing readers, plus one login loop per credential, for SECONDS"""
+    deadline = time.perf_counter() + SECONDS
+    with ThreadPoolExecutor(max_workers=READERS + len(credentials)) as pool:
+        readers = [pool.submit(hammer, client, "GET", "/listings?limit=20", None, deadline) for _ in range(READERS)]
+        logins = [pool.submit(hammer, client, "POST", "/auth/login", user, deadline) for user in credentials]
+        return summarize(readers), summarize(logins)
+
+
+def summarize(futures):
+    latencies, statuses = [], Counter()
+    for future in futures:
+        samples, counts = future.result()
+        latencies.extend(samples)
+        statuses.update(counts)
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "throughput_rps": round(statuses[200] / SECONDS, 2),
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+        "status_codes": {str(code): count for code, count in statuses.items()},
+    }
+
+
+def test_login_storm_does_not_stall_reads():
+    report = {"users": USERS, "readers": READERS, "phase_seconds": SECONDS, "modes": {}}
+
+    for mode, env in MODES.items():
+        port = free_port()
+        process = start_backend(port, DB_NAME=DB_NAME, **env)
+        client = ApiClient(f"http://127.0.0.1:{port}/api", retries=0)
+        try:
+            namespace = UserNamespace()
+            credentials = []
+            for index in range(USERS):
+                user = namespace.user("storm", f"Storm User {index}", "stormtest123", index)
+                assert client.request("POST", "/auth/register", user).status_code == 201
+                credentials.append({"email": user["email"], "password": user["password"]})
+
+            idle_reads, _ = run_phase(client, [])
+            storm_reads, logins = run_phase(client, credentials)
+        finally:
+            client.close()
+            stop_backend(process)
+
+        report["modes"][mode] = {"env": env, "reads_idle": idle_reads, "reads_during_storm": storm_reads, "logins": logins}
+        print(f"\n{mode:>12}: logins {logins['throughput_rps']:>7.1f}/s p99={logins['p99_ms']:.0f}ms  "
+              f"reads p99 idle={idle_reads['p99_ms']:.1f}ms storm={storm_reads['p99_ms']:.1f}ms")
+
+    inline, pooled = report["modes"]["inline"], report["modes"]["worker_pool"]
+    report["read_p99_during_storm_ratio"] = round(
+        pooled["reads_during_storm"]["p99_ms"] / inline["reads_during_storm"]["p99_ms"], 3
+    ) if inline["reads_during_storm"]["p99_ms"] else None
+
+    os.makedirs(os.path.dirname(REPORT_PATH), exist_ok=True)
+    with open(REPORT_PATH, "w") as f:
+        json.dump(report, f, indent=2)
+
+    for result in report["modes"].values():
+        assert result["logins"]["status_codes"].get("200", 0) > 0
+        assert result["reads_during_storm"]["status_codes"].get("200", 0) > 0
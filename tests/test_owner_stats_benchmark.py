@@ -0,0 +1,190 @@
+"""
+Owner dashboard benchmark: correctness of the GET /api/owner/stats counters
+and their read cost for a large portfolio.
+
+One owner imports OWNER_STATS_LISTINGS listings, marks some rented, deletes
+one, and gets reviews and conversations from a few customers, who each send
+two messages over REST; the owner answers some and reads others. The counters
+must match what was done and must not change when
+backend/scripts/rebuildOwnerStats.js recomputes them. Reading them must cost
+about the same as for an owner with a single listing (p50 within
+OWNER_STATS_MAX_SLOWDOWN); the listing fetch the dashboard used to count
+listings with, capped at 100, is reported alongside. Needs node, the
+backend's node_modules, a reachable MongoDB and the requests package. Opt in
+with RUN_BENCHMARKS=1:
+
+    RUN_BENCHMARKS=1 python -m pytest tests/test_owner_stats_benchmark.py -s
+
+Environment:
+    OWNER_STATS_LISTINGS      default 2000
+    OWNER_STATS_CUSTOMERS     default 6
+    OWNER_STATS_REQUESTS      default 50 (timed reads per endpoint)
+    OWNER_STATS_MAX_SLOWDOWN  default 2
+    BENCH_DB_NAME             default rental_marketplace_bench
+"""
+
+import os
+import json
+import time
+import subprocess
+
+import pytest
+
+requests = pytest.importorskip("requests")
+
+if not os.environ.get("RUN_BENCHMARKS"):
+    pytest.skip("set RUN_BENCHMARKS=1 to run benchmarks", allow_module_level=True)
+
+from api_client import ApiClient, UserNamespace
+from backend_test import percentile, SAMPLE_LISTING
+from tests.backend_process import ROOT, BACKEND_DIR, free_port, start_backend, stop_backend, requires_node_backend
+
+pytestmark = requires_node_backend
+
+REPORT_PATH = os.path.join(ROOT, "test_reports", "owner_stats.json")
+
+LISTINGS = int(os.environ.get("OWNER_STATS_LISTINGS", "2000"))
+CUSTOMERS = int(os.environ.get("OWNER_STATS_CUSTOMERS", "6"))
+REQUESTS = int(os.environ.get("OWNER_STATS_REQUESTS", "50"))
+MAX_SLOWDOWN = float(os.environ.get("OWNER_STATS_MAX_SLOWDOWN", "2"))
+DB_NAME = os.environ.get("BENCH_DB_NAME", "rental_marketplace_bench")
+
+# Short write-behind windows so the chat counters land quickly
+SERVER_ENV = {"DB_NAME": DB_NAME, "CHAT_FLUSH_MS": 20, "CHAT_READ_WINDOW_MS": 20, "OWNER_STATS_FLUSH_MS": 50}
+SETTLE_SECONDS = 0.5
+
+
+def register(client, namespace, kind, index, role):
+    user = namespace.user(f"stats.{kind}", f"Stats {kind.title()} {index}", "statspass123", index)
+    response = client.request('POST', '/auth/register', user)
+    assert response.status_code == 201, response.text[:200]
+    body = response.json()
+    headers = {'Authorization': f"Bearer {body['token']}"}
+    client.request('POST', '/user/select-role', {'role': role}, headers)
+    return body['user'], headers
+
+
+def create_owner(client, api_url, namespace, index, listings):
+    """An owner with a profile and listings imported in one request"""
+    owner, owner_headers = register(client, namespace, 'owner', index, 'OWNER')
+    client.request('POST', '/owner/profile', {'contactNumber': '+1-555-0100'}, owner_headers)
+
+    rows = "".join(json.dumps(dict(SAMPLE_LISTING, title=f"Stats listing {i}")) + "\n" for i in range(listings))
+    response = client.session.post(f"{api_url}/owner/listings/import", data=rows.encode(), timeout=120,
+                                   headers={**owner_headers, 'Content-Type': 'application/x-ndjson'})
+    assert response.status_code == 200 and response.json()['inserted'] == listings, response.text[:200]
+    return owner['id'], owner_headers
+
+
+def build_portfolio(client, api_url, namespace):
+    """Owner activity through the API; returns the owner and the expected counters"""
+    owner_id, owner_headers = create_owner(client, api_url, namespace, 0, LISTINGS)
+
+    response = client.request('GET', f'/listings?ownerId={owner_id}&limit={CUSTOMERS + 3}')
+    listing_ids = [listing['_id'] for listing in response.json()['listings']]
+    for listing_id in listing_ids[-2:]:
+        client.request('PUT', f'/listings/{listing_id}', {'status': 'rented'}, owner_headers)
+    client.request('DELETE', f'/listings/{listing_ids[0]}', None, owner_headers)
+
+    ratings = []
+    unread = 0
+    replies = 0
+    for index in range(CUSTOMERS):
+        _, customer_headers = register(client, namespace, 'customer', index, 'CUSTOMER')
+        listing_id = listing_ids[1 + index % (len(listing_ids) - 3)]
+        rating = 1 + index % 5
+        response = client.request('POST', '/reviews', {'listingId': listing_id, 'rating': rating}, customer_headers)
+        assert response.status_code == 201, response.text[:200]
+        ratings.append(rating)
+
+        response = client.request('POST', '/conversations', {'listingId': listing_id, 'ownerId': owner_id},
+                                  customer_headers)
+        conversation_id = response.json()['conversation']['_id']
+        for text in ("Is it still available?", "When can I visit?"):
+            client.request('POST', '/messages', {'conversationId': conversation_id, 'messageText': text},
+                           customer_headers)
+        if index % 2 == 0:
+            time.sleep(SETTLE_SECONDS)
+            client.request('POST', '/messages', {'conversationId': conversation_id, 'messageText': "Yes, any day"},
+                           owner_headers)
+            replies += 1
+        if index % 3 == 0:
+            client.request('PUT', f'/conversations/{conversation_id}/read', None, owner_headers)
+        else:
+            unread += 2
+
+    expected = {
+        'listings': {'total': LISTINGS - 1, 'byStatus': {'available': LISTINGS - 3, 'rented': 2, 'unavailable': 0}},
+        'reviews': {'count': len(ratings), 'averageRating': round(sum(ratings) / len(ratings), 2)},
+        'conversations': {'total': CUSTOMERS},
+        'messages': {'unread': unread},
+        'replies': replies,
+    }
+    return owner_id, owner_headers, expected
+
+
+def counters(client, headers):
+    stats = client.request('GET', '/owner/stats', None, headers).json()['stats']
+    return {
+        'listings': stats['listings'],
+        'reviews': stats['reviews'],
+        'conversations': stats['conversations'],
+        'messages': stats['messages'],
+        'replies': stats['responseTime']['replies'],
+        'averageResponseMs': stats['responseTime']['averageMs'],
+    }
+
+
+def timed(client, endpoint, headers=None):
+    latencies = []
+    for _ in range(REQUESTS):
+        started = time.perf_counter()
+        response = client.request('GET', endpoint, None, headers)
+        latencies.append((time.perf_counter() - started) * 1000)
+        assert response.status_code == 200
+    latencies.sort()
+    return {"p50_ms": round(percentile(latencies, 50), 2), "p95_ms": round(percentile(latencies, 95), 2)}
+
+
+def test_owner_stats_counters_and_read_cost():
+    port = free_port()
+    api_url = f"http://127.0.0.1:{port}/api"
+    process = start_backend(port, **SERVER_ENV)
+    client = ApiClient(api_url, retries=0)
+    namespace = UserNamespace()
+    try:
+        owner_id, owner_headers, expected = build_portfolio(client, api_url, namespace)
+        _, small_headers = create_owner(client, api_url, namespace, 1, 1)
+        time.sleep(SETTLE_SECONDS)
+        live = counters(client, owner_headers)
+
+        report = {
+            "listings": LISTINGS,
+            "stats": timed(client, '/owner/stats', owner_headers),
+            "stats_single_listing": timed(client, '/owner/stats', small_headers),
+            # What the dashboard fetched before, only to count the listings
+            "listing_fetch": timed(client, f'/listings?ownerId={owner_id}&limit=100'),
+        }
+        report["slowdown"] = round(report["stats"]["p50_ms"] / max(report["stats_single_listing"]["p50_ms"], 0.01), 2)
+
+        started = time.perf_counter()
+        subprocess.run(["node", "scripts/rebuildOwnerStats.js"], cwd=BACKEND_DIR, check=True,
+                       env=dict(os.environ, DB_NAME=DB_NAME), stdout=subprocess.DEVNULL)
+        report["rebuild_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        rebuilt = counters(client, owner_headers)
+    finally:
+        client.close()
+        stop_backend(process)
+
+    report.update({"expected": expected, "live": live, "rebuilt": rebuilt})
+    print(f"\n  stats p50={report['stats']['p50_ms']}ms (single listing {report['stats_single_listing']['p50_ms']}ms)  "
+          f"listing fetch p50={report['listing_fetch']['p50_ms']}ms  rebuild={report['rebuild_ms']}ms")
+
+    os.makedirs(os.path.dirname(REPORT_PATH), exist_ok=True)
+    with open(REPORT_PATH, "w") as f:
+        json.dump(report, f, indent=2)
+
+    assert {key: live[key] for key in expected} == expected
+    assert live['averageResponseMs'] >= SETTLE_SECONDS * 1000
+    assert rebuilt == live
+    assert report["slowdown"] <= MAX_SLOWDOWN
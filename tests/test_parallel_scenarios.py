@@ -0,0 +1,43 @@
+"""
+Concurrency correctness of the backend, driven by scenario_runner.py.
+
+Runs the owner/customer scenario many times in parallel against a running
+backend, each run with its own users, including a duplicate-review race on
+the unique {listingId, userId} index. Opt in with RUN_INTEGRATION=1:
+
+    RUN_INTEGRATION=1 python -m pytest tests/test_parallel_scenarios.py
+
+Environment:
+    SCENARIO_PARALLEL    default 8
+    SCENARIO_ITERATIONS  default 32
+    SCENARIO_RACE        default 8 (simultaneous duplicate reviews)
+"""
+
+import os
+
+import pytest
+
+requests = pytest.importorskip("requests")
+
+if not os.environ.get("RUN_INTEGRATION"):
+    pytest.skip("set RUN_INTEGRATION=1 to run against a live backend", allow_module_level=True)
+
+from api_client import API_URL
+from scenario_runner import run_scenarios
+
+PARALLEL = int(os.environ.get("SCENARIO_PARALLEL", "8"))
+ITERATIONS = int(os.environ.get("SCENARIO_ITERATIONS", "32"))
+RACE = int(os.environ.get("SCENARIO_RACE", "8"))
+
+
+@pytest.fixture(scope="module", autouse=True)
+def backend():
+    try:
+        requests.get(API_URL, timeout=2)
+    except requests.RequestException as exc:
+        pytest.skip(f"backend not reachable at {API_URL}: {exc}")
+
+
+def test_parallel_scenarios_are_isolated_and_consistent():
+    summary = run_scenarios(PARALLEL, ITERATIONS, RACE)
+    assert summary["failed"] == 0, summary["failures"]
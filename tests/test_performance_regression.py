@@ -0,0 +1,207 @@
+"""
+Performance regression suite for the backend API.
+
+Turns the backend_test.py scenarios into parametrized latency cases against a
+running backend. Each case is warmed up, then measured PERF_REPEATS times over
+a keep-alive session. Results go to test_reports/perf_results.json. A case
+fails when its p50 or p95 exceeds the stored baseline in
+test_reports/perf_baseline.json by more than the threshold. Cases without a
+baseline are recorded and pass. Opt in with RUN_BENCHMARKS=1:
+
+    RUN_BENCHMARKS=1 python -m pytest tests/test_performance_regression.py -s
+    RUN_BENCHMARKS=1 PERF_UPDATE_BASELINE=1 python -m pytest tests/test_performance_regression.py
+
+Environment:
+    PERF_API_URL          default backend_test.API_URL
+    PERF_WARMUP           default 5 requests per case
+    PERF_REPEATS          default 50 measured requests per case
+    PERF_THRESHOLD        default 0.25 (fractional slowdown tolerated)
+    PERF_MIN_DELTA_MS     default 2 (absolute slowdown always tolerated)
+    PERF_UPDATE_BASELINE  set to 1 to overwrite the baseline with this run
+"""
+
+import os
+import json
+import time
+import uuid
+from collections import namedtuple
+
+import pytest
+
+requests = pytest.importorskip("requests")
+
+if not os.environ.get("RUN_BENCHMARKS"):
+    pytest.skip("set RUN_BENCHMARKS=1 to run benchmarks", allow_module_level=True)
+
+from backend_test import API_URL, SAMPLE_LISTING, percentile
+
+PERF_API_URL = os.environ.get("PERF_API_URL", API_URL)
+WARMUP = int(os.environ.get("PERF_WARMUP", "5"))
+REPEATS = int(os.environ.get("PERF_REPEATS", "50"))
+THRESHOLD = float(os.environ.get("PERF_THRESHOLD", "0.25"))
+MIN_DELTA_MS = float(os.environ.get("PERF_MIN_DELTA_MS", "2"))
+UPDATE_BASELINE = bool(os.environ.get("PERF_UPDATE_BASELINE"))
+
+REPORTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "test_reports")
+BASELINE_PATH = os.path.join(REPORTS_DIR, "perf_baseline.json")
+RESULTS_PATH = os.path.join(REPORTS_DIR, "perf_results.json")
+
+# Percentiles compared against the baseline
+GATED = ("p50", "p95")
+
+# path is formatted with the scenario context, role picks the auth headers and
+# body names the scenario entry sent as the JSON body
+Case = namedtuple("Case", "name method path role body expected_status")
+Case.__new__.__defaults__ = (None, None, 200)
+
+CASES = [
+    Case("health", "GET", "/"),
+    Case("login", "POST", "/auth/login", body="customer_credentials"),
+    Case("listings_page", "GET", "/listings"),
+    Case("listings_page_projected", "GET", "/listings?fields=title,price,type&limit=50"),
+    Case("listings_by_owner", "GET", "/listings?ownerId={owner_id}"),
+    Case("listings_search", "GET", "/listings?search=Downtown"),
+    Case("listings_near", "GET", "/listings?near=40.7128,-74.0060&radiusKm=10"),
+    Case("listings_top_rated", "GET", "/listings?sort=rating&minRating=4"),
+    Case("listings_available", "GET", "/listings?from=2026-08-01&to=2026-08-15"),
+    Case("listings_suggest", "GET", "/listings/suggest?q=down"),
+    Case("listings_facets", "GET", "/listings/facets"),
+    Case("listings_facets_filtered", "GET", "/listings/facets?type=house,apartment&maxPrice=3000"),
+    Case("listing_detail", "GET", "/listings/{listing_id}"),
+    Case("listing_similar", "GET", "/listings/{listing_id}/similar"),
+    Case("listing_reviews", "GET", "/reviews/listing/{listing_id}"),
+    Case("owner_profile", "GET", "/owner/profile", role="owner"),
+    Case("customer_conversations", "GET", "/conversations", role="customer"),
+]
+
+
+def _register(session, kind, run_id, role):
+    credentials = {
+        "name": f"Perf {kind.title()}",
+        "email": f"perf.{kind}.{run_id}@rentease.com",
+        "password": "perftest123",
+    }
+    response = session.post(f"{PERF_API_URL}/auth/register", json=credentials, timeout=10)
+    assert response.status_code == 201, f"register {kind}: {response.status_code} {response.text[:200]}"
+    headers = {"Authorization": f"Bearer {response.json()['token']}"}
+    response = session.post(f"{PERF_API_URL}/user/select-role", json={"role": role}, headers=headers, timeout=10)
+    assert response.status_code == 200, f"select role {role}: {response.status_code}"
+    return credentials, headers, response.json()["user"]["id"]
+
+
+@pytest.fixture(scope="module")
+def scenario():
+    """Owner with a profile and a reviewed listing, plus a customer, all uniquely named"""
+    session = requests.Session()
+    try:
+        session.get(f"{PERF_API_URL}/", timeout=2)
+    except requests.RequestException as exc:
+        pytest.skip(f"backend not reachable at {PERF_API_URL}: {exc}")
+
+    run_id = uuid.uuid4().hex[:8]
+    _, owner_headers, owner_id = _register(session, "owner", run_id, "OWNER")
+    customer_credentials, customer_headers, _ = _register(session, "customer", run_id, "CUSTOMER")
+
+    session.post(f"{PERF_API_URL}/owner/profile", headers=owner_headers, timeout=10,
+                 json={"contactNumber": "1234567890", "description": "Performance suite owner"})
+    response = session.post(f"{PERF_API_URL}/listings", headers=owner_headers, timeout=10,
+                            json=dict(SAMPLE_LISTING, title=f"{SAMPLE_LISTING['title']} #{run_id}"))
+    assert response.status_code == 201, f"create listing: {response.status_code} {response.text[:200]}"
+    listing = response.json()["listing"]
+    session.post(f"{PERF_API_URL}/reviews", headers=customer_headers, timeout=10,
+                 json={"listingId": listing["_id"], "rating": 5, "comment": "Performance suite review"})
+
+    yield {
+        "session": session,
+        "headers": {"owner": owner_headers, "customer": customer_headers},
+        "owner_id": owner_id,
+        "listing_id": listing["_id"],
+        "customer_credentials": {k: customer_credentials[k] for k in ("email", "password")},
+    }
+    session.close()
+
+
+@pytest.fixture(scope="module")
+def results():
+    """Collects every case's measurements, then writes the report and optionally the baseline"""
+    collected = {}
+    yield collected
+
+    report = {
+        "api_url": PERF_API_URL,
+        "warmup": WARMUP,
+        "repeats": REPEATS,
+        "threshold": THRESHOLD,
+        "min_delta_ms": MIN_DELTA_MS,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "cases": collected,
+    }
+    os.makedirs(REPORTS_DIR, exist_ok=True)
+    with open(RESULTS_PATH, "w") as f:
+        json.dump(report, f, indent=2)
+
+    baseline = load_baseline()
+    if UPDATE_BASELINE or not baseline:
+        baseline = {"created_at": report["created_at"], "api_url": PERF_API_URL, "cases": {}}
+    for name, measured in collected.items():
+        if UPDATE_BASELINE or name not in baseline["cases"]:
+            baseline["cases"][name] = measured["latency_ms"]
+    with open(BASELINE_PATH, "w") as f:
+        json.dump(baseline, f, indent=2)
+
+
+def load_baseline():
+    try:
+        with open(BASELINE_PATH) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def measure(session, method, url, headers, body, expected_status):
+    def call():
+        start = time.perf_counter()
+        response = session.request(method, url, json=body, headers=headers, timeout=10)
+        elapsed = (time.perf_counter() - start) * 1000
+        assert response.status_code == expected_status, \
+            f"{method} {url} -> {response.status_code}: {response.text[:200]}"
+        return elapsed
+
+    for _ in range(WARMUP):
+        call()
+    samples = sorted(call() for _ in range(REPEATS))
+    return {
+        "min": round(samples[0], 3),
+        "mean": round(sum(samples) / len(samples), 3),
+        "p50": round(percentile(samples, 50), 3),
+        "p95": round(percentile(samples, 95), 3),
+        "p99": round(percentile(samples, 99), 3),
+        "max": round(samples[-1], 3),
+    }
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("case", CASES, ids=lambda case: case.name)
+def test_endpoint_latency(case, scenario, results):
+    path = case.path.format(**scenario)
+    body = scenario[case.body] if case.body else None
+    headers = scenario["headers"].get(case.role)
+
+    latency = measure(scenario["session"], case.method, f"{PERF_API_URL}{path}", headers, body, case.expected_status)
+    entry = {"method": case.method, "path": case.path, "latency_ms": latency}
+    results[case.name] = entry
+    print(f"\n  {case.name:<26} p50={latency['p50']:>8.2f}ms  p95={latency['p95']:>8.2f}ms  "
+          f"p99={latency['p99']:>8.2f}ms")
+
+    baseline = load_baseline()
+    reference = (baseline or {}).get("cases", {}).get(case.name)
+    if UPDATE_BASELINE or not reference:
+        return
+
+    regressions = []
+    for stat in GATED:
+        limit = reference[stat] * (1 + THRESHOLD) + MIN_DELTA_MS
+        if latency[stat] > limit:
+            regressions.append(f"{stat} {latency[stat]:.2f}ms > {limit:.2f}ms (baseline {reference[stat]:.2f}ms)")
+    entry["regressions"] = regressions
+    assert not regressions, f"{case.name} regressed: " + "; ".join(regressions)
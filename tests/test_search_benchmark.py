@@ -0,0 +1,138 @@
+"""
+Listing search benchmark: the old unanchored $regex $or against the weighted
+text index and the typeahead prefix index, at growing catalogue sizes.
+
+Seeds its own MongoDB database with synthetic listings, so it needs pymongo
+and a reachable mongod. Opt in with RUN_BENCHMARKS=1:
+
+    RUN_BENCHMARKS=1 python -m pytest tests/test_search_benchmark.py -s
+
+Environment:
+    BENCH_MONGO_URL       default mongodb://localhost:27017
+    BENCH_DB_NAME         default rental_marketplace_bench
+    SEARCH_BENCH_SIZES    default 10000,100000,1000000
+    SEARCH_BENCH_REPEATS  default 20
+"""
+
+import os
+import re
+import json
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+pymongo = pytest.importorskip("pymongo")
+
+if not os.environ.get("RUN_BENCHMARKS"):
+    pytest.skip("set RUN_BENCHMARKS=1 to run benchmarks", allow_module_level=True)
+
+from seed_data import build_prefixes, query_prefixes
+from tests.mongo_bench import fresh_database, grow_to, median_ms, write_report
+
+SIZES = sorted(int(n) for n in os.environ.get("SEARCH_BENCH_SIZES", "10000,100000,1000000").split(","))
+REPEATS = int(os.environ.get("SEARCH_BENCH_REPEATS", "20"))
+PAGE_SIZE = 20
+BATCH_SIZE = 5000
+
+REPORT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                           "test_reports", "search_benchmark.json")
+
+ADJECTIVES = ["Beautiful", "Cozy", "Spacious", "Modern", "Sunny", "Quiet", "Luxury", "Charming", "Rustic", "Bright"]
+KINDS = ["Apartment", "Villa", "Studio", "Cottage", "Room", "House", "Lodge", "Hostel", "Farmhouse", "Loft"]
+FEATURES = ["City Views", "Garden", "Lake Access", "Rooftop Terrace", "Parking", "Balcony", "Fireplace", "Pool"]
+STREETS = ["Main Street", "Park Avenue", "Lake Road", "Hill View", "Market Lane", "River Drive", "Station Road"]
+CITIES = ["Downtown", "Bangalore", "Mumbai", "Pune", "Hyderabad", "Chennai", "Delhi", "Goa", "Shimla", "Kochi"]
+TYPES = ["room", "house", "lodge", "pg", "hostel", "apartment", "villa", "cottage", "farmhouse", "studio"]
+
+# (label, search text) pairs: a common term, a rarer two-word phrase and a typeahead fragment
+QUERIES = [
+    ("common_term", "downtown"),
+    ("rare_phrase", "rooftop shimla"),
+    ("typeahead", "hyd"),
+]
+
+
+def make_listing(rng, index, created_at):
+    title = f"{rng.choice(ADJECTIVES)} {rng.choice(KINDS)} with {rng.choice(FEATURES)}"
+    address = f"{rng.randint(1, 999)} {rng.choice(STREETS)}, {rng.choice(CITIES)}"
+    description = " ".join(rng.choice(FEATURES + CITIES + KINDS) for _ in range(12))
+    return {
+        "title": title,
+        "type": rng.choice(TYPES),
+        "price": rng.randint(300, 8000),
+        "squareFeet": rng.randint(150, 4000),
+        "addressText": address,
+        "description": description,
+        "searchPrefixes": build_prefixes(title, address),
+        "status": "available",
+        "createdAt": created_at - timedelta(seconds=index),
+    }
+
+
+def old_regex_search(collection, text):
+    pattern = {"$regex": re.escape(text), "$options": "i"}
+    query = {"$or": [{"title": pattern}, {"description": pattern}, {"addressText": pattern}]}
+    return list(collection.find(query).sort("createdAt", -1).limit(PAGE_SIZE))
+
+
+def text_search(collection, text):
+    return list(collection.aggregate([
+        {"$match": {"$text": {"$search": text}}},
+        {"$addFields": {"score": {"$meta": "textScore"}}},
+        {"$sort": {"score": -1, "_id": -1}},
+        {"$limit": PAGE_SIZE},
+    ]))
+
+
+def prefix_search(collection, text):
+    query = {"searchPrefixes": {"$all": query_prefixes(text)}}
+    return list(collection.find(query).sort("createdAt", -1).limit(PAGE_SIZE))
+
+
+@pytest.fixture(scope="module")
+def listings():
+    with fresh_database() as database:
+        collection = database["listings"]
+        # Same indexes as backend/models/Listing.js declares for search
+        collection.create_index([("createdAt", -1), ("_id", -1)])
+        collection.create_index(
+            [("title", "text"), ("addressText", "text"), ("description", "text")],
+            name="listing_text_search",
+            weights={"title": 10, "addressText": 5, "description": 1},
+        )
+        collection.create_index([("searchPrefixes", 1), ("createdAt", -1)])
+
+        yield collection
+
+
+def test_search_latency_by_catalogue_size(listings):
+    rng = random.Random(42)
+    created_at = datetime(2026, 1, 1)
+    report = {"page_size": PAGE_SIZE, "repeats": REPEATS, "sizes": {}}
+
+    for size in SIZES:
+        grow_to(listings, size, lambda current, count: [make_listing(rng, i, created_at)
+                                                        for i in range(current, current + count)], BATCH_SIZE)
+        results = {}
+        for label, text in QUERIES:
+            results[label] = {
+                "old_regex_ms": median_ms(lambda: old_regex_search(listings, text), REPEATS),
+                "text_index_ms": median_ms(lambda: text_search(listings, text), REPEATS),
+                "prefix_index_ms": median_ms(lambda: prefix_search(listings, text), REPEATS),
+            }
+        report["sizes"][str(size)] = results
+
+        print(f"\n{size:>9} listings")
+        for label, timings in results.items():
+            print(f"  {label:<12} regex p50={timings['old_regex_ms']['p50']:>9.2f}ms  "
+                  f"text p50={timings['text_index_ms']['p50']:>9.2f}ms  "
+                  f"prefix p50={timings['prefix_index_ms']['p50']:>9.2f}ms")
+
+    write_report(REPORT_PATH, report)
+
+    # The new shapes must be served by an index rather than a collection scan
+    plan = json.dumps(listings.find({"searchPrefixes": {"$all": query_prefixes("hyd")}}).explain())
+    assert "IXSCAN" in plan
+    plan = json.dumps(listings.find({"$text": {"$search": "downtown"}}).explain())
+    assert "TEXT" in plan
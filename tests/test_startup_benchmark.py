@@ -0,0 +1,147 @@
+"""
+Startup benchmark: how long backend/server.js takes from spawn to serving
+GET /api/listings quickly, with and without STARTUP_WARMUP, and how long a
+SIGTERM takes to drain it.
+
+Each mode starts the server and polls the listing feed from the moment the
+process is spawned. Until startup has finished the server must answer 503
+with Retry-After rather than fail or serve from an unconnected database.
+The report records, per mode:
+    live_ms          first answer from /api/health/live (port open)
+    ready_ms         server-side time until ready, with its startup phases
+    first_ok_ms      first 200 from GET /api/listings
+    first_fast_ms    first 200 within STARTUP_BENCH_FAST_MS
+    early_ms         latencies of the first 20 successful listing reads
+    shutdown_ms      SIGTERM to exit
+
+Needs node, the backend's node_modules, a reachable MongoDB and the requests
+package. Opt in with RUN_BENCHMARKS=1:
+
+    RUN_BENCHMARKS=1 python -m pytest tests/test_startup_benchmark.py -s
+
+Environment:
+    STARTUP_BENCH_FAST_MS   default 50
+    BENCH_DB_NAME           default rental_marketplace_bench
+"""
+
+import os
+import json
+import time
+import signal
+import asyncio
+
+import pytest
+
+requests = pytest.importorskip("requests")
+
+if not os.environ.get("RUN_BENCHMARKS"):
+    pytest.skip("set RUN_BENCHMARKS=1 to run benchmarks", allow_module_level=True)
+
+from backend_test import LoadGenerator, percentile
+from tests.backend_process import ROOT, free_port, spawn_backend, start_backend, stop_backend, requires_node_backend
+
+pytestmark = requires_node_backend
+
+REPORT_PATH = os.path.join(ROOT, "test_reports", "startup.json")
+
+FAST_MS = float(os.environ.get("STARTUP_BENCH_FAST_MS", "50"))
+DB_NAME = os.environ.get("BENCH_DB_NAME", "rental_marketplace_bench")
+EARLY_READS = 20
+
+MODES = {
+    "cold": {"STARTUP_WARMUP": 0},
+    "warmup": {"STARTUP_WARMUP": 1},
+}
+
+
+def seed():
+    """Listings and reviews for the feed to read"""
+    port = free_port()
+    process = start_backend(port, DB_NAME=DB_NAME)
+    try:
+        asyncio.run(LoadGenerator(4, 0, 3, api_url=f"http://127.0.0.1:{port}/api").run())
+    finally:
+        stop_backend(process)
+
+
+def measure(env):
+    port = free_port()
+    base = f"http://127.0.0.1:{port}/api"
+    session = requests.Session()
+    result = {"statuses": {}, "early_ms": []}
+
+    spawned = time.perf_counter()
+    elapsed = lambda: round((time.perf_counter() - spawned) * 1000, 1)
+    process = spawn_backend(port, DB_NAME=DB_NAME, **env)
+    try:
+        deadline = spawned + 60
+        while len(result["early_ms"]) < EARLY_READS and time.perf_counter() < deadline:
+            if process.poll() is not None:
+                pytest.fail(f"server.js exited with {process.returncode}")
+            if "live_ms" not in result:
+                try:
+                    session.get(f"{base}/health/live", timeout=1)
+                    result["live_ms"] = elapsed()
+                except requests.RequestException:
+                    time.sleep(0.01)
+                    continue
+
+            started = time.perf_counter()
+            try:
+                response = session.get(f"{base}/listings", timeout=5)
+            except requests.RequestException:
+                result["statuses"]["error"] = result["statuses"].get("error", 0) + 1
+                continue
+            latency = (time.perf_counter() - started) * 1000
+            status = str(response.status_code)
+            result["statuses"][status] = result["statuses"].get(status, 0) + 1
+            if response.status_code == 503:
+                assert response.headers.get("Retry-After")
+                time.sleep(0.01)
+            elif response.status_code == 200:
+                result.setdefault("first_ok_ms", elapsed())
+                if latency <= FAST_MS:
+                    result.setdefault("first_fast_ms", elapsed())
+                result["early_ms"].append(round(latency, 2))
+
+        ready = session.get(f"{base}/health/ready", timeout=5).json()
+        result["ready_ms"] = ready["startup"]["readyMs"]
+        result["phases"] = {phase["name"]: phase["ms"] for phase in ready["startup"]["phases"]}
+        result["pool"] = ready["mongo"]["pool"]
+
+        stopping = time.perf_counter()
+        os.killpg(process.pid, signal.SIGTERM)
+        result["exit_code"] = process.wait(timeout=15)
+        result["shutdown_ms"] = round((time.perf_counter() - stopping) * 1000, 1)
+    finally:
+        session.close()
+        if process.poll() is None:
+            stop_backend(process)
+
+    early = sorted(result["early_ms"])
+    result["early_p50_ms"] = round(percentile(early, 50), 2)
+    result["early_max_ms"] = early[-1] if early else None
+    return result
+
+
+def test_startup_time_and_first_fast_request():
+    seed()
+    report = {"fast_ms": FAST_MS, "modes": {name: measure(env) for name, env in MODES.items()}}
+
+    for mode, result in report["modes"].items():
+        print(f"\n{mode:>7}: live={result.get('live_ms')}ms ready={result['ready_ms']}ms "
+              f"first_ok={result.get('first_ok_ms')}ms first_fast={result.get('first_fast_ms')}ms "
+              f"early p50={result['early_p50_ms']}ms max={result['early_max_ms']}ms "
+              f"shutdown={result['shutdown_ms']}ms  phases={result['phases']}")
+
+    os.makedirs(os.path.dirname(REPORT_PATH), exist_ok=True)
+    with open(REPORT_PATH, "w") as f:
+        json.dump(report, f, indent=2)
+
+    for mode, result in report["modes"].items():
+        assert set(result["statuses"]) <= {"200", "503"}, f"{mode}: {result['statuses']}"
+        assert len(result["early_ms"]) == EARLY_READS
+        assert "first_fast_ms" in result, f"{mode}: no listing read within {FAST_MS}ms"
+        assert {"connect", "indexes"} <= set(result["phases"])
+        assert result["exit_code"] == 0
+    assert "warmup" in report["modes"]["warmup"]["phases"]
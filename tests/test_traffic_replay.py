@@ -0,0 +1,64 @@
+"""
+Round trip of backend/middleware/trafficCapture.js and traffic_replay.py.
+
+Starts the backend with TRAFFIC_CAPTURE=1, drives it with the backend_test.py
+load scenario, then replays the capture against a fresh backend as fast as
+possible and checks that every request was re-issued with the recorded
+outcome. Needs node, the backend's node_modules, a reachable MongoDB and the
+requests package. Opt in with RUN_INTEGRATION=1:
+
+    RUN_INTEGRATION=1 python -m pytest tests/test_traffic_replay.py -s
+
+Environment:
+    REPLAY_TEST_USERS     default 4 (virtual users while capturing)
+    REPLAY_TEST_SECONDS   default 5 (capture duration)
+    BENCH_DB_NAME         default rental_marketplace_bench
+"""
+
+import os
+import json
+import asyncio
+
+import pytest
+
+requests = pytest.importorskip("requests")
+
+if not os.environ.get("RUN_INTEGRATION"):
+    pytest.skip("set RUN_INTEGRATION=1 to run against a live backend", allow_module_level=True)
+
+from backend_test import LoadGenerator
+from traffic_replay import capture_files, run_replay
+from tests.backend_process import ROOT, free_port, start_backend, stop_backend, requires_node_backend
+
+pytestmark = requires_node_backend
+
+REPORT_PATH = os.path.join(ROOT, "test_reports", "traffic_replay.json")
+
+USERS = int(os.environ.get("REPLAY_TEST_USERS", "4"))
+SECONDS = float(os.environ.get("REPLAY_TEST_SECONDS", "5"))
+DB_NAME = os.environ.get("BENCH_DB_NAME", "rental_marketplace_bench")
+
+
+def test_captured_traffic_replays_with_recorded_outcomes(tmp_path):
+    port = free_port()
+    process = start_backend(port, DB_NAME=DB_NAME, TRAFFIC_CAPTURE=1, TRAFFIC_CAPTURE_DIR=tmp_path)
+    try:
+        asyncio.run(LoadGenerator(USERS, 0, SECONDS, api_url=f"http://127.0.0.1:{port}/api").run())
+    finally:
+        stop_backend(process)
+
+    files = capture_files([str(tmp_path)])
+    records = [json.loads(line) for path in files for line in open(path) if line.strip()]
+    assert records, "nothing was captured"
+    assert all("authorization" not in json.dumps(record).lower() for record in records)
+    assert not any("loadtest123" in json.dumps(record) for record in records)
+
+    port = free_port()
+    process = start_backend(port, DB_NAME=DB_NAME)
+    try:
+        report = run_replay(files, f"http://127.0.0.1:{port}/api", speed=None, output=REPORT_PATH)
+    finally:
+        stop_backend(process)
+
+    assert report["replayed"] == len(records) - sum(report["skipped"].values())
+    assert report["overall"]["status_match_rate"] >= 0.95